@@ -0,0 +1,142 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from api.cache import get_cache_key
+from api.exceptions import InvalidParameter
+from api.mixins import KoreaBrandsMixin, MobileBrandsMixin, SameNationalityMixin
+from api.pagination import KeysetPagination
+from api.parameters import get_int_parameter
+from api.streaming import StreamingJSONResponse, astream, dumps
+from mobiles.cache import PRICE_FEED_VERSION_KEY
+from mobiles.changes import visible_before
+from mobiles.conditional import get_catalog_validators
+from mobiles.models import PriceHistory
+from mobiles.serializers import PriceHistorySerializer
+
+
+class JSONResponse(HttpResponse):
+    def __init__(self, data, status=status.HTTP_200_OK, headers=None):
+        self.data = data
+        super().__init__(dumps(data), content_type="application/json", status=status, headers=headers)
+
+
+class AsyncBaseListView(View):
+    """Async version of ``api.views.BaseListView`` for ASGI deployments."""
+
+    async def get(self, request):
+        etag, last_updated = await sync_to_async(get_catalog_validators)(request)
+        etag = quote_etag(etag)
+        last_modified = int(last_updated.timestamp()) if last_updated else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            try:
+                response = await self.list(request)
+            except APIException as exc:
+                response = JSONResponse(exc.detail, status=exc.status_code)
+
+        if last_modified:
+            response.headers.setdefault("Last-Modified", http_date(last_modified))
+        response.headers.setdefault("ETag", etag)
+
+        return response
+
+    async def list(self, request):
+        queryset = self.get_queryset(request)
+        flat = get_int_parameter(request, "flat")
+        queryset = self.prepare_queryset(request, queryset, flat)
+
+        if get_int_parameter(request, "stream"):
+            return StreamingJSONResponse(astream(queryset, self.serialize))
+
+        key = await sync_to_async(get_cache_key)(request)
+        cached = await cache.aget(key)
+        if cached is not None:
+            data, headers = cached
+            return JSONResponse(data, headers=headers)
+
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        data = await sync_to_async(self.serialize)(page)
+        headers = paginator.get_headers()
+
+        await cache.aset(key, (data, headers), settings.API_CACHE_TIMEOUT)
+
+        return JSONResponse(data, headers=headers)
+
+
+class AsyncKoreaBrandsView(KoreaBrandsMixin, AsyncBaseListView):
+    pass
+
+
+class AsyncMobileBrandsView(MobileBrandsMixin, AsyncBaseListView):
+    pass
+
+
+class AsyncSameNationalityView(SameNationalityMixin, AsyncBaseListView):
+    pass
+
+
+class AsyncPriceFeedView(View):
+    """Long-poll feed of the new prices, waiting on the price feed version in the cache."""
+
+    pagination_class = KeysetPagination
+    poll_interval = 1
+    default_timeout = 30
+    max_timeout = 60
+
+    async def get(self, request):
+        try:
+            return await self.poll(request)
+        except APIException as exc:
+            return JSONResponse(exc.detail, status=exc.status_code)
+
+    async def poll(self, request):
+        limit = self.pagination_class().get_limit(request)
+        timeout = get_int_parameter(request, "timeout", self.default_timeout)
+        if timeout < 0:
+            raise InvalidParameter("timeout")
+        timeout = min(timeout, self.max_timeout)
+
+        # Without a cursor, return the current one to start the feed from.
+        if "after" not in request.GET:
+            latest = await PriceHistory.objects.filter(created__lte=visible_before()).aaggregate(Max("id"))
+            return JSONResponse({"prices": [], "cursor": latest["id__max"] or 0})
+        after = get_int_parameter(request, "after")
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        # Read before the query, so prices committed in between bump it and are not missed.
+        version = await cache.aget(PRICE_FEED_VERSION_KEY)
+        prices, pending = await self.get_prices(after, limit)
+
+        while not prices and (remaining := deadline - loop.time()) > 0:
+            await asyncio.sleep(min(self.poll_interval, remaining))
+            current_version = await cache.aget(PRICE_FEED_VERSION_KEY)
+            # Pending prices become visible without any new bump.
+            if current_version != version or pending:
+                version = current_version
+                prices, pending = await self.get_prices(after, limit)
+
+        cursor = prices[-1].pk if prices else after
+        return JSONResponse({"prices": PriceHistorySerializer(prices, many=True).data, "cursor": cursor})
+
+    async def get_prices(self, after, limit):
+        """Return the visible prices after ``after``, and whether a more recent one is pending."""
+        visible_until = visible_before()
+        prices = []
+        async for price in PriceHistory.objects.filter(id__gt=after).order_by("id")[:limit]:
+            if price.created > visible_until:
+                return prices, True
+            prices.append(price)
+        return prices, False
@@ -0,0 +1,51 @@
+from functools import wraps
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from mobiles.cache import get_catalog_version
+from mobiles.facets import FACETS
+
+# Parameters whose comma-separated values are a set, in any order.
+SET_PARAMETERS = {"brands", *FACETS}
+
+
+def normalize_query_params(request):
+    params = []
+    for name in sorted(request.GET):
+        value = request.GET.get(name)
+        if name in SET_PARAMETERS:
+            value = ",".join(sorted(set(value.split(","))))
+        params.append((name, value))
+
+    return params
+
+
+def get_cache_key(request):
+    params = md5(urlencode(normalize_query_params(request)).encode()).hexdigest()
+    return f"api:{request.resolver_match.view_name}:{get_catalog_version()}:{params}"
+
+
+def cache_response(view_method):
+    """Cache the successful responses of an API view method under the current catalog version."""
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = get_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            return Response(data, status=status.HTTP_200_OK, headers=headers)
+
+        response = view_method(self, request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not response.streaming:
+            headers = {name: value for name, value in response.items() if name != "Content-Type"}
+            cache.set(key, (response.data, headers), settings.API_CACHE_TIMEOUT)
+
+        return response
+
+    return wrapper
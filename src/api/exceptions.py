@@ -0,0 +1,26 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class InvalidParameter(APIException):
+    status_code = status.HTTP_406_NOT_ACCEPTABLE
+    default_code = "invalid_parameter"
+
+    def __init__(self, name):
+        super().__init__({"error": f"Parameter '{name}' is invalid!"})
+
+
+class MissingParameter(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_code = "missing_parameter"
+
+    def __init__(self, name):
+        super().__init__({"error": f"Parameter '{name}' is missing!"})
+
+
+class InvalidPayload(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "invalid_payload"
+
+    def __init__(self, message):
+        super().__init__({"error": message})
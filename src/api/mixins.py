@@ -0,0 +1,124 @@
+from django.db.models import F
+
+from api.exceptions import InvalidParameter, MissingParameter
+from api.pagination import KeysetPagination
+from api.parameters import get_date_parameter, get_fields_parameter, get_include_parameter, get_prices_parameter
+from api.selection import select_queryset
+from mobiles.archive import ArchivedPrices
+from mobiles.flat import BRAND_FLAT_FIELDS, MOBILE_FLAT_FIELDS, flat_brands, flat_mobiles, select_flat_fields
+from mobiles.models import Brand, CatalogRow, Mobile, PriceHistory
+from mobiles.serializers import BrandSerializer, MobileSerializer
+
+
+class CatalogListMixin:
+    """Query and serialization logic shared by the sync and async list views."""
+
+    serializer_class = None
+    # Builds the flat representation from the catalog rows instead of the nested serializers.
+    flatten = None
+    flat_fields = None
+    pagination_class = KeysetPagination
+
+    def get_queryset(self, request):
+        raise NotImplementedError
+
+    def prepare_queryset(self, request, queryset, flat):
+        """Apply the selection of the client to ``queryset`` and remember it for ``serialize``."""
+        self.flat = flat
+        self.fields = get_fields_parameter(request)
+        self.include = None if flat else get_include_parameter(request)
+        # The days of the prices to return, also used to expand the compacted prices.
+        self.price_window = {
+            "price_from": get_date_parameter(request, "price_from"),
+            "price_to": get_date_parameter(request, "price_to"),
+            "prices": get_prices_parameter(request),
+        }
+        # A date range also reads the prices of the archived months it covers.
+        if self.price_window["price_from"] is not None or self.price_window["price_to"] is not None:
+            self.price_window["archived"] = ArchivedPrices(
+                self.price_window["price_from"], self.price_window["price_to"]
+            )
+        # The flat representation reads the prices from the catalog rows, which have the same columns.
+        self.prices = self.get_prices_queryset(CatalogRow.objects.all() if flat else None)
+
+        if self.include is not None:
+            try:
+                self.serializer_class(include=self.include)
+            except ValueError:
+                raise InvalidParameter("include")
+
+        try:
+            if flat:
+                if self.fields is not None:
+                    if any(nested_fields is not None for nested_fields in self.fields.values()):
+                        raise ValueError("Flat fields cannot be nested")
+                    select_flat_fields(self.flat_fields, self.fields)
+
+                # The flat rows are read by ``flatten``, only the keys of the top-level objects are needed here.
+                return queryset.select_related(None).prefetch_related(None).only("id", "created")
+
+            queryset, _ = select_queryset(queryset, self.get_serializer(), querysets={PriceHistory: self.prices})
+            return queryset
+        except ValueError:
+            raise InvalidParameter("fields")
+
+    def get_prices_queryset(self, queryset=None):
+        """Return the prices of ``queryset`` (by default all of them) with days in the ``price_window``."""
+        queryset = PriceHistory.objects.all() if queryset is None else queryset
+
+        price_from = self.price_window["price_from"]
+        if price_from is not None:
+            queryset = queryset.days_from(price_from)
+
+        price_to = self.price_window["price_to"]
+        if price_to is not None:
+            queryset = queryset.filter(date__lte=price_to)
+
+        # Ranked after the date filters, so the newest prices are taken within the range.
+        count = self.price_window["prices"]
+        if count is not None:
+            queryset = queryset.newest(count)
+
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        return self.serializer_class(
+            *args, fields=self.fields, include=self.include, context=self.price_window, **kwargs
+        )
+
+    def serialize(self, instances):
+        if self.flat:
+            return self.flatten(instances, fields=self.fields, prices=self.prices, window=self.price_window)
+
+        return self.get_serializer(instances, many=True).data
+
+
+class KoreaBrandsMixin(CatalogListMixin):
+    serializer_class = BrandSerializer
+    flatten = staticmethod(flat_brands)
+    flat_fields = BRAND_FLAT_FIELDS
+
+    def get_queryset(self, request):
+        return Brand.objects.filter(nationality__name="Korea")
+
+
+class MobileBrandsMixin(CatalogListMixin):
+    serializer_class = MobileSerializer
+    flatten = staticmethod(flat_mobiles)
+    flat_fields = MOBILE_FLAT_FIELDS
+
+    def get_queryset(self, request):
+        if "brands" not in request.GET:
+            raise MissingParameter("brands")
+
+        brands_name = request.GET["brands"].split(",")
+        return Mobile.objects.filter(brand__name__in=brands_name)
+
+
+class SameNationalityMixin(CatalogListMixin):
+    serializer_class = MobileSerializer
+    flatten = staticmethod(flat_mobiles)
+    flat_fields = MOBILE_FLAT_FIELDS
+
+    def get_queryset(self, request):
+        return Mobile.objects.filter(brand__nationality=F("country"))
@@ -0,0 +1,95 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from api.exceptions import InvalidParameter
+
+
+def keyset_filter(created, pk):
+    """Rows after ``(created, pk)`` in the ``("created", "id")`` order."""
+    return Q(created__gt=created) | Q(created=created, id__gt=pk)
+
+
+class KeysetPagination(BasePagination):
+    """Opaque cursor pagination keyed on ``(created, id)``, with the next page in the ``Link`` header."""
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 100
+    max_limit = 1000
+
+    def get_page_queryset(self, queryset, request):
+        """Return the lazy queryset of the requested page, with one extra row to detect a next page."""
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by("created", "id")
+        position = self.decode_cursor(request)
+        if position is not None:
+            created, pk = position
+            queryset = queryset.filter(keyset_filter(created, pk))
+
+        return queryset[: self.limit + 1]
+
+    def set_page(self, results):
+        # The extra row tells whether there is a next page without running a COUNT query.
+        self.has_next = len(results) > self.limit
+        self.page = results[: self.limit]
+
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        return self.set_page([instance async for instance in self.get_page_queryset(queryset, request)])
+
+    def get_headers(self):
+        next_link = self.get_next_link()
+        if next_link:
+            return {"Link": f'<{next_link}>; rel="next"'}
+
+        return {}
+
+    def get_paginated_response(self, data):
+        return Response(data, status=status.HTTP_200_OK, headers=self.get_headers())
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.GET.get(self.limit_query_param, self.default_limit))
+        except ValueError:
+            raise InvalidParameter(self.limit_query_param)
+
+        if limit < 1:
+            raise InvalidParameter(self.limit_query_param)
+
+        return min(limit, self.max_limit)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(last.created, last.pk))
+
+    @staticmethod
+    def encode_cursor(created, pk):
+        return urlsafe_b64encode(f"{created.isoformat()}|{pk}".encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.GET.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            created, pk = urlsafe_b64decode(encoded + padding).decode().split("|")
+            return datetime.fromisoformat(created), int(pk)
+        except (BinasciiError, UnicodeDecodeError, ValueError):
+            raise InvalidParameter(self.cursor_query_param)
@@ -0,0 +1,187 @@
+from datetime import date
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+
+from api.exceptions import InvalidParameter
+from api.pagination import KeysetPagination
+from api.selection import parse_fields
+
+
+def get_int_parameter(request, name, default=0):
+    try:
+        return int(request.GET.get(name, default))
+    except ValueError:
+        raise InvalidParameter(name)
+
+
+def get_limit_parameter(request):
+    """Read the ``limit`` of a view returning a single page of results, defaulting and capped like the pagination."""
+    limit = get_int_parameter(request, "limit", KeysetPagination.default_limit)
+    if limit < 1:
+        raise InvalidParameter("limit")
+
+    return min(limit, KeysetPagination.max_limit)
+
+
+def get_date_parameter(request, name):
+    if name not in request.GET:
+        return None
+
+    try:
+        return date.fromisoformat(request.GET[name])
+    except ValueError:
+        raise InvalidParameter(name)
+
+
+def get_datetime_parameter(request, name):
+    if name not in request.GET:
+        return None
+
+    try:
+        value = parse_datetime(request.GET[name])
+    except ValueError:
+        raise InvalidParameter(name)
+    if value is None:
+        raise InvalidParameter(name)
+
+    return value if timezone.is_aware(value) else timezone.make_aware(value)
+
+
+def get_fields_parameter(request):
+    if "fields" not in request.GET:
+        return None
+
+    try:
+        return parse_fields(request.GET["fields"])
+    except ValueError:
+        raise InvalidParameter("fields")
+
+
+def get_include_parameter(request):
+    if "include" not in request.GET:
+        return None
+
+    # An empty value includes no relation at all.
+    if not request.GET["include"]:
+        return {}
+
+    try:
+        return parse_fields(request.GET["include"])
+    except ValueError:
+        raise InvalidParameter("include")
+
+
+def get_prices_parameter(request):
+    """Return the number of newest prices to return per variant, or ``None`` for all of them."""
+    value = request.GET.get("prices", "all")
+    if value == "all":
+        return None
+    if value == "latest":
+        return 1
+
+    prefix, _, count = value.partition(":")
+    if prefix != "last" or not count.isdigit() or int(count) < 1:
+        raise InvalidParameter("prices")
+
+    return int(count)
+
+
+FLAT_PARAMETER = OpenApiParameter(
+    name="flat",
+    type=int,
+    location=OpenApiParameter.QUERY,
+    description="Set to 1 to get the flat representation of the data.",
+    required=False,
+)
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Comma-separated fields to return, e.g. `model,variants.color,variants.prices.price`. Nested fields are "
+        "separated by dots. With `flat=1`, the names of the flat columns, e.g. `model,price`."
+    ),
+    required=False,
+)
+
+INCLUDE_PARAMETER = OpenApiParameter(
+    name="include",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Comma-separated nested relations to return, e.g. `variants` or `variants.prices`. Relations that are not "
+        "listed are neither queried nor returned; an empty value returns no relation. Ignored with `flat=1`."
+    ),
+    required=False,
+)
+
+PRICES_PARAMETER = OpenApiParameter(
+    name="prices",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Prices to return per variant: `all` (default), `latest` or `last:N` for the N newest prices by date. "
+        "Only the selected rows are read from the database."
+    ),
+    required=False,
+)
+
+PRICE_DATE_PARAMETERS = [
+    OpenApiParameter(
+        name="price_from",
+        type=OpenApiTypes.DATE,
+        location=OpenApiParameter.QUERY,
+        description="Only return the prices dated on or after this date (YYYY-MM-DD).",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="price_to",
+        type=OpenApiTypes.DATE,
+        location=OpenApiParameter.QUERY,
+        description="Only return the prices dated on or before this date (YYYY-MM-DD).",
+        required=False,
+    ),
+]
+
+STREAM_PARAMETER = OpenApiParameter(
+    name="stream",
+    type=int,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Set to 1 to stream the complete result set as a JSON array, one item at a time. "
+        "Pagination parameters are ignored."
+    ),
+    required=False,
+)
+
+LIMIT_PARAMETER = OpenApiParameter(
+    name="limit",
+    type=int,
+    location=OpenApiParameter.QUERY,
+    description=(f"Number of results (default: {KeysetPagination.default_limit}, max: {KeysetPagination.max_limit})."),
+    required=False,
+)
+
+PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="limit",
+        type=int,
+        location=OpenApiParameter.QUERY,
+        description=(
+            f"Number of items per page (default: {KeysetPagination.default_limit}, "
+            f"max: {KeysetPagination.max_limit})."
+        ),
+        required=False,
+    ),
+    OpenApiParameter(
+        name="cursor",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Opaque cursor taken from the `Link` header of the previous page.",
+        required=False,
+    ),
+]
@@ -0,0 +1,70 @@
+from django.db.models import Prefetch
+from rest_framework.serializers import ListSerializer
+
+
+def parse_fields(value):
+    """Parse a comma-separated list of dotted field names into a selection tree."""
+    tree = {}
+    for path in value.split(","):
+        names = path.strip().split(".")
+        if not all(names):
+            raise ValueError(f"Invalid field: '{path}'")
+
+        node = tree
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+
+    return tree
+
+
+def get_related_paths(columns):
+    """Return every relation traversed by ``columns``, e.g. ``mobile`` and ``mobile__brand`` for ``mobile__brand__name``."""
+    relations = set()
+    for column in columns:
+        parts = column.split("__")[:-1]
+        relations.update("__".join(parts[: index + 1]) for index in range(len(parts)))
+
+    return relations
+
+
+def select_queryset(queryset, serializer, parent_link=None, querysets=None):
+    """Restrict ``queryset`` to the columns, relations and prefetches read by ``serializer``."""
+    querysets = querysets or {}
+    model = queryset.model
+    # The primary key, plus the foreign key used to match prefetched rows or the keyset pagination position.
+    columns = {"id", parent_link} if parent_link else {"id", "created"}
+    parent_columns = set()
+    prefetches = []
+    method_columns = getattr(serializer.Meta, "columns", {})
+    columns.update(getattr(serializer.Meta, "required_columns", ()))
+
+    for name, field in serializer.fields.items():
+        if isinstance(field, ListSerializer):
+            link = model._meta.get_field(field.source).field.name
+            child_model = field.child.Meta.model
+            child_queryset = querysets.get(child_model, child_model.objects.all())
+            child_queryset, child_parent_columns = select_queryset(child_queryset, field.child, link, querysets)
+
+            columns |= child_parent_columns
+            prefetches.append(Prefetch(field.source, queryset=child_queryset))
+            continue
+
+        column = method_columns.get(name, "__".join(field.source_attrs))
+        if parent_link and column.startswith(f"{parent_link}__"):
+            parent_columns.add(column.removeprefix(f"{parent_link}__"))
+        else:
+            columns.add(column)
+
+    relations = get_related_paths(columns)
+    queryset = queryset.select_related(None).only(*columns, *relations).prefetch_related(None)
+    # ``select_related()`` without arguments would follow every foreign key.
+    if relations:
+        queryset = queryset.select_related(*relations)
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+
+    return queryset, parent_columns
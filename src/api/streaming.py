@@ -0,0 +1,55 @@
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.pagination import keyset_filter
+
+STREAM_CHUNK_SIZE = 100
+
+
+def dumps(data):
+    # Same output as DRF's JSONRenderer with the default UNICODE_JSON and COMPACT_JSON settings.
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def stream(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield a JSON array of ``queryset`` serialized one chunk at a time by ``serialize``."""
+    instances = queryset.iterator(chunk_size=chunk_size)
+    first = True
+
+    yield "["
+    while chunk := list(islice(instances, chunk_size)):
+        for item in serialize(chunk):
+            if not first:
+                yield ","
+            first = False
+            yield dumps(item)
+    yield "]"
+
+
+async def astream(queryset, serialize, chunk_size=STREAM_CHUNK_SIZE):
+    """Async counterpart of ``stream``, reading keyset chunks with the async ORM."""
+    queryset = queryset.order_by("created", "id")
+    chunk_queryset = queryset
+    first = True
+
+    yield "["
+    while chunk := [instance async for instance in chunk_queryset[:chunk_size]]:
+        for item in await sync_to_async(serialize)(chunk):
+            if not first:
+                yield ","
+            first = False
+            yield dumps(item)
+
+        last = chunk[-1]
+        chunk_queryset = queryset.filter(keyset_filter(last.created, last.pk))
+    yield "]"
+
+
+class StreamingJSONResponse(StreamingHttpResponse):
+    def __init__(self, streaming_content, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(streaming_content, **kwargs)
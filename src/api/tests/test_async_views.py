@@ -0,0 +1,127 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.serializers import BrandSerializer, MobileSerializer
+
+
+@sync_to_async
+def serialize(serializer_class, instances, **kwargs):
+    return json.loads(JSONRenderer().render(serializer_class(instances, many=True, **kwargs).data))
+
+
+class AsyncViewsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = AsyncClient()
+
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.nationality_usa = Nationality.objects.create(name="USA")
+
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.brand2 = Brand.objects.create(name="Brand2", nationality=self.nationality_usa)
+        self.brand3 = Brand.objects.create(name="Brand3", nationality=self.nationality_korea)
+
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.mobile2 = Mobile.objects.create(brand=self.brand2, model="Model2", country=self.nationality_korea)
+        self.mobile3 = Mobile.objects.create(brand=self.brand3, model="Model3", country=self.nationality_korea)
+
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.variant2 = Variant.objects.create(mobile=self.mobile2, color="Blue", size=6.0)
+
+        PriceHistory.objects.create(variant=self.variant1, price=1000, status=True)
+        PriceHistory.objects.create(variant=self.variant1, price=1200, status=False)
+        PriceHistory.objects.create(variant=self.variant2, price=800, status=True)
+
+    async def test_korea_brands(self):
+        response = await self.client.get(reverse("api:async-korea-brands"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), await serialize(BrandSerializer, [self.brand1, self.brand3]))
+
+    async def test_korea_brands_flat(self):
+        response = await self.client.get(reverse("api:async-korea-brands"), {"flat": 1})
+
+        self.assertEqual(response.json(), await serialize(BrandSerializer, [self.brand1, self.brand3], flat=1))
+
+    async def test_korea_brands_fields(self):
+        response = await self.client.get(reverse("api:async-korea-brands"), {"fields": "name,mobiles.model"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.json(),
+            [
+                {"name": "Brand1", "mobiles": [{"model": "Model1"}]},
+                {"name": "Brand3", "mobiles": [{"model": "Model3"}]},
+            ],
+        )
+
+    async def test_mobile_brands(self):
+        response = await self.client.get(reverse("api:async-mobile-brands"), {"brands": "Brand1,Brand2"})
+
+        self.assertEqual(response.json(), await serialize(MobileSerializer, [self.mobile1, self.mobile2]))
+
+    async def test_mobile_brands_missing_brands_parameter(self):
+        response = await self.client.get(reverse("api:async-mobile-brands"))
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.json(), {"error": "Parameter 'brands' is missing!"})
+
+    async def test_same_nationality_flat(self):
+        response = await self.client.get(reverse("api:async-same-nationality"), {"flat": 1})
+
+        self.assertEqual(response.json(), await serialize(MobileSerializer, [self.mobile1, self.mobile3], flat=1))
+
+    async def test_invalid_flat_parameter(self):
+        response = await self.client.get(reverse("api:async-korea-brands"), {"flat": "True"})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response.json(), {"error": "Parameter 'flat' is invalid!"})
+
+    async def test_pagination(self):
+        url = reverse("api:async-korea-brands")
+        response = await self.client.get(url, {"limit": 1})
+
+        self.assertEqual(response.json(), await serialize(BrandSerializer, [self.brand1]))
+        self.assertIn('rel="next"', response["Link"])
+
+    async def test_cached_response(self):
+        url = reverse("api:async-korea-brands")
+        response = await self.client.get(url, {"flat": 1})
+        cached_response = await self.client.get(url, {"flat": 1})
+
+        self.assertEqual(cached_response.content, response.content)
+
+    async def test_if_none_match(self):
+        url = reverse("api:async-same-nationality")
+        response = await self.client.get(url)
+
+        response = await self.client.get(url, headers={"If-None-Match": response["ETag"]})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_stream(self):
+        for flat in (0, 1):
+            response = await self.client.get(
+                reverse("api:async-mobile-brands"), {"brands": "Brand1,Brand2,Brand3", "stream": 1, "flat": flat}
+            )
+            content = b"".join([chunk async for chunk in response.streaming_content])
+
+            expected = await serialize(MobileSerializer, [self.mobile1, self.mobile2, self.mobile3], flat=flat)
+            self.assertTrue(response.streaming)
+            self.assertEqual(json.loads(content), expected)
+
+    async def test_sync_view_stream(self):
+        # Served with ASGI, the sync views stream an async iterator too, which Django does not read in full first.
+        response = await self.client.get(reverse("api:mobile-brands"), {"brands": "Brand1,Brand2,Brand3", "stream": 1})
+        content = b"".join([chunk async for chunk in response.streaming_content])
+
+        expected = await serialize(MobileSerializer, [self.mobile1, self.mobile2, self.mobile3])
+        self.assertTrue(response.is_async)
+        self.assertEqual(json.loads(content), expected)
@@ -0,0 +1,97 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.cache import get_cache_key
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class ResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.brand2 = Brand.objects.create(name="Brand2", nationality=self.nationality_korea)
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.mobile2 = Mobile.objects.create(brand=self.brand2, model="Model2", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.price_history1 = PriceHistory.objects.create(variant=self.variant1, price=1000, status=True)
+
+    def test_cached_response(self):
+        url = reverse("api:korea-brands")
+        response = self.client.get(url, {"flat": 1})
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url, {"flat": 1})
+
+        self.assertEqual(cached_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response.data, response.data)
+
+    def test_cached_response_normalized_brands(self):
+        url = reverse("api:mobile-brands")
+        response = self.client.get(url, {"brands": "Brand1,Brand2"})
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url, {"brands": "Brand2,Brand1,Brand2"})
+
+        self.assertEqual(cached_response.data, response.data)
+
+    def test_cached_response_per_parameters(self):
+        url = reverse("api:same-nationality")
+        response = self.client.get(url)
+        flat_response = self.client.get(url, {"flat": 1})
+
+        self.assertNotEqual(response.data, flat_response.data)
+
+    def test_cached_response_keeps_link_header(self):
+        url = reverse("api:korea-brands")
+        response = self.client.get(url, {"limit": 1})
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url, {"limit": 1})
+
+        self.assertEqual(cached_response["Link"], response["Link"])
+
+    def test_invalidate_on_save(self):
+        url = reverse("api:korea-brands")
+        self.client.get(url, {"flat": 1})
+
+        self.price_history1.price = 1500
+        self.price_history1.save()
+        response = self.client.get(url, {"flat": 1})
+
+        self.assertEqual(response.data[0][0]["price"], "1500")
+
+    def test_invalidate_on_create(self):
+        url = reverse("api:korea-brands")
+        self.client.get(url)
+
+        Brand.objects.create(name="Brand3", nationality=self.nationality_korea)
+        response = self.client.get(url)
+
+        self.assertEqual(len(response.data), 3)
+
+    def test_invalidate_on_delete(self):
+        url = reverse("api:mobile-brands")
+        self.client.get(url, {"brands": "Brand1"})
+
+        self.variant1.delete()
+        response = self.client.get(url, {"brands": "Brand1"})
+
+        self.assertListEqual(response.data[0]["variants"], [])
+
+    def test_streaming_response_not_cached(self):
+        url = reverse("api:korea-brands")
+        self.client.get(url, {"stream": 1})
+
+        response = self.client.get(url, {"stream": 1})
+
+        self.assertTrue(response.streaming)
+
+    def test_error_response_not_cached(self):
+        response = self.client.get(reverse("api:korea-brands"), {"flat": "True"})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertIsNone(cache.get(get_cache_key(response.wsgi_request)))
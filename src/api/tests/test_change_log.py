@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, ChangeLog, Nationality
+
+
+class ChangeLogViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.brand1.name = "Brand2"
+        self.brand1.save()
+
+    def test_tail(self):
+        response = self.client.get(reverse("api:change-log"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            [(entry["model"], entry["object_id"], entry["op"]) for entry in response.data["entries"]],
+            [
+                ("nationality", self.nationality_korea.pk, ChangeLog.CREATE),
+                ("brand", self.brand1.pk, ChangeLog.CREATE),
+                ("brand", self.brand1.pk, ChangeLog.UPDATE),
+            ],
+        )
+        self.assertEqual(response.data["last"], ChangeLog.objects.last().sequence)
+
+    def test_after(self):
+        response = self.client.get(reverse("api:change-log"), {"limit": 2})
+        response = self.client.get(reverse("api:change-log"), {"after": response.data["last"]})
+
+        self.assertEqual(len(response.data["entries"]), 1)
+        self.assertEqual(response.data["entries"][0]["op"], ChangeLog.UPDATE)
+
+    def test_after_without_entries(self):
+        last = ChangeLog.objects.last().sequence
+        response = self.client.get(reverse("api:change-log"), {"after": last})
+
+        self.assertDictEqual(response.data, {"entries": [], "last": last})
+
+    @override_settings(COMMIT_VISIBILITY_LAG=60)
+    def test_visibility_lag(self):
+        old = ChangeLog.objects.first()
+        ChangeLog.objects.filter(pk=old.pk).update(created=timezone.now() - timedelta(minutes=2))
+
+        response = self.client.get(reverse("api:change-log"))
+
+        # The recent entries may still have transactions in flight before them.
+        self.assertListEqual([entry["sequence"] for entry in response.data["entries"]], [old.sequence])
+        self.assertEqual(response.data["last"], old.sequence)
+
+    @override_settings(COMMIT_VISIBILITY_LAG=60)
+    def test_out_of_order_created(self):
+        first, second = ChangeLog.objects.order_by("sequence")[:2]
+        # The second entry committed before the first one.
+        ChangeLog.objects.filter(pk=second.pk).update(created=timezone.now() - timedelta(minutes=2))
+
+        response = self.client.get(reverse("api:change-log"))
+
+        self.assertListEqual(response.data["entries"], [])
+        self.assertEqual(response.data["last"], 0)
+
+        ChangeLog.objects.filter(pk=first.pk).update(created=timezone.now() - timedelta(minutes=2))
+        response = self.client.get(reverse("api:change-log"))
+
+        self.assertListEqual(
+            [entry["sequence"] for entry in response.data["entries"]], [first.sequence, second.sequence]
+        )
+
+    def test_invalid_after_parameter(self):
+        response = self.client.get(reverse("api:change-log"), {"after": "abc"})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertDictEqual(response.data, {"error": "Parameter 'after' is invalid!"})
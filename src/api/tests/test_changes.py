@@ -0,0 +1,169 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db.models import F
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class ChangesViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.price1 = PriceHistory.objects.create(variant=self.variant1, price=1000)
+
+    def get_keys(self, response):
+        return [(change["model"], change["op"], change["id"]) for change in response.data["changes"]]
+
+    def test_all_changes(self):
+        response = self.client.get(reverse("api:changes"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            self.get_keys(response),
+            [
+                ("nationality", "upsert", self.nationality_korea.pk),
+                ("brand", "upsert", self.brand1.pk),
+                ("mobile", "upsert", self.mobile1.pk),
+                # The variant is updated again with its current price after the price.
+                ("pricehistory", "upsert", self.price1.pk),
+                ("variant", "upsert", self.variant1.pk),
+            ],
+        )
+        self.assertFalse(response.data["more"])
+        self.assertEqual(response.data["changes"][1]["data"]["name"], "Brand1")
+
+    def test_since(self):
+        since = timezone.now()
+        self.brand1.name = "Brand2"
+        self.brand1.save()
+
+        response = self.client.get(reverse("api:changes"), {"since": since.isoformat()})
+
+        self.assertListEqual(self.get_keys(response), [("brand", "upsert", self.brand1.pk)])
+        self.assertEqual(response.data["changes"][0]["data"]["name"], "Brand2")
+
+    def test_tombstones(self):
+        since = timezone.now()
+        price_pk = self.price1.pk
+        self.price1.delete()
+
+        response = self.client.get(reverse("api:changes"), {"since": since.isoformat()})
+
+        self.assertListEqual(
+            self.get_keys(response),
+            [("pricehistory", "delete", price_pk), ("variant", "upsert", self.variant1.pk)],
+        )
+        self.assertIsNone(response.data["changes"][1]["data"]["current_price"])
+
+    def test_cascade_tombstones(self):
+        since = timezone.now()
+        mobile_pk = self.mobile1.pk
+        self.mobile1.delete()
+
+        response = self.client.get(reverse("api:changes"), {"since": since.isoformat()})
+
+        self.assertCountEqual(
+            self.get_keys(response),
+            [
+                ("mobile", "delete", mobile_pk),
+                ("variant", "delete", self.variant1.pk),
+                ("pricehistory", "delete", self.price1.pk),
+            ],
+        )
+
+    def test_continuation(self):
+        response = self.client.get(reverse("api:changes"), {"limit": 2})
+        self.assertEqual(len(response.data["changes"]), 2)
+        self.assertTrue(response.data["more"])
+
+        keys = self.get_keys(response)
+        while response.data["more"]:
+            response = self.client.get(reverse("api:changes"), {"limit": 2, "cursor": response.data["cursor"]})
+            keys += self.get_keys(response)
+
+        self.assertEqual(len(keys), 5)
+        self.assertEqual(len(set(keys)), 5)
+
+    def test_continuation_without_changes(self):
+        response = self.client.get(reverse("api:changes"))
+        cursor = response.data["cursor"]
+
+        response = self.client.get(reverse("api:changes"), {"cursor": cursor})
+
+        self.assertListEqual(response.data["changes"], [])
+        self.assertEqual(response.data["cursor"], cursor)
+
+        price = PriceHistory.objects.create(variant=self.variant1, price=1200)
+        response = self.client.get(reverse("api:changes"), {"cursor": cursor})
+
+        self.assertListEqual(
+            self.get_keys(response), [("pricehistory", "upsert", price.pk), ("variant", "upsert", self.variant1.pk)]
+        )
+
+    def test_same_updated(self):
+        updated = timezone.now() - timedelta(days=1)
+        for model in (Nationality, Variant, PriceHistory):
+            model.objects.update(updated=updated - timedelta(days=1))
+        Brand.objects.update(updated=updated)
+        Mobile.objects.update(updated=updated)
+        brand2 = Brand.objects.create(name="Brand2", nationality=self.nationality_korea)
+        Brand.objects.filter(pk=brand2.pk).update(updated=updated)
+
+        response = self.client.get(reverse("api:changes"), {"since": updated.isoformat(), "limit": 1})
+        keys = self.get_keys(response)
+        while response.data["more"]:
+            response = self.client.get(reverse("api:changes"), {"cursor": response.data["cursor"], "limit": 1})
+            keys += self.get_keys(response)
+
+        self.assertListEqual(
+            keys,
+            [
+                ("brand", "upsert", self.brand1.pk),
+                ("brand", "upsert", brand2.pk),
+                ("mobile", "upsert", self.mobile1.pk),
+            ],
+        )
+
+    @override_settings(COMMIT_VISIBILITY_LAG=5)
+    def test_visibility_lag(self):
+        for model in (Nationality, Brand, Mobile, Variant, PriceHistory):
+            model.objects.update(updated=F("updated") - timedelta(minutes=1))
+        self.brand1.name = "Brand2"
+        self.brand1.save()
+        self.brand1.refresh_from_db()
+
+        with patch("django.utils.timezone.now", return_value=self.brand1.updated + timedelta(seconds=2)):
+            response = self.client.get(reverse("api:changes"))
+        self.assertNotIn(("brand", "upsert", self.brand1.pk), self.get_keys(response))
+        self.assertEqual(len(response.data["changes"]), 4)
+
+        with patch("django.utils.timezone.now", return_value=self.brand1.updated + timedelta(seconds=6)):
+            response = self.client.get(reverse("api:changes"), {"cursor": response.data["cursor"]})
+        self.assertListEqual(self.get_keys(response), [("brand", "upsert", self.brand1.pk)])
+
+    def test_num_queries(self):
+        # one keyset query per model and one for the tombstones, whatever the size of the catalog
+        with self.assertNumQueries(6):
+            self.client.get(reverse("api:changes"), {"since": timezone.now().isoformat()})
+
+    def test_invalid_since_parameter(self):
+        for since in ("yesterday", "2024-13-01T00:00:00", ""):
+            response = self.client.get(reverse("api:changes"), {"since": since})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'since' is invalid!"})
+
+    def test_invalid_cursor_parameter(self):
+        for cursor in ("abc", "MjAyNA"):
+            response = self.client.get(reverse("api:changes"), {"cursor": cursor})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'cursor' is invalid!"})
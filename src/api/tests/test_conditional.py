@@ -0,0 +1,52 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class ConditionalAPITestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.price_history1 = PriceHistory.objects.create(variant=self.variant1, price=1000, status=True)
+
+    def test_if_none_match(self):
+        url = reverse("api:mobile-brands")
+        response = self.client.get(url, {"brands": "Brand1", "flat": 1})
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {"brands": "Brand1", "flat": 1}, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_if_none_match_other_parameters(self):
+        url = reverse("api:korea-brands")
+        response = self.client.get(url)
+
+        response = self.client.get(url, {"flat": 1}, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match_after_price_change(self):
+        url = reverse("api:same-nationality")
+        response = self.client.get(url)
+        PriceHistory.objects.create(variant=self.variant1, price=900, status=True)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data[0]["variants"][0]["prices"]), 2)
+
+    def test_if_modified_since(self):
+        url = reverse("api:korea-brands")
+        response = self.client.get(url)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
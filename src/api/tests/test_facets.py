@@ -0,0 +1,74 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class FacetsViewTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        korea = Nationality.objects.create(name="Korea")
+        usa = Nationality.objects.create(name="USA")
+        samsung = Brand.objects.create(name="Samsung", nationality=korea)
+        apple = Brand.objects.create(name="Apple", nationality=usa)
+        galaxy = Mobile.objects.create(brand=samsung, model="Galaxy S24", country=korea)
+        iphone = Mobile.objects.create(brand=apple, model="iPhone 15", country=usa)
+        self.black = Variant.objects.create(mobile=galaxy, color="Black", size=6.2)
+        self.blue = Variant.objects.create(mobile=galaxy, color="Blue", size=6.2)
+        self.iphone_blue = Variant.objects.create(mobile=iphone, color="Blue", size=6.1)
+        PriceHistory.objects.create(variant=self.black, price=1000, date="2024-01-01")
+
+    def test_facets(self):
+        response = self.client.get(reverse("api:facets"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["count"], 3)
+        self.assertListEqual(
+            data["facets"]["brand"], [{"value": "Samsung", "count": 2}, {"value": "Apple", "count": 1}]
+        )
+        self.assertListEqual(data["facets"]["size"], [{"value": "6.0-6.5", "count": 3}])
+        self.assertListEqual(
+            data["facets"]["availability"], [{"value": "no_price", "count": 2}, {"value": "available", "count": 1}]
+        )
+        self.assertListEqual(
+            [variant["id"] for variant in data["results"]], [self.black.pk, self.blue.pk, self.iphone_blue.pk]
+        )
+
+    def test_filters(self):
+        response = self.client.get(reverse("api:facets"), {"color": "Blue", "brand": "Apple,Samsung", "limit": 1})
+
+        data = response.json()
+        self.assertEqual(data["count"], 2)
+        self.assertListEqual(data["facets"]["color"], [{"value": "Blue", "count": 2}])
+        self.assertListEqual([variant["id"] for variant in data["results"]], [self.blue.pk])
+
+    def test_search(self):
+        response = self.client.get(reverse("api:facets"), {"q": "galaxy", "availability": "available"})
+
+        data = response.json()
+        self.assertEqual(data["count"], 1)
+        self.assertListEqual([variant["id"] for variant in data["results"]], [self.black.pk])
+
+    def test_invalid_bucket(self):
+        for name, value in (("size", "6-7"), ("availability", "sold_out"), ("q", " ")):
+            with self.subTest(name):
+                response = self.client.get(reverse("api:facets"), {name: value})
+
+                self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+                self.assertEqual(response.json(), {"error": f"Parameter '{name}' is invalid!"})
+
+    def test_cached_response(self):
+        url = reverse("api:facets")
+        response = self.client.get(url, {"brand": "Apple,Samsung"})
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(url, {"brand": "Samsung,Apple"})
+        self.assertEqual(cached_response.data, response.data)
+
+        PriceHistory.objects.create(variant=self.blue, price=1100, date="2024-01-02")
+        response = self.client.get(url, {"brand": "Apple,Samsung"})
+        self.assertDictEqual(response.json()["facets"]["availability"][0], {"value": "available", "count": 2})
@@ -0,0 +1,165 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.selection import parse_fields, select_queryset
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.serializers import BrandSerializer, MobileSerializer
+
+
+class ParseFieldsTestCase(APITestCase):
+    def test_parse_fields(self):
+        self.assertDictEqual(
+            parse_fields("model,variants.color,variants.prices.price"),
+            {"model": None, "variants": {"color": None, "prices": {"price": None}}},
+        )
+
+    def test_whole_nested_field(self):
+        self.assertDictEqual(parse_fields("variants.color,variants"), {"variants": None})
+        self.assertDictEqual(parse_fields("variants,variants.color"), {"variants": None})
+
+    def test_empty_name(self):
+        for value in ("", "model,", "variants.", ".color"):
+            with self.assertRaises(ValueError):
+                parse_fields(value)
+
+
+class SelectQuerysetTestCase(APITestCase):
+    def test_only_selected_columns(self):
+        serializer = MobileSerializer(fields={"model": None, "brand": None})
+        queryset, _ = select_queryset(Mobile.objects.all(), serializer)
+
+        self.assertSetEqual(queryset.query.deferred_loading[0], {"id", "created", "model", "brand", "brand__name"})
+        self.assertDictEqual(queryset.query.select_related, {"brand": {}})
+        self.assertTupleEqual(queryset._prefetch_related_lookups, ())
+
+    def test_nested_prefetches(self):
+        serializer = BrandSerializer(fields={"name": None, "mobiles": {"model": None}})
+        queryset, _ = select_queryset(Brand.objects.all(), serializer)
+
+        (prefetch,) = queryset._prefetch_related_lookups
+        self.assertEqual(prefetch.prefetch_through, "mobiles")
+        self.assertSetEqual(prefetch.queryset.query.deferred_loading[0], {"id", "brand", "model"})
+        self.assertTupleEqual(prefetch.queryset._prefetch_related_lookups, ())
+
+
+class SparseFieldsViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.brand2 = Brand.objects.create(name="Brand2", nationality=self.nationality_korea)
+
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.mobile2 = Mobile.objects.create(brand=self.brand2, model="Model2", country=self.nationality_korea)
+
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.variant2 = Variant.objects.create(mobile=self.mobile2, color="Blue", size=6.0)
+
+        PriceHistory.objects.create(variant=self.variant1, price=1000, status=True)
+        PriceHistory.objects.create(variant=self.variant1, price=1200, status=False)
+        PriceHistory.objects.create(variant=self.variant2, price=800, status=True)
+
+    def test_top_level_fields(self):
+        response = self.client.get(reverse("api:korea-brands"), {"fields": "id,name"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.data, [{"id": self.brand1.pk, "name": "Brand1"}, {"id": self.brand2.pk, "name": "Brand2"}]
+        )
+
+    def test_nested_fields(self):
+        response = self.client.get(
+            reverse("api:mobile-brands"), {"brands": "Brand1", "fields": "model,variants.color,variants.prices.price"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.data,
+            [
+                {
+                    "model": "Model1",
+                    "variants": [{"color": "Red", "prices": [{"price": "1000"}, {"price": "1200"}]}],
+                }
+            ],
+        )
+
+    def test_whole_nested_field(self):
+        response = self.client.get(reverse("api:same-nationality"), {"fields": "model,variants"})
+
+        data = MobileSerializer([self.mobile1, self.mobile2], many=True).data
+        self.assertListEqual(
+            response.data, [{"model": mobile["model"], "variants": mobile["variants"]} for mobile in data]
+        )
+
+    def test_nested_field_reading_parent(self):
+        response = self.client.get(
+            reverse("api:same-nationality"), {"fields": "variants.mobile,variants.prices.variant"}
+        )
+
+        self.assertListEqual(
+            response.data,
+            [
+                {"variants": [{"mobile": "Model1", "prices": [{"variant": "Red"}, {"variant": "Red"}]}]},
+                {"variants": [{"mobile": "Model2", "prices": [{"variant": "Blue"}]}]},
+            ],
+        )
+
+    def test_fields_skip_prefetches(self):
+        # the page of brands
+        with self.assertNumQueries(1):
+            self.client.get(reverse("api:korea-brands"), {"fields": "name,nationality"})
+
+        # plus one prefetch per nested level
+        with self.assertNumQueries(3):
+            self.client.get(reverse("api:korea-brands"), {"fields": "name,mobiles.variants.color"})
+
+    def test_fields_skip_columns(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("api:korea-brands"), {"fields": "name"})
+
+        # the nationality is still joined by the filter, but none of its columns are selected
+        select_clause = context.captured_queries[-1]["sql"].split(" FROM ")[0]
+        self.assertNotIn("mobiles_nationality", select_clause)
+
+    def test_no_deferred_loading(self):
+        # every column read by the full serializers is selected up front
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse("api:korea-brands"))
+
+        self.assertListEqual(response.data, BrandSerializer([self.brand1, self.brand2], many=True).data)
+
+    def test_flat_fields(self):
+        response = self.client.get(reverse("api:korea-brands"), {"flat": 1, "fields": "price,model,brand"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.data,
+            [
+                {
+                    0: {"brand": "Brand1", "model": "Model1", "price": "1000"},
+                    1: {"brand": "Brand1", "model": "Model1", "price": "1200"},
+                },
+                {0: {"brand": "Brand2", "model": "Model2", "price": "800"}},
+            ],
+        )
+
+    def test_stream_fields(self):
+        response = self.client.get(reverse("api:korea-brands"), {"stream": 1, "fields": "name"})
+
+        self.assertJSONEqual(b"".join(response.streaming_content), [{"name": "Brand1"}, {"name": "Brand2"}])
+
+    def test_invalid_fields_parameter(self):
+        for fields in ("unknown", "name,", "name.first", "mobiles.unknown"):
+            response = self.client.get(reverse("api:korea-brands"), {"fields": fields})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'fields' is invalid!"})
+
+    def test_invalid_flat_fields_parameter(self):
+        for fields in ("name", "mobiles.model", "variants.color"):
+            response = self.client.get(reverse("api:korea-brands"), {"flat": 1, "fields": fields})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'fields' is invalid!"})
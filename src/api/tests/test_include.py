@@ -0,0 +1,76 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.serializers import BrandSerializer, MobileSerializer
+
+
+class IncludeViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+
+        PriceHistory.objects.create(variant=self.variant1, price=1000, status=True)
+        PriceHistory.objects.create(variant=self.variant1, price=1200, status=False)
+
+    def test_include_nothing(self):
+        # the page of brands
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("api:korea-brands"), {"include": ""})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.data, [{"id": self.brand1.pk, "name": "Brand1", "nationality": "Korea"}])
+
+    def test_include_first_level(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("api:korea-brands"), {"include": "mobiles"})
+
+        (brand,) = response.data
+        self.assertNotIn("variants", brand["mobiles"][0])
+        self.assertEqual(brand["mobiles"][0]["model"], "Model1")
+
+    def test_include_second_level(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("api:same-nationality"), {"include": "variants"})
+
+        (mobile,) = response.data
+        self.assertNotIn("prices", mobile["variants"][0])
+        self.assertEqual(mobile["variants"][0]["color"], "Red")
+
+    def test_include_all_levels(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("api:mobile-brands"), {"brands": "Brand1", "include": "variants.prices"})
+
+        self.assertListEqual(response.data, MobileSerializer([self.mobile1], many=True).data)
+
+    def test_include_with_fields(self):
+        response = self.client.get(reverse("api:korea-brands"), {"include": "mobiles", "fields": "name,mobiles.model"})
+
+        self.assertListEqual(response.data, [{"name": "Brand1", "mobiles": [{"model": "Model1"}]}])
+
+    def test_missing_include_parameter(self):
+        response = self.client.get(reverse("api:korea-brands"))
+
+        self.assertListEqual(response.data, BrandSerializer([self.brand1], many=True).data)
+
+    def test_include_ignored_with_flat(self):
+        response = self.client.get(reverse("api:korea-brands"), {"flat": 1, "include": ""})
+
+        self.assertListEqual(response.data, BrandSerializer([self.brand1], many=True, flat=1).data)
+
+    def test_invalid_include_parameter(self):
+        for include in ("name", "variants", "mobiles.unknown", "mobiles,"):
+            response = self.client.get(reverse("api:korea-brands"), {"include": include})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'include' is invalid!"})
+
+    def test_fields_outside_include(self):
+        response = self.client.get(reverse("api:korea-brands"), {"include": "", "fields": "mobiles.model"})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertDictEqual(response.data, {"error": "Parameter 'fields' is invalid!"})
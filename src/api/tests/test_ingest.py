@@ -0,0 +1,91 @@
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.cache import get_catalog_version
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class PriceHistoryBulkCreateViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.variant2 = Variant.objects.create(mobile=self.mobile1, color="Blue", size=6.0)
+
+    def test_json(self):
+        rows = [
+            {"variant": self.variant1.pk, "price": 1000, "status": True, "date": "2024-01-01"},
+            {"variant": self.variant2.pk, "price": 800, "status": False, "date": "2024-01-02"},
+        ]
+        response = self.client.post(reverse("api:prices-bulk"), rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertDictEqual(response.data, {"created": 2, "errors": []})
+        self.assertQuerySetEqual(
+            PriceHistory.objects.order_by("id").values_list("variant", "price", "status", "date"),
+            [(self.variant1.pk, 1000, True, date(2024, 1, 1)), (self.variant2.pk, 800, False, date(2024, 1, 2))],
+        )
+
+    def test_csv(self):
+        body = f"variant,price,status,date\n{self.variant1.pk},1000,true,2024-01-01\n{self.variant2.pk},800,,\n"
+        response = self.client.post(reverse("api:prices-bulk"), body, content_type="text/csv")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertDictEqual(response.data, {"created": 2, "errors": []})
+
+        price = PriceHistory.objects.get(variant=self.variant2)
+        self.assertTrue(price.status)
+        self.assertEqual(price.date, date.today())
+
+    def test_row_errors(self):
+        rows = [
+            {"variant": self.variant1.pk, "price": 1000},
+            {"variant": self.variant1.pk, "price": 0},
+            {"variant": 0, "price": 1000},
+            {"price": 1000},
+            "row",
+            {"variant": self.variant2.pk, "price": 800},
+        ]
+        response = self.client.post(reverse("api:prices-bulk"), rows, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertListEqual([error["row"] for error in response.data["errors"]], [1, 2, 3, 4])
+        self.assertIn("price", response.data["errors"][0]["errors"])
+        self.assertDictEqual(
+            response.data["errors"][1]["errors"], {"variant": ['Invalid pk "0" - object does not exist.']}
+        )
+        self.assertIn("variant", response.data["errors"][2]["errors"])
+        self.assertIn("non_field_errors", response.data["errors"][3]["errors"])
+        self.assertEqual(PriceHistory.objects.count(), 2)
+
+    def test_all_rows_invalid(self):
+        response = self.client.post(reverse("api:prices-bulk"), [{"variant": 0, "price": 1000}], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["created"], 0)
+        self.assertFalse(PriceHistory.objects.exists())
+
+    def test_num_queries(self):
+        rows = [{"variant": self.variant1.pk, "price": 1000 + index} for index in range(40)]
+
+        # variants of the batch, then the prices, their change log entries, the current price of their variants and
+        # their catalog rows (read and inserted) inside a savepoint and its release
+        with self.assertNumQueries(8):
+            self.client.post(reverse("api:prices-bulk"), rows, format="json")
+
+    def test_invalidates_cache(self):
+        version = get_catalog_version()
+        self.client.post(reverse("api:prices-bulk"), [{"variant": self.variant1.pk, "price": 1000}], format="json")
+
+        self.assertNotEqual(get_catalog_version(), version)
+
+    def test_invalid_payload(self):
+        response = self.client.post(reverse("api:prices-bulk"), {"variant": self.variant1.pk}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertDictEqual(response.data, {"error": "Expected a list of prices!"})
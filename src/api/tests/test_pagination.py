@@ -0,0 +1,86 @@
+import re
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from api.pagination import KeysetPagination
+from mobiles.models import Brand, Mobile, Nationality
+from mobiles.serializers import BrandSerializer, MobileSerializer
+
+
+def next_cursor(response):
+    match = re.search(r"[?&]cursor=([^&>]+)", response.get("Link", ""))
+    return match.group(1) if match else None
+
+
+class KeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brands = [Brand.objects.create(name=f"Brand{i}", nationality=self.nationality_korea) for i in range(5)]
+        self.mobiles = [
+            Mobile.objects.create(brand=self.brands[0], model=f"Model{i}", country=self.nationality_korea)
+            for i in range(5)
+        ]
+
+    def test_limit(self):
+        response = self.client.get(reverse("api:korea-brands"), {"limit": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.data, BrandSerializer(self.brands[:2], many=True).data)
+        self.assertIn('rel="next"', response["Link"])
+
+    def test_follow_cursor(self):
+        response = self.client.get(reverse("api:korea-brands"), {"limit": 2})
+        response = self.client.get(reverse("api:korea-brands"), {"limit": 2, "cursor": next_cursor(response)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.data, BrandSerializer(self.brands[2:4], many=True).data)
+
+        response = self.client.get(reverse("api:korea-brands"), {"limit": 2, "cursor": next_cursor(response)})
+
+        self.assertListEqual(response.data, BrandSerializer(self.brands[4:], many=True).data)
+        self.assertNotIn("Link", response)
+
+    def test_follow_cursor_mobile_brands(self):
+        url = reverse("api:mobile-brands")
+        response = self.client.get(url, {"brands": "Brand0", "limit": 3, "flat": 1})
+        response = self.client.get(url, {"brands": "Brand0", "limit": 3, "flat": 1, "cursor": next_cursor(response)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(response.data, MobileSerializer(self.mobiles[3:], many=True, flat=1).data)
+
+    def test_follow_cursor_same_nationality(self):
+        response = self.client.get(reverse("api:same-nationality"), {"limit": 4})
+        self.assertListEqual(response.data, MobileSerializer(self.mobiles[:4], many=True).data)
+
+        response = self.client.get(reverse("api:same-nationality"), {"limit": 4, "cursor": next_cursor(response)})
+        self.assertListEqual(response.data, MobileSerializer(self.mobiles[4:], many=True).data)
+
+    def test_same_created_ordered_by_id(self):
+        Brand.objects.update(created=self.brands[0].created)
+        cursor = KeysetPagination.encode_cursor(self.brands[0].created, self.brands[1].pk)
+
+        response = self.client.get(reverse("api:korea-brands"), {"cursor": cursor})
+
+        self.assertListEqual([brand["id"] for brand in response.data], [brand.pk for brand in self.brands[2:]])
+
+    def test_max_limit(self):
+        response = self.client.get(reverse("api:korea-brands"), {"limit": KeysetPagination.max_limit + 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 5)
+
+    def test_invalid_limit_parameter(self):
+        for limit in ("abc", "0", "-1"):
+            response = self.client.get(reverse("api:korea-brands"), {"limit": limit})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'limit' is invalid!"})
+
+    def test_invalid_cursor_parameter(self):
+        for cursor in ("abc", "bm90LWEtY3Vyc29y"):
+            response = self.client.get(reverse("api:korea-brands"), {"cursor": cursor})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'cursor' is invalid!"})
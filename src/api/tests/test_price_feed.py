@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from api.async_views import AsyncPriceFeedView
+from mobiles.cache import bump_price_feed_version
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class AsyncPriceFeedViewTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = AsyncClient()
+
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+
+        self.price1 = PriceHistory.objects.create(variant=self.variant1, price=1000)
+        self.price2 = PriceHistory.objects.create(variant=self.variant1, price=1200)
+
+    async def test_cursor(self):
+        response = await self.client.get(reverse("api:async-price-feed"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"prices": [], "cursor": self.price2.pk})
+
+    async def test_existing_prices(self):
+        response = await self.client.get(reverse("api:async-price-feed"), {"after": self.price1.pk})
+
+        data = response.json()
+        self.assertListEqual([price["id"] for price in data["prices"]], [self.price2.pk])
+        self.assertEqual(data["prices"][0]["variant"], "Red")
+        self.assertEqual(data["cursor"], self.price2.pk)
+
+    async def test_timeout(self):
+        response = await self.client.get(reverse("api:async-price-feed"), {"after": self.price2.pk, "timeout": 0})
+
+        self.assertEqual(response.json(), {"prices": [], "cursor": self.price2.pk})
+
+    @patch.object(AsyncPriceFeedView, "poll_interval", 0.01)
+    async def test_wait_for_new_prices(self):
+        @sync_to_async
+        def create_price():
+            price = PriceHistory.objects.create(variant=self.variant1, price=1500)
+            # ``on_commit`` callbacks do not run inside the test transaction.
+            bump_price_feed_version()
+            return price
+
+        async def create_price_later():
+            await asyncio.sleep(0.1)
+            return await create_price()
+
+        response, price = await asyncio.gather(
+            self.client.get(reverse("api:async-price-feed"), {"after": self.price2.pk, "timeout": 5}),
+            create_price_later(),
+        )
+
+        self.assertEqual(response.json()["cursor"], price.pk)
+        self.assertListEqual([price["id"] for price in response.json()["prices"]], [price.pk])
+
+    @override_settings(COMMIT_VISIBILITY_LAG=60)
+    async def test_visibility_lag(self):
+        # The prices could have ingests still in flight before them.
+        response = await self.client.get(reverse("api:async-price-feed"), {"after": 0, "timeout": 0})
+        self.assertEqual(response.json(), {"prices": [], "cursor": 0})
+
+        response = await self.client.get(reverse("api:async-price-feed"))
+        self.assertEqual(response.json(), {"prices": [], "cursor": 0})
+
+    @patch.object(AsyncPriceFeedView, "poll_interval", 0.01)
+    @override_settings(COMMIT_VISIBILITY_LAG=0.2)
+    async def test_wait_for_visible_prices(self):
+        price = await sync_to_async(PriceHistory.objects.create)(variant=self.variant1, price=1500)
+        await sync_to_async(bump_price_feed_version)()
+
+        response = await self.client.get(reverse("api:async-price-feed"), {"after": self.price2.pk, "timeout": 5})
+
+        self.assertListEqual([price["id"] for price in response.json()["prices"]], [price.pk])
+
+    @patch.object(AsyncPriceFeedView, "poll_interval", 0.01)
+    def test_idle_without_queries(self):
+        async def request():
+            return await self.client.get(reverse("api:async-price-feed"), {"after": self.price2.pk, "timeout": 1})
+
+        # a single query for the whole wait while no new price is committed
+        with self.assertNumQueries(1):
+            async_to_sync(request)()
+
+    async def test_invalid_timeout_parameter(self):
+        for timeout in ("abc", "-1"):
+            response = await self.client.get(reverse("api:async-price-feed"), {"after": 0, "timeout": timeout})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertEqual(response.json(), {"error": "Parameter 'timeout' is invalid!"})
+
+    async def test_invalid_after_parameter(self):
+        response = await self.client.get(reverse("api:async-price-feed"), {"after": "abc"})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response.json(), {"error": "Parameter 'after' is invalid!"})
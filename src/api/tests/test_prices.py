@@ -0,0 +1,140 @@
+from datetime import date
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.serializers import BrandSerializer, MobileSerializer
+
+
+class PricesViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.variant2 = Variant.objects.create(mobile=self.mobile1, color="Blue", size=6.0)
+
+        self.price1 = PriceHistory.objects.create(variant=self.variant1, price=1000, date=date(2024, 1, 3))
+        self.price2 = PriceHistory.objects.create(variant=self.variant1, price=1100, date=date(2024, 1, 1))
+        self.price3 = PriceHistory.objects.create(variant=self.variant1, price=1200, date=date(2024, 1, 2))
+        self.price4 = PriceHistory.objects.create(variant=self.variant2, price=800, date=date(2024, 1, 1))
+        self.price5 = PriceHistory.objects.create(variant=self.variant2, price=900, date=date(2024, 1, 1))
+
+    def get_prices(self, response):
+        return [[price["id"] for price in variant["prices"]] for variant in response.data[0]["variants"]]
+
+    def test_latest(self):
+        response = self.client.get(reverse("api:same-nationality"), {"prices": "latest"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # the newest date wins, and the last created price of the same date
+        self.assertListEqual(self.get_prices(response), [[self.price1.pk], [self.price5.pk]])
+
+    def test_last(self):
+        response = self.client.get(reverse("api:same-nationality"), {"prices": "last:2"})
+
+        self.assertListEqual(
+            self.get_prices(response), [[self.price1.pk, self.price3.pk], [self.price4.pk, self.price5.pk]]
+        )
+
+    def test_last_more_than_available(self):
+        response = self.client.get(reverse("api:same-nationality"), {"prices": "last:10"})
+
+        self.assertListEqual(response.data, MobileSerializer([self.mobile1], many=True).data)
+
+    def test_all(self):
+        response = self.client.get(reverse("api:same-nationality"), {"prices": "all"})
+
+        self.assertListEqual(response.data, MobileSerializer([self.mobile1], many=True).data)
+
+    def test_latest_windowed_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("api:korea-brands"), {"prices": "latest"})
+
+        prices_query = context.captured_queries[-1]["sql"]
+        self.assertIn("ROW_NUMBER() OVER (PARTITION BY", prices_query)
+        self.assertEqual(len(context.captured_queries), 4)
+
+    def test_latest_flat(self):
+        response = self.client.get(reverse("api:korea-brands"), {"prices": "latest", "flat": 1})
+
+        data = BrandSerializer([self.brand1], many=True, flat=1).data
+        self.assertListEqual(response.data, [{0: data[0][0], 1: data[0][4]}])
+
+    def test_last_flat(self):
+        response = self.client.get(reverse("api:mobile-brands"), {"brands": "Brand1", "prices": "last:2", "flat": 1})
+
+        data = MobileSerializer([self.mobile1], many=True, flat=1).data
+        self.assertListEqual(response.data, [{0: data[0][0], 1: data[0][2], 2: data[0][3], 3: data[0][4]}])
+
+    def test_invalid_prices_parameter(self):
+        for prices in ("newest", "last", "last:", "last:0", "last:-1", "last:a", "first:1"):
+            response = self.client.get(reverse("api:korea-brands"), {"prices": prices})
+
+            self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+            self.assertDictEqual(response.data, {"error": "Parameter 'prices' is invalid!"})
+
+
+class PriceDateRangeViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+
+        self.price1 = PriceHistory.objects.create(variant=self.variant1, price=1000, date=date(2024, 1, 1))
+        self.price2 = PriceHistory.objects.create(variant=self.variant1, price=1100, date=date(2024, 2, 1))
+        self.price3 = PriceHistory.objects.create(variant=self.variant1, price=1200, date=date(2024, 3, 1))
+
+    def get_prices(self, response):
+        return [price["id"] for price in response.data[0]["variants"][0]["prices"]]
+
+    def test_price_from(self):
+        response = self.client.get(reverse("api:same-nationality"), {"price_from": "2024-02-01"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(self.get_prices(response), [self.price2.pk, self.price3.pk])
+
+    def test_price_to(self):
+        response = self.client.get(reverse("api:same-nationality"), {"price_to": "2024-02-01"})
+
+        self.assertListEqual(self.get_prices(response), [self.price1.pk, self.price2.pk])
+
+    def test_price_range(self):
+        response = self.client.get(
+            reverse("api:mobile-brands"), {"brands": "Brand1", "price_from": "2024-01-15", "price_to": "2024-02-15"}
+        )
+
+        self.assertListEqual(self.get_prices(response), [self.price2.pk])
+
+    def test_price_range_latest(self):
+        response = self.client.get(reverse("api:same-nationality"), {"price_to": "2024-02-15", "prices": "latest"})
+
+        self.assertListEqual(self.get_prices(response), [self.price2.pk])
+
+    def test_price_range_in_prefetch(self):
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(reverse("api:korea-brands"), {"price_from": "2024-02-01"})
+
+        # The prices are followed by the archive index.
+        self.assertIn('"mobiles_pricehistory"."date" >= ', context.captured_queries[-2]["sql"])
+
+    def test_price_range_flat(self):
+        response = self.client.get(reverse("api:korea-brands"), {"price_from": "2024-03-01", "flat": 1})
+
+        data = BrandSerializer([self.brand1], many=True, flat=1).data
+        self.assertListEqual(response.data, [{0: data[0][2]}])
+
+    def test_invalid_price_date_parameters(self):
+        for name in ("price_from", "price_to"):
+            for value in ("2024-13-01", "yesterday", ""):
+                response = self.client.get(reverse("api:korea-brands"), {name: value})
+
+                self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+                self.assertDictEqual(response.data, {"error": f"Parameter '{name}' is invalid!"})
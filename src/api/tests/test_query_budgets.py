@@ -0,0 +1,98 @@
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from mobiles.models import Nationality, Variant
+from mobiles.rollups import update_price_rollups
+from mobiles.tests.util import QueryCountTestMixin, create_catalog
+
+
+class APIQueryBudgetsTestCase(QueryCountTestMixin, APITestCase):
+    def setUp(self):
+        self.index = 0
+        self.nationality = Nationality.objects.create(name="Korea")
+        self.brand = create_catalog(0, self.nationality)
+        self.variant = Variant.objects.first()
+
+    def tearDown(self):
+        # Removes the images of the variants.
+        Variant.objects.all().delete()
+
+    def grow(self):
+        for _ in range(3):
+            self.index += 1
+            create_catalog(self.index, self.nationality)
+
+    def get(self, name, params=None):
+        def request():
+            response = self.client.get(reverse(name), params)
+            self.assertEqual(response.status_code, 200)
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        return request
+
+    def aget(self, name, params=None):
+        client = AsyncClient()
+
+        # A coroutine function: ``async_to_sync`` warns about the plain method of the client.
+        async def request():
+            return await client.get(reverse(name), params)
+
+        return lambda: self.assertEqual(async_to_sync(request)().status_code, 200)
+
+    def test_list_apis(self):
+        for name, params in (
+            ("api:korea-brands", {}),
+            ("api:korea-brands", {"flat": 1}),
+            ("api:korea-brands", {"stream": 1}),
+            ("api:korea-brands", {"prices": "latest", "price_from": "2024-01-01"}),
+            ("api:korea-brands", {"include": "mobiles", "fields": "name,mobiles.model"}),
+            ("api:mobile-brands", {"brands": "Brand0,Brand1,Brand2"}),
+            ("api:mobile-brands", {"brands": "Brand0,Brand1,Brand2", "flat": 1, "stream": 1}),
+            ("api:same-nationality", {}),
+            ("api:same-nationality", {"flat": 1}),
+        ):
+            with self.subTest(name, **params):
+                self.assertConstantQueries(self.get(name, params), self.grow)
+
+    def test_async_list_apis(self):
+        for name, params in (
+            ("api:async-korea-brands", {}),
+            ("api:async-mobile-brands", {"brands": "Brand0,Brand1,Brand2", "flat": 1}),
+            ("api:async-same-nationality", {"include": "variants"}),
+            ("api:async-price-feed", {"timeout": 0, "after": 0}),
+        ):
+            with self.subTest(name, **params):
+                self.assertConstantQueries(self.aget(name, params), self.grow)
+
+    def test_changes(self):
+        self.assertConstantQueries(self.get("api:changes", {"limit": 5}), self.grow)
+
+    def test_change_log(self):
+        self.assertConstantQueries(self.get("api:change-log", {"limit": 5}), self.grow)
+
+    def test_price_rollups(self):
+        update_price_rollups()
+        self.assertConstantQueries(
+            self.get("api:price-rollups", {"variant": self.variant.pk, "period": "week"}), self.grow
+        )
+
+    def test_search(self):
+        self.assertConstantQueries(self.get("api:search", {"q": "brand red"}), self.grow)
+
+    def test_facets(self):
+        self.assertConstantQueries(self.get("api:facets", {"color": "Red", "availability": "available"}), self.grow)
+
+    def test_prices_bulk(self):
+        def request():
+            rows = [{"variant": self.variant.pk, "price": 1000 + index} for index in range(20)]
+            self.assertEqual(self.client.post(reverse("api:prices-bulk"), rows, format="json").status_code, 201)
+
+        self.assertConstantQueries(request, self.grow)
+
+    def test_schema(self):
+        for name in ("api:schema", "api:swagger-ui", "api:redoc"):
+            with self.subTest(name):
+                self.assertConstantQueries(self.get(name), self.grow)
@@ -0,0 +1,86 @@
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.rollups import update_price_rollups
+
+
+class PriceRollupsViewTestCase(APITestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        self.mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.variant = Variant.objects.create(mobile=self.mobile, color="Red", size=5.5)
+        for price, day in ((1000, date(2024, 1, 1)), (1200, date(2024, 1, 3)), (1300, date(2024, 2, 5))):
+            PriceHistory.objects.create(variant=self.variant, price=price, date=day)
+        update_price_rollups()
+
+    def test_variant(self):
+        response = self.client.get(reverse("api:price-rollups"), {"variant": self.variant.pk, "period": "month"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.json()["rollups"],
+            [
+                {
+                    "start": "2024-01-01",
+                    "min_price": "1000",
+                    "max_price": "1200",
+                    "avg_price": "1100.00",
+                    "last_price": "1200",
+                    "count": 2,
+                },
+                {
+                    "start": "2024-02-01",
+                    "min_price": "1300",
+                    "max_price": "1300",
+                    "avg_price": "1300.00",
+                    "last_price": "1300",
+                    "count": 1,
+                },
+            ],
+        )
+
+    def test_mobile_date_range(self):
+        response = self.client.get(
+            reverse("api:price-rollups"),
+            {"mobile": self.mobile.pk, "price_from": "2024-01-02", "price_to": "2024-02-04"},
+        )
+
+        self.assertListEqual([rollup["start"] for rollup in response.json()["rollups"]], ["2024-01-03"])
+
+    def test_limit(self):
+        response = self.client.get(reverse("api:price-rollups"), {"variant": self.variant.pk, "limit": 2})
+
+        self.assertListEqual([rollup["start"] for rollup in response.json()["rollups"]], ["2024-01-01", "2024-01-03"])
+        self.assertEqual(response.json()["next"], "2024-01-04")
+
+        response = self.client.get(
+            reverse("api:price-rollups"), {"variant": self.variant.pk, "limit": 2, "price_from": "2024-01-04"}
+        )
+
+        self.assertListEqual([rollup["start"] for rollup in response.json()["rollups"]], ["2024-02-05"])
+        self.assertIsNone(response.json()["next"])
+
+    def test_missing_object(self):
+        response = self.client.get(reverse("api:price-rollups"))
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.data, {"error": "Parameter 'variant' is missing!"})
+
+    def test_invalid_parameters(self):
+        for params, name in (
+            ({"variant": self.variant.pk, "mobile": self.mobile.pk}, "mobile"),
+            ({"variant": "red"}, "variant"),
+            ({"variant": self.variant.pk, "period": "year"}, "period"),
+            ({"variant": self.variant.pk, "price_from": "2024-13-01"}, "price_from"),
+            ({"variant": self.variant.pk, "limit": 0}, "limit"),
+        ):
+            with self.subTest(name):
+                response = self.client.get(reverse("api:price-rollups"), params)
+
+                self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+                self.assertEqual(response.data, {"error": f"Parameter '{name}' is invalid!"})
@@ -0,0 +1,56 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class SearchViewTestCase(APITestCase):
+    def setUp(self):
+        korea = Nationality.objects.create(name="Korea")
+        vietnam = Nationality.objects.create(name="Vietnam")
+        brand = Brand.objects.create(name="Samsung", nationality=korea)
+        mobile = Mobile.objects.create(brand=brand, model="Galaxy S24", country=vietnam)
+        self.blue = Variant.objects.create(mobile=mobile, color="Sky Blue", size=6.2)
+        self.black = Variant.objects.create(mobile=mobile, color="Black", size=6.2)
+        PriceHistory.objects.create(variant=self.blue, price=1000, date="2024-01-01")
+
+    def test_search(self):
+        response = self.client.get(reverse("api:search"), {"q": "samsung blue"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(
+            response.json()["results"],
+            [
+                {
+                    "id": self.blue.pk,
+                    "brand": "Samsung",
+                    "nationality": "Korea",
+                    "model": "Galaxy S24",
+                    "country": "Vietnam",
+                    "color": "Sky Blue",
+                    "size": 6.2,
+                    "current_price": "1000",
+                    "current_status": "Available",
+                    "price_date": "2024-01-01",
+                    "image": None,
+                }
+            ],
+        )
+
+    def test_limit(self):
+        response = self.client.get(reverse("api:search"), {"q": "galaxy", "limit": 1})
+
+        self.assertListEqual([variant["id"] for variant in response.json()["results"]], [self.blue.pk])
+
+    def test_missing_query(self):
+        response = self.client.get(reverse("api:search"))
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(response.json(), {"error": "Parameter 'q' is missing!"})
+
+    def test_blank_query(self):
+        response = self.client.get(reverse("api:search"), {"q": "  "})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response.json(), {"error": "Parameter 'q' is invalid!"})
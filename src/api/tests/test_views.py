@@ -1,5 +1,8 @@
+import json
+
 from django.urls import reverse
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 
 from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
@@ -66,6 +69,11 @@ class KoreaBrandsViewTestCase(APITestCase):
         self.assertEqual(len(response.data), 3)
         self.assertListEqual(response.data, BrandSerializer([self.brand1, brand3, brand4], many=True, flat=1).data)
 
+    def test_get_korea_brands_flat_num_queries(self):
+        # page of brands and the joined price rows
+        with self.assertNumQueries(2):
+            self.client.get(reverse("api:korea-brands"), {"flat": 1})
+
     def test_invalid_flat_parameter(self):
         url = reverse("api:korea-brands") + "?flat=True"
         response = self.client.get(url)
@@ -195,3 +203,52 @@ class SameNationalityViewTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
         self.assertDictEqual(response.data, {"error": "Parameter 'flat' is invalid!"})
+
+
+class StreamingViewTestCase(APITestCase):
+    def setUp(self):
+        self.nationality_korea = Nationality.objects.create(name="Korea")
+        self.brand1 = Brand.objects.create(name="Brand1", nationality=self.nationality_korea)
+        self.brand2 = Brand.objects.create(name="Brand2", nationality=self.nationality_korea)
+
+        self.mobile1 = Mobile.objects.create(brand=self.brand1, model="Model1", country=self.nationality_korea)
+        self.mobile2 = Mobile.objects.create(brand=self.brand2, model="Model2", country=self.nationality_korea)
+
+        self.variant1 = Variant.objects.create(mobile=self.mobile1, color="Red", size=5.5)
+        self.variant2 = Variant.objects.create(mobile=self.mobile2, color="Blue", size=6.0)
+
+        PriceHistory.objects.create(variant=self.variant1, price=1000, status=True)
+        PriceHistory.objects.create(variant=self.variant1, price=1200, status=False)
+        PriceHistory.objects.create(variant=self.variant2, price=800, status=True)
+
+    def assertStreamEqual(self, response, data):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), json.loads(JSONRenderer().render(data)))
+
+    def test_stream_korea_brands_flat(self):
+        response = self.client.get(reverse("api:korea-brands"), {"flat": 1, "stream": 1})
+
+        self.assertStreamEqual(response, BrandSerializer([self.brand1, self.brand2], many=True, flat=1).data)
+
+    def test_stream_mobile_brands_flat(self):
+        response = self.client.get(reverse("api:mobile-brands"), {"brands": "Brand1,Brand2", "flat": 1, "stream": 1})
+
+        self.assertStreamEqual(response, MobileSerializer([self.mobile1, self.mobile2], many=True, flat=1).data)
+
+    def test_stream_same_nationality(self):
+        response = self.client.get(reverse("api:same-nationality"), {"stream": 1, "limit": 1})
+
+        self.assertStreamEqual(response, MobileSerializer([self.mobile1, self.mobile2], many=True).data)
+
+    def test_stream_empty(self):
+        response = self.client.get(reverse("api:mobile-brands"), {"brands": "InvalidBrand", "stream": 1})
+
+        self.assertStreamEqual(response, [])
+
+    def test_invalid_stream_parameter(self):
+        response = self.client.get(reverse("api:korea-brands"), {"stream": "True"})
+
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertDictEqual(response.data, {"error": "Parameter 'stream' is invalid!"})
@@ -1,7 +1,7 @@
 from django.urls import path
 from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
 
-from api import views
+from api import async_views, views
 
 app_name = "api"
 
@@ -9,6 +9,17 @@ urlpatterns = [
     path("korea-brands/", views.KoreaBrandsView.as_view(), name="korea-brands"),
     path("mobile-brands/", views.MobileBrandsView.as_view(), name="mobile-brands"),
     path("same-nationality/", views.SameNationalityView.as_view(), name="same-nationality"),
+    path("prices/bulk/", views.PriceHistoryBulkCreateView.as_view(), name="prices-bulk"),
+    path("prices/rollups/", views.PriceRollupsView.as_view(), name="price-rollups"),
+    path("changes/", views.ChangesView.as_view(), name="changes"),
+    path("change-log/", views.ChangeLogView.as_view(), name="change-log"),
+    path("search/", views.SearchView.as_view(), name="search"),
+    path("facets/", views.FacetsView.as_view(), name="facets"),
+    # Async (ASGI)
+    path("async/korea-brands/", async_views.AsyncKoreaBrandsView.as_view(), name="async-korea-brands"),
+    path("async/mobile-brands/", async_views.AsyncMobileBrandsView.as_view(), name="async-mobile-brands"),
+    path("async/same-nationality/", async_views.AsyncSameNationalityView.as_view(), name="async-same-nationality"),
+    path("async/prices/feed/", async_views.AsyncPriceFeedView.as_view(), name="async-price-feed"),
     # Spectacular
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path("schema/swagger-ui/", SpectacularSwaggerView.as_view(url_name="api:schema"), name="swagger-ui"),
@@ -1,131 +1,676 @@
-from django.db.models import F
+from datetime import timedelta
+from math import ceil
+
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.decorators import method_decorator
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiExample, OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import status
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from mobiles.models import Brand, Mobile
-from mobiles.serializers import BrandSerializer, MobileSerializer
+from api.cache import cache_response
+from api.exceptions import InvalidParameter, InvalidPayload, MissingParameter
+from api.mixins import KoreaBrandsMixin, MobileBrandsMixin, SameNationalityMixin
+from api.pagination import KeysetPagination
+from api.parameters import (
+    FIELDS_PARAMETER,
+    FLAT_PARAMETER,
+    INCLUDE_PARAMETER,
+    LIMIT_PARAMETER,
+    PAGINATION_PARAMETERS,
+    PRICE_DATE_PARAMETERS,
+    PRICES_PARAMETER,
+    STREAM_PARAMETER,
+    get_date_parameter,
+    get_datetime_parameter,
+    get_int_parameter,
+    get_limit_parameter,
+)
+from api.parsers import CSVParser
+from api.streaming import StreamingJSONResponse, astream, stream
+from mobiles.changes import decode_position, encode_position, get_changes, visible_before
+from mobiles.conditional import catalog_condition
+from mobiles.facets import AVAILABILITIES, FACETS, count_facets, filter_facets, get_size_buckets
+from mobiles.ingest import INGEST_BATCH_SIZE, ingest_prices
+from mobiles.managers import VARIANT_CATALOG_ORDERING
+from mobiles.models import ChangeLog, PriceRollup, Variant
+from mobiles.search import search_variants
+from mobiles.serializers import (
+    BrandSerializer,
+    MobileSerializer,
+    PriceHistoryIngestSerializer,
+    PriceRollupSerializer,
+    VariantSearchSerializer,
+)
+
+
+class BaseListView(APIView):
+    # The ``query_budget`` of the subclasses counts one query reading the archive index for a date range.
+    def list(self, request):
+        queryset = self.get_queryset(request)
+        flat = get_int_parameter(request, "flat")
+        queryset = self.prepare_queryset(request, queryset, flat)
+
+        if get_int_parameter(request, "stream"):
+            # Under ASGI, Django reads a sync iterator in full before sending it, an async one is sent as it goes.
+            if isinstance(request._request, ASGIRequest):
+                return StreamingJSONResponse(astream(queryset, self.serialize))
+            return StreamingJSONResponse(stream(queryset.order_by("created", "id"), self.serialize))
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+
+        return paginator.get_paginated_response(self.serialize(page))
 
 
-class KoreaBrandsView(APIView):
-    serializer_class = BrandSerializer
+class KoreaBrandsView(KoreaBrandsMixin, BaseListView):
+    query_budget = 5
 
     @extend_schema(
         description="Get a list of brands from Korea along with their related mobiles and variants.",
+        parameters=[
+            FLAT_PARAMETER,
+            FIELDS_PARAMETER,
+            INCLUDE_PARAMETER,
+            PRICES_PARAMETER,
+            *PRICE_DATE_PARAMETERS,
+            STREAM_PARAMETER,
+            *PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: BrandSerializer(many=True),
+            406: OpenApiResponse(
+                response=dict,
+                description=(
+                    "Flat, fields, include, prices, price_from, price_to, stream, limit or cursor parameter is invalid."
+                ),
+                examples=[OpenApiExample("406", {"error": "Parameter 'flat' is invalid!"})],
+            ),
+        },
+    )
+    @method_decorator(catalog_condition())
+    @cache_response
+    def get(self, request):
+        return self.list(request)
+
+
+class MobileBrandsView(MobileBrandsMixin, BaseListView):
+    query_budget = 4
+
+    @extend_schema(
+        description="Get a list of mobiles filtered by brand names.",
         parameters=[
             OpenApiParameter(
-                name="flat",
-                type=int,
+                name="brands",
+                type=str,
+                required=True,
                 location=OpenApiParameter.QUERY,
-                description="Set to 1 to get the flat representation of the data.",
-                required=False,
+                description="Comma-separated brand names to filter mobiles by.",
             ),
+            FLAT_PARAMETER,
+            FIELDS_PARAMETER,
+            INCLUDE_PARAMETER,
+            PRICES_PARAMETER,
+            *PRICE_DATE_PARAMETERS,
+            STREAM_PARAMETER,
+            *PAGINATION_PARAMETERS,
         ],
         responses={
-            200: serializer_class(many=True),
+            200: MobileSerializer(many=True),
             406: OpenApiResponse(
                 response=dict,
-                description="Flat parameter is missing.",
+                description=(
+                    "Flat, fields, include, prices, price_from, price_to, stream, limit or cursor parameter is invalid."
+                ),
                 examples=[OpenApiExample("406", {"error": "Parameter 'flat' is invalid!"})],
             ),
+            422: OpenApiResponse(
+                response=dict,
+                description="Brands parameter is missing.",
+                examples=[OpenApiExample("406", {"error": "Parameter 'brands' is missing!"})],
+            ),
         },
     )
+    @method_decorator(catalog_condition())
+    @cache_response
     def get(self, request):
-        try:
-            flat = int(request.GET.get("flat", 0))
-        except ValueError:
-            return Response({"error": "Parameter 'flat' is invalid!"}, status.HTTP_406_NOT_ACCEPTABLE)
+        return self.list(request)
 
-        brands = Brand.objects.filter(nationality__name="Korea").prefetch_related("mobiles__variants__prices")
 
-        serializer = self.serializer_class(brands, many=True, flat=flat)
+class SameNationalityView(SameNationalityMixin, BaseListView):
+    query_budget = 4
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    @extend_schema(
+        description="Get a list of mobiles with the same brand nationality and country.",
+        parameters=[
+            FLAT_PARAMETER,
+            FIELDS_PARAMETER,
+            INCLUDE_PARAMETER,
+            PRICES_PARAMETER,
+            *PRICE_DATE_PARAMETERS,
+            STREAM_PARAMETER,
+            *PAGINATION_PARAMETERS,
+        ],
+        responses={
+            200: MobileSerializer(many=True),
+            406: OpenApiResponse(
+                response=dict,
+                description=(
+                    "Flat, fields, include, prices, price_from, price_to, stream, limit or cursor parameter is invalid."
+                ),
+                examples=[OpenApiExample("406", {"error": "Parameter 'flat' is invalid!"})],
+            ),
+        },
+    )
+    @method_decorator(catalog_condition())
+    @cache_response
+    def get(self, request):
+        return self.list(request)
 
 
-class MobileBrandsView(APIView):
-    serializer_class = MobileSerializer
+class PriceHistoryBulkCreateView(APIView):
+    # For each batch of rows, on PostgreSQL and with compaction.
+    query_budget = 19
+    parser_classes = (JSONParser, CSVParser)
 
     @extend_schema(
-        description="Get a list of mobiles filtered by brand names.",
+        description=(
+            "Create prices in bulk from a JSON array or a CSV file with a `variant,price,status,date` header. Rows are "
+            "validated and inserted in batches, and invalid rows are reported without aborting the others."
+        ),
+        request={
+            "application/json": PriceHistoryIngestSerializer(many=True),
+            "text/csv": {"type": "string"},
+        },
+        responses={
+            201: OpenApiResponse(
+                response=dict,
+                description="Valid rows are created, invalid rows are listed with their errors.",
+                examples=[
+                    OpenApiExample(
+                        "201",
+                        {"created": 2, "errors": [{"row": 1, "errors": {"price": ["This field is required."]}}]},
+                    )
+                ],
+            ),
+            400: OpenApiResponse(
+                response=dict,
+                description="The body is not a list of rows, or none of the rows is valid.",
+                examples=[OpenApiExample("400", {"error": "Expected a list of prices!"})],
+            ),
+        },
+    )
+    def post(self, request):
+        if not isinstance(request.data, list):
+            raise InvalidPayload("Expected a list of prices!")
+
+        request._request.query_budget = self.query_budget * max(ceil(len(request.data) / INGEST_BATCH_SIZE), 1)
+        created, errors = ingest_prices(request.data)
+        data = {"created": created, "errors": errors}
+        if errors and not created:
+            return Response(data, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class ChangesView(APIView):
+    query_budget = 6
+
+    pagination_class = KeysetPagination
+
+    @extend_schema(
+        description=(
+            "Get the nationalities, brands, mobiles, variants and prices created, updated or deleted since a time, "
+            "oldest first. Deleted objects are returned as `delete` tombstones. Pass the returned `cursor` to the "
+            "next request to continue from the last change. Changes are only returned once they are "
+            "`COMMIT_VISIBILITY_LAG` seconds old (5 by default)."
+        ),
         parameters=[
             OpenApiParameter(
-                name="brands",
+                name="since",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                description="Return the changes made at or after this time (ISO 8601). Defaults to the beginning.",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="cursor",
                 type=str,
-                required=True,
                 location=OpenApiParameter.QUERY,
-                description="Comma-separated brand names to filter mobiles by.",
+                description="Continuation token returned by the previous request. Takes precedence over `since`.",
+                required=False,
+            ),
+            PAGINATION_PARAMETERS[0],
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=dict,
+                description="The changes, the token to continue from and whether more changes are available.",
+                examples=[
+                    OpenApiExample(
+                        "200",
+                        {
+                            "changes": [
+                                {
+                                    "model": "brand",
+                                    "op": "upsert",
+                                    "id": 1,
+                                    "updated": "2024-01-01T10:00:00Z",
+                                    "data": {"id": 1, "name": "Samsung", "nationality_id": 1},
+                                },
+                                {"model": "pricehistory", "op": "delete", "id": 7, "updated": "2024-01-01T11:00:00Z"},
+                            ],
+                            "cursor": "MjAyNC0wMS0wMVQxMTowMDowMCswMDowMHw1fDM",
+                            "more": False,
+                        },
+                    )
+                ],
+            ),
+            406: OpenApiResponse(
+                response=dict,
+                description="Since, cursor or limit parameter is invalid.",
+                examples=[OpenApiExample("406", {"error": "Parameter 'since' is invalid!"})],
+            ),
+        },
+    )
+    def get(self, request):
+        limit = self.pagination_class().get_limit(request)
+
+        position = None
+        if request.GET.get("cursor"):
+            try:
+                position = decode_position(request.GET["cursor"])
+            except ValueError:
+                raise InvalidParameter("cursor")
+        else:
+            since = get_datetime_parameter(request, "since")
+            if since is not None:
+                # Before every source at ``since``, so the changes made at ``since`` are included.
+                position = (since, -1, 0)
+
+        changes, position, more = get_changes(position, limit)
+        data = {"changes": changes, "cursor": encode_position(position) if position else None, "more": more}
+
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ChangeLogView(APIView):
+    query_budget = 1
+
+    pagination_class = KeysetPagination
+
+    @extend_schema(
+        description=(
+            "Tail the change log: get the creates, updates and deletes of the catalog recorded after a sequence "
+            "number, in sequence order. Entries are only returned once they are `COMMIT_VISIBILITY_LAG` seconds old "
+            "(5 by default), so the entries of transactions committing after a higher sequence was returned are not "
+            "skipped."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="after",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Return the entries after this sequence number. Defaults to 0.",
+                required=False,
+            ),
+            PAGINATION_PARAMETERS[0],
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=dict,
+                description="The entries and the sequence number to continue after.",
+                examples=[
+                    OpenApiExample(
+                        "200",
+                        {
+                            "entries": [
+                                {
+                                    "sequence": 42,
+                                    "model": "pricehistory",
+                                    "object_id": 7,
+                                    "op": "create",
+                                    "created": "2024-01-01T10:00:00Z",
+                                }
+                            ],
+                            "last": 42,
+                        },
+                    )
+                ],
+            ),
+            406: OpenApiResponse(
+                response=dict,
+                description="After or limit parameter is invalid.",
+                examples=[OpenApiExample("406", {"error": "Parameter 'after' is invalid!"})],
             ),
+        },
+    )
+    def get(self, request):
+        limit = self.pagination_class().get_limit(request)
+        after = get_int_parameter(request, "after")
+
+        # Entries of transactions still in flight may get lower sequences than the visible ones, so the page stops
+        # at the first entry more recent than the lag.
+        cutoff = visible_before()
+        entries = []
+        for entry in (
+            ChangeLog.objects.filter(sequence__gt=after)
+            .order_by("sequence")
+            .values("sequence", "model", "object_id", "op", "created")[:limit]
+        ):
+            if entry["created"] > cutoff:
+                break
+            entries.append(entry)
+        last = entries[-1]["sequence"] if entries else after
+
+        return Response({"entries": entries, "last": last}, status=status.HTTP_200_OK)
+
+
+class PriceRollupsView(APIView):
+    query_budget = 1
+
+    @extend_schema(
+        description=(
+            "Get the minimum, maximum, average and last price and the number of prices of a variant or of a mobile "
+            "per day, week or month, in period order. The rollups are updated by the `update_price_rollups` command. "
+            "When more periods are left, `next` is the `price_from` of the next page."
+        ),
+        parameters=[
             OpenApiParameter(
-                name="flat",
+                name="variant",
                 type=int,
+                location=OpenApiParameter.QUERY,
+                description="Id of the variant. Either `variant` or `mobile` is required.",
                 required=False,
+            ),
+            OpenApiParameter(
+                name="mobile",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                description="Id of the mobile, aggregating the prices of all of its variants.",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="period",
+                type=str,
+                enum=[period for period, _ in PriceRollup.PERIODS],
+                location=OpenApiParameter.QUERY,
+                description="Length of the periods: `day` (default), `week` (from Monday) or `month`.",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="price_from",
+                type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
-                description="Set to 1 to get the flat representation of the data.",
+                description="Only return the periods starting on or after this date (YYYY-MM-DD).",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="price_to",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description="Only return the periods starting on or before this date (YYYY-MM-DD).",
+                required=False,
             ),
+            LIMIT_PARAMETER,
         ],
         responses={
-            200: serializer_class(many=True),
+            200: OpenApiResponse(
+                response=dict,
+                description="The rollups of the periods with prices, and the start of the next page.",
+                examples=[
+                    OpenApiExample(
+                        "200",
+                        {
+                            "rollups": [
+                                {
+                                    "start": "2024-01-01",
+                                    "min_price": "1000",
+                                    "max_price": "1200",
+                                    "avg_price": "1100.00",
+                                    "last_price": "1200",
+                                    "count": 3,
+                                }
+                            ],
+                            "next": "2024-01-02",
+                        },
+                    )
+                ],
+            ),
             406: OpenApiResponse(
                 response=dict,
-                description="Flat parameter is missing.",
-                examples=[OpenApiExample("406", {"error": "Parameter 'flat' is invalid!"})],
+                description="Variant, mobile, period, price_from, price_to or limit parameter is invalid.",
+                examples=[OpenApiExample("406", {"error": "Parameter 'period' is invalid!"})],
             ),
             422: OpenApiResponse(
                 response=dict,
-                description="Brands parameter is missing.",
-                examples=[OpenApiExample("406", {"error": "Parameter 'brands' is missing!"})],
+                description="Variant and mobile parameters are both missing.",
+                examples=[OpenApiExample("422", {"error": "Parameter 'variant' is missing!"})],
             ),
         },
     )
     def get(self, request):
-        if "brands" in request.GET:
-            brands_name = request.GET["brands"].split(",")
-            try:
-                flat = int(request.GET.get("flat", 0))
-            except ValueError:
-                return Response({"error": "Parameter 'flat' is invalid!"}, status.HTTP_406_NOT_ACCEPTABLE)
+        limit = get_limit_parameter(request)
+
+        if "variant" in request.GET:
+            if "mobile" in request.GET:
+                raise InvalidParameter("mobile")
+            scope, object_id = PriceRollup.VARIANT, get_int_parameter(request, "variant")
+        elif "mobile" in request.GET:
+            scope, object_id = PriceRollup.MOBILE, get_int_parameter(request, "mobile")
+        else:
+            raise MissingParameter("variant")
 
-            mobiles = Mobile.objects.filter(brand__name__in=brands_name).prefetch_related("variants__prices")
+        period = request.GET.get("period", PriceRollup.DAY)
+        if period not in dict(PriceRollup.PERIODS):
+            raise InvalidParameter("period")
 
-            serializer = self.serializer_class(mobiles, many=True, flat=flat)
+        rollups = PriceRollup.objects.filter(scope=scope, object_id=object_id, period=period)
+        price_from = get_date_parameter(request, "price_from")
+        if price_from is not None:
+            rollups = rollups.filter(start__gte=price_from)
+        price_to = get_date_parameter(request, "price_to")
+        if price_to is not None:
+            rollups = rollups.filter(start__lte=price_to)
 
-            return Response(serializer.data, status=status.HTTP_200_OK)
+        # The extra row tells whether there is a next page.
+        rollups = list(rollups.order_by("start")[: limit + 1])
+        next_from = rollups[limit - 1].start + timedelta(days=1) if len(rollups) > limit else None
 
-        return Response({"error": "Parameter 'brands' is missing!"}, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        data = PriceRollupSerializer(rollups[:limit], many=True).data
+        return Response({"rollups": data, "next": next_from}, status=status.HTTP_200_OK)
 
 
-class SameNationalityView(APIView):
-    serializer_class = MobileSerializer
+class SearchView(APIView):
+    query_budget = 1
 
     @extend_schema(
-        description="Get a list of mobiles with the same brand nationality and country.",
+        description=(
+            "Search the variants whose color, model, brand, brand nationality or country matches every word of the "
+            "query. On PostgreSQL the words are matched by trigram similarity, so typos are tolerated, and the best "
+            "matches come first; on SQLite they are matched as substrings, in the catalog order. Only the first `limit` "
+            "variants are returned, there is no next page: refine the query instead."
+        ),
         parameters=[
             OpenApiParameter(
-                name="flat",
-                type=int,
+                name="q",
+                type=str,
                 location=OpenApiParameter.QUERY,
-                description="Set to 1 to get the flat representation of the data.",
+                description="Words to search for, e.g. `samsung blue`.",
+                required=True,
+            ),
+            LIMIT_PARAMETER,
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=dict,
+                description="The matching variants.",
+                examples=[
+                    OpenApiExample(
+                        "200",
+                        {
+                            "results": [
+                                {
+                                    "id": 1,
+                                    "brand": "Samsung",
+                                    "nationality": "Korea",
+                                    "model": "Galaxy S24",
+                                    "country": "Vietnam",
+                                    "color": "Blue",
+                                    "size": 6.2,
+                                    "current_price": "1000",
+                                    "current_status": "Available",
+                                    "price_date": "2024-01-01",
+                                    "image": "http://localhost:8000/media/mobiles/galaxy.jpg",
+                                }
+                            ]
+                        },
+                    )
+                ],
+            ),
+            406: OpenApiResponse(
+                response=dict,
+                description="Q or limit parameter is invalid.",
+                examples=[OpenApiExample("406", {"error": "Parameter 'q' is invalid!"})],
+            ),
+            422: OpenApiResponse(
+                response=dict,
+                description="Q parameter is missing.",
+                examples=[OpenApiExample("422", {"error": "Parameter 'q' is missing!"})],
+            ),
+        },
+    )
+    def get(self, request):
+        limit = get_limit_parameter(request)
+
+        if "q" not in request.GET:
+            raise MissingParameter("q")
+        query = request.GET["q"]
+        if not query.split():
+            raise InvalidParameter("q")
+
+        variants = search_variants(
+            query, Variant.objects.select_related("mobile__brand__nationality", "mobile__country")
+        )
+        data = VariantSearchSerializer(variants[:limit], many=True, context={"request": request}).data
+        return Response({"results": data}, status=status.HTTP_200_OK)
+
+
+class FacetsView(APIView):
+    # The variants and the facet counts.
+    query_budget = 2
+
+    @extend_schema(
+        description=(
+            "Browse the variants of the catalog with the number of variants per brand, brand nationality, "
+            "manufacturing country, color, screen size bucket and availability, all counted with a single query. "
+            "Each facet parameter keeps the variants with one of its comma-separated values, and the counts are the "
+            "ones of the kept variants. The availability is the status of the latest price of the variant. Only the "
+            "first `limit` variants are returned, there is no next page: `count` tells how many are kept, and more "
+            "facet values narrow them down."
+        ),
+        parameters=[
+            *(
+                OpenApiParameter(
+                    name=name,
+                    type=str,
+                    location=OpenApiParameter.QUERY,
+                    description=f"Comma-separated values of the `{name}` facet to keep.",
+                    required=False,
+                )
+                for name in ("brand", "nationality", "country", "color")
+            ),
+            OpenApiParameter(
+                name="size",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description=f"Comma-separated screen size buckets to keep, among {', '.join(get_size_buckets())}.",
+                required=False,
+            ),
+            OpenApiParameter(
+                name="availability",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description=f"Comma-separated availabilities to keep, among {', '.join(AVAILABILITIES)}.",
                 required=False,
             ),
+            OpenApiParameter(
+                name="q",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Only keep the variants matching these words, like the search API.",
+                required=False,
+            ),
+            LIMIT_PARAMETER,
         ],
         responses={
-            200: serializer_class(many=True),
+            200: OpenApiResponse(
+                response=dict,
+                description="The number of kept variants, their facet counts and the first of them.",
+                examples=[
+                    OpenApiExample(
+                        "200",
+                        {
+                            "count": 1,
+                            "facets": {
+                                "brand": [{"value": "Samsung", "count": 1}],
+                                "nationality": [{"value": "Korea", "count": 1}],
+                                "country": [{"value": "Vietnam", "count": 1}],
+                                "color": [{"value": "Blue", "count": 1}],
+                                "size": [{"value": "6.0-6.5", "count": 1}],
+                                "availability": [{"value": "available", "count": 1}],
+                            },
+                            "results": [
+                                {
+                                    "id": 1,
+                                    "brand": "Samsung",
+                                    "nationality": "Korea",
+                                    "model": "Galaxy S24",
+                                    "country": "Vietnam",
+                                    "color": "Blue",
+                                    "size": 6.2,
+                                    "current_price": "1000",
+                                    "current_status": "Available",
+                                    "price_date": "2024-01-01",
+                                    "image": "http://localhost:8000/media/mobiles/galaxy.jpg",
+                                }
+                            ],
+                        },
+                    )
+                ],
+            ),
             406: OpenApiResponse(
                 response=dict,
-                description="Flat parameter is missing.",
-                examples=[OpenApiExample("406", {"error": "Parameter 'flat' is invalid!"})],
+                description="Size, availability, q or limit parameter is invalid.",
+                examples=[OpenApiExample("406", {"error": "Parameter 'size' is invalid!"})],
             ),
         },
     )
+    @method_decorator(catalog_condition())
+    @cache_response
     def get(self, request):
-        try:
-            flat = int(request.GET.get("flat", 0))
-        except ValueError:
-            return Response({"error": "Parameter 'flat' is invalid!"}, status.HTTP_406_NOT_ACCEPTABLE)
+        limit = get_limit_parameter(request)
+
+        choices = {"size": get_size_buckets(), "availability": AVAILABILITIES}
+        selected = {}
+        for name in FACETS:
+            if name in request.GET:
+                values = request.GET[name].split(",")
+                if name in choices and not set(values) <= set(choices[name]):
+                    raise InvalidParameter(name)
+                selected[name] = values
 
-        mobiles = Mobile.objects.filter(brand__nationality=F("country")).prefetch_related("variants__prices")
-        serializer = self.serializer_class(mobiles, many=True, flat=flat)
+        variants = Variant.objects.select_related("mobile__brand__nationality", "mobile__country")
+        if "q" in request.GET:
+            if not request.GET["q"].split():
+                raise InvalidParameter("q")
+            variants = search_variants(request.GET["q"], variants)
+        else:
+            variants = variants.order_by(*VARIANT_CATALOG_ORDERING)
+        variants = filter_facets(variants, selected)
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        count, facets = count_facets(variants)
+        results = VariantSearchSerializer(variants[:limit], many=True, context={"request": request}).data
+        return Response({"count": count, "facets": facets, "results": results}, status=status.HTTP_200_OK)
@@ -31,7 +31,6 @@ INSTALLED_APPS = [
     # Third-party apps
     "rest_framework",
     "drf_spectacular",
-    "debug_toolbar",
     # My apps
     "mobiles.apps.MobileConfig",
     "api.apps.ApiConfig",
@@ -45,7 +44,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "core.query_budget.QueryBudgetMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -77,11 +76,41 @@ DATABASES = {
         "NAME": os.getenv("DB_NAME", "test"),
         "USER": os.getenv("DB_USER", "postgres"),
         "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
-        "HOST": "postgres",
+        "HOST": os.getenv("DB_HOST", "postgres"),
         "PORT": "5432",
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# The API response cache relies on a catalog version counter stored in this cache, so deployments running more than one
+# process must use a shared backend (e.g. Redis) instead of the per-process local memory cache.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+API_CACHE_TIMEOUT = 60 * 60
+
+# Requests running more queries than the query_budget of their view are logged, or raise when enabled
+QUERY_BUDGET_RAISE = False
+
+# Seconds a write must be old before the cursors tailing the change log read it: entries are numbered when inserted but
+# visible when committed, so a shorter lag than the longest write transaction lets a cursor skip a late commit
+COMMIT_VISIBILITY_LAG = 5
+
+# Change log entries older than this are removed by the prune_change_log command
+CHANGE_LOG_RETENTION_DAYS = 30
+
+# Extend the interval of the newest price of a variant instead of inserting the same price for the next day, see
+# mobiles/compaction.py
+COMPACT_INGESTED_PRICES = False
+
+# Directory of the compressed monthly files of the archived prices, see mobiles/archive.py
+PRICE_ARCHIVE_ROOT = BASE_DIR / "archive"
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
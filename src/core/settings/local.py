@@ -3,8 +3,13 @@ from .base import *  # noqa: F403
 DEBUG = True
 
 # Django debug toolbar
+# Only enabled here, because its middleware is sync-only and would force the async API views through a thread under
+# ASGI.
 if DEBUG:
     import socket
 
+    INSTALLED_APPS += ["debug_toolbar"]  # noqa: F405
+    MIDDLEWARE += ["debug_toolbar.middleware.DebugToolbarMiddleware"]  # noqa: F405
+
     hostname, _, ips = socket.gethostbyname_ex(socket.gethostname())
     INTERNAL_IPS = [ip[: ip.rfind(".")] + ".1" for ip in ips] + ["127.0.0.1", "10.0.2.2"]
@@ -1,12 +1,22 @@
+from tempfile import gettempdir
+
 from .base import *  # noqa: F403
 
 DEBUG = False
 
 LANGUAGE_CODE = "en"
 
+QUERY_BUDGET_RAISE = True
+
+# The tests commit their writes before reading them
+COMMIT_VISIBILITY_LAG = 0
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "test.sqlite3",  # noqa: F405
     }
 }
+
+# The images uploaded by the tests are kept out of the source tree
+MEDIA_ROOT = Path(gettempdir()) / "mobiles-test-media"  # noqa: F405
@@ -0,0 +1,5 @@
+from .base import DATABASES as POSTGRESQL_DATABASES
+from .test import *  # noqa: F403
+
+# The partitions, the COPY ingestion, the trigram indexes and the grouping sets only run on PostgreSQL.
+DATABASES = POSTGRESQL_DATABASES
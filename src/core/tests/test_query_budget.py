@@ -0,0 +1,52 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.views import View
+
+from core.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware
+from mobiles.models import Nationality
+
+
+class NationalityCountView(View):
+    query_budget = 1
+
+    def get(self, request):
+        return HttpResponse(str(Nationality.objects.count() + Nationality.objects.filter(name="Korea").count()))
+
+
+class QueryBudgetMiddlewareTestCase(TestCase):
+    def get_response(self, view_class):
+        view = view_class.as_view()
+        middleware = QueryBudgetMiddleware(lambda request: view(request))
+        request = RequestFactory().get("/nationalities/count/")
+        middleware.process_view(request, view, (), {})
+
+        return middleware(request)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_raise_over_budget(self):
+        with self.assertRaisesMessage(
+            QueryBudgetExceeded, "/nationalities/count/ ran 2 queries, over its budget of 1."
+        ):
+            self.get_response(NationalityCountView)
+
+    @override_settings(QUERY_BUDGET_RAISE=False)
+    def test_log_over_budget(self):
+        with self.assertLogs("core.query_budget", level="WARNING") as logs:
+            response = self.get_response(NationalityCountView)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ran 2 queries, over its budget of 1", logs.output[0])
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_within_budget(self):
+        class WithinBudgetView(NationalityCountView):
+            query_budget = 2
+
+        self.assertEqual(self.get_response(WithinBudgetView).status_code, 200)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_without_budget(self):
+        class WithoutBudgetView(NationalityCountView):
+            query_budget = None
+
+        self.assertEqual(self.get_response(WithoutBudgetView).status_code, 200)
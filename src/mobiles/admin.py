@@ -1,10 +1,23 @@
 from django.contrib import admin
 
 from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.search import search_objects, search_variants
+
+
+class IndexedSearchMixin:
+    """Search the changelist through the search indexes (see ``mobiles.search``) instead of ``icontains`` lookups."""
+
+    def search(self, queryset, search_term):
+        return search_objects(queryset, search_term)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.split():
+            return queryset, False
+        return self.search(queryset, search_term), False
 
 
 @admin.register(Nationality)
-class NationalityAdmin(admin.ModelAdmin):
+class NationalityAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "name",
@@ -14,6 +27,7 @@ class NationalityAdmin(admin.ModelAdmin):
         "get_updated",
         "get_created",
     )
+    search_fields = ("name",)
     list_per_page = 20
 
     @admin.display(description=Nationality._meta.get_field("updated").verbose_name)
@@ -26,7 +40,7 @@ class NationalityAdmin(admin.ModelAdmin):
 
 
 @admin.register(Brand)
-class BrandAdmin(admin.ModelAdmin):
+class BrandAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "name",
@@ -38,6 +52,7 @@ class BrandAdmin(admin.ModelAdmin):
         "get_created",
     )
     list_filter = ("nationality",)
+    search_fields = ("name",)
     list_per_page = 20
 
     @admin.display(description=Brand._meta.get_field("updated").verbose_name)
@@ -50,7 +65,7 @@ class BrandAdmin(admin.ModelAdmin):
 
 
 @admin.register(Mobile)
-class MobileAdmin(admin.ModelAdmin):
+class MobileAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "brand",
@@ -63,6 +78,7 @@ class MobileAdmin(admin.ModelAdmin):
         "get_created",
     )
     list_filter = ("brand",)
+    search_fields = ("model",)
     list_per_page = 20
 
     @admin.display(description=Mobile._meta.get_field("updated").verbose_name)
@@ -75,7 +91,7 @@ class MobileAdmin(admin.ModelAdmin):
 
 
 @admin.register(Variant)
-class VariantAdmin(admin.ModelAdmin):
+class VariantAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = (
         "id",
         "mobile",
@@ -88,8 +104,13 @@ class VariantAdmin(admin.ModelAdmin):
         "get_created",
     )
     list_filter = ("mobile",)
+    search_fields = ("color",)
+    search_help_text = "Color, model, brand or nationality."
     list_per_page = 20
 
+    def search(self, queryset, search_term):
+        return search_variants(search_term, queryset)
+
     @admin.display(description=Variant._meta.get_field("updated").verbose_name)
     def get_updated(self, obj):
         return obj.formatted_updated()
@@ -0,0 +1,217 @@
+import gzip
+import json
+import os
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+from functools import cached_property, lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+
+from mobiles.cache import bump_catalog_version
+from mobiles.catalog import build_catalog_rows
+from mobiles.models import CatalogRow, PriceArchive, PriceHistory, PriceRollup
+from mobiles.rollups import period_end
+
+ARCHIVE_FORMAT = 1
+
+# Prices per ``DELETE`` query.
+DELETE_BATCH_SIZE = 500
+# Decoded archive files kept in memory by each process.
+ARCHIVE_CACHE_SIZE = 12
+
+
+def archive_path(archive):
+    return Path(settings.PRICE_ARCHIVE_ROOT) / archive.path
+
+
+def encode_value(value):
+    """Encode the values JSON has no type for, keeping the microseconds of the datetimes."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def write_archive_file(path, prices):
+    """Write ``prices`` to the file at ``path``, replacing it only once the new file is complete."""
+    fields = PriceHistory._meta.concrete_fields
+    data = {
+        "format": ARCHIVE_FORMAT,
+        "columns": {field.attname: [getattr(price, field.attname) for price in prices] for field in fields},
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.tmp")
+    with gzip.open(temporary, "wt", encoding="utf-8") as file:
+        json.dump(data, file, default=encode_value)
+    os.replace(temporary, path)
+
+
+@lru_cache(maxsize=ARCHIVE_CACHE_SIZE)
+def decode_archive_file(path, stamp):
+    """Return the rows of values of the archive file at ``path``, cached by the ``stamp`` of the file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        data = json.load(file)
+
+    fields = PriceHistory._meta.concrete_fields
+    count = len(data["columns"]["id"])
+    columns = [
+        [field.to_python(value) for value in data["columns"][field.attname]]
+        if field.attname in data["columns"]
+        else [field.get_default()] * count
+        for field in fields
+    ]
+    return list(zip(*columns))
+
+
+def read_archive_file(path):
+    """Return the prices of the archive file at ``path``."""
+    stat = os.stat(path)
+    rows = decode_archive_file(str(path), (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+
+    names = [field.attname for field in PriceHistory._meta.concrete_fields]
+    prices = []
+    for values in rows:
+        price = PriceHistory.from_db(connection.alias, names, values)
+        # Not in the table: it cannot be edited or deleted.
+        price.archived = True
+        prices.append(price)
+    return prices
+
+
+def delete_prices(ids):
+    """Delete the prices ``ids`` and their catalog rows, without the ``post_delete`` receivers."""
+    table = connection.ops.quote_name(PriceHistory._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), DELETE_BATCH_SIZE):
+            batch = ids[start : start + DELETE_BATCH_SIZE]
+            cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(batch))})", batch)
+            CatalogRow.objects.filter(id__in=batch).delete()
+
+
+def archive_month(month, before):
+    """Archive the prices of ``month`` whose last day is before ``before``. Return the number of archived prices."""
+    prices = list(
+        PriceHistory.objects.select_related(None)
+        .filter(Q(valid_to__isnull=True, date__lt=before) | Q(valid_to__lt=before))
+        .filter(date__gte=month, date__lt=period_end(PriceRollup.MONTH, month))
+    )
+    newest = set(
+        PriceHistory.objects.filter(variant_id__in={price.variant_id for price in prices})
+        .select_related(None)
+        .newest(1)
+        .values_list("id", flat=True)
+    )
+    prices = [price for price in prices if price.pk not in newest]
+    if not prices:
+        return 0
+
+    archive = PriceArchive.objects.select_for_update().filter(month=month).first()
+    if archive is None:
+        archive = PriceArchive(month=month, path=f"prices_{month:%Y_%m}.json.gz")
+
+    # The file is written before the prices are deleted: prices left in both by a failed transaction are archived
+    # again by the next run, and skipped by the reads in the meantime.
+    ids = {price.pk for price in prices}
+    if archive.pk is not None:
+        prices += [price for price in read_archive_file(archive_path(archive)) if price.pk not in ids]
+    prices.sort(key=lambda price: price.pk)
+    write_archive_file(archive_path(archive), prices)
+
+    archive.count = len(prices)
+    archive.first_date = min(price.date for price in prices)
+    archive.last_date = max(price.last_date() for price in prices)
+    archive.save()
+
+    delete_prices(sorted(ids))
+    return len(ids)
+
+
+def archive_prices(before):
+    """Move the prices whose last day is before ``before`` to the archive files of their months."""
+    months = (
+        PriceHistory.objects.select_related(None)
+        .filter(Q(valid_to__isnull=True, date__lt=before) | Q(valid_to__lt=before))
+        .dates("date", "month")
+    )
+
+    count = 0
+    archived = []
+    for month in months:
+        with transaction.atomic():
+            if month_count := archive_month(month, before):
+                count += month_count
+                archived.append(month)
+                # Responses cached from the table as it was must not be served anymore.
+                bump_catalog_version()
+                transaction.on_commit(bump_catalog_version)
+
+    return count, archived
+
+
+def read_archived_prices(price_from=None, price_to=None):
+    """Return the archived prices with days between ``price_from`` and ``price_to``, reading only their months."""
+    archives = PriceArchive.objects.all()
+    if price_from is not None:
+        archives = archives.filter(last_date__gte=price_from)
+    if price_to is not None:
+        archives = archives.filter(first_date__lte=price_to)
+
+    return [
+        price
+        for archive in archives
+        for price in read_archive_file(archive_path(archive))
+        if (price_from is None or price.last_date() >= price_from) and (price_to is None or price.date <= price_to)
+    ]
+
+
+def rank_newest(keys):
+    """Rank each ``(variant_id, date, created, id)`` of ``keys`` within its variant, 1 being the newest."""
+    ranks = [0] * len(keys)
+    counts = defaultdict(int)
+    for index in sorted(range(len(keys)), key=lambda index: keys[index][1:], reverse=True):
+        counts[keys[index][0]] += 1
+        ranks[index] = counts[keys[index][0]]
+    return ranks
+
+
+class ArchivedPrices:
+    """The archived prices with days between ``price_from`` and ``price_to``, read on first use."""
+
+    def __init__(self, price_from=None, price_to=None):
+        self.price_from = price_from
+        self.price_to = price_to
+
+    @cached_property
+    def prices(self):
+        return read_archived_prices(self.price_from, self.price_to)
+
+    @cached_property
+    def variant_prices(self):
+        prices = defaultdict(list)
+        for price in self.prices:
+            prices[price.variant_id].append(price)
+        return prices
+
+    @cached_property
+    def catalog_rows(self):
+        return build_catalog_rows(self.prices)
+
+    def merge(self, variant, prices):
+        """Return ``prices`` of ``variant`` with its archived prices, ranked by ``newest_rank`` again."""
+        prices = list(prices)
+        ids = {price.pk for price in prices}
+        for price in self.variant_prices.get(variant.pk, ()):
+            if price.pk not in ids:
+                price.variant = variant
+                prices.append(price)
+
+        keys = [(price.variant_id, price.date, price.created, price.pk) for price in prices]
+        for price, rank in zip(prices, rank_newest(keys)):
+            price.newest_rank = rank
+        return sorted(prices, key=lambda price: (price.created, price.pk))
@@ -0,0 +1,46 @@
+from time import time_ns
+
+from django.core.cache import cache
+from django.utils import timezone
+
+CATALOG_VERSION_KEY = "mobiles:catalog-version"
+# The time of the last bump of the catalog version, the ``Last-Modified`` of the conditional requests.
+CATALOG_MODIFIED_KEY = "mobiles:catalog-modified"
+# Bumped when new prices are committed, watched by the long-poll price feed.
+PRICE_FEED_VERSION_KEY = "mobiles:price-feed-version"
+
+
+def get_catalog_version():
+    """Return the current catalog version, starting from the current time when it was lost."""
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time_ns(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+
+    return version
+
+
+def get_catalog_modified():
+    """Return the time of the last change of the catalog, or of the first call after that time was lost."""
+    modified = cache.get(CATALOG_MODIFIED_KEY)
+    if modified is None:
+        cache.add(CATALOG_MODIFIED_KEY, timezone.now(), timeout=None)
+        modified = cache.get(CATALOG_MODIFIED_KEY)
+
+    return modified
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time_ns(), timeout=None)
+
+
+def bump_catalog_version():
+    bump_version(CATALOG_VERSION_KEY)
+    cache.set(CATALOG_MODIFIED_KEY, timezone.now(), timeout=None)
+
+
+def bump_price_feed_version():
+    bump_version(PRICE_FEED_VERSION_KEY)
@@ -0,0 +1,76 @@
+from django.db import transaction
+
+from mobiles.models import CatalogRow, PriceHistory, Variant
+
+# The columns of a catalog row and their path from ``PriceHistory``.
+CATALOG_ROW_COLUMNS = (
+    ("id", "id"),
+    ("variant_id", "variant_id"),
+    ("mobile_id", "variant__mobile_id"),
+    ("brand_id", "variant__mobile__brand_id"),
+    ("nationality_id", "variant__mobile__brand__nationality_id"),
+    ("country_id", "variant__mobile__country_id"),
+    ("brand", "variant__mobile__brand__name"),
+    ("nationality", "variant__mobile__brand__nationality__name"),
+    ("model", "variant__mobile__model"),
+    ("country", "variant__mobile__country__name"),
+    ("color", "variant__color"),
+    ("size", "variant__size"),
+    ("image", "variant__image"),
+    ("price", "price"),
+    ("status", "status"),
+    ("date", "date"),
+    ("valid_to", "valid_to"),
+    ("mobile_created", "variant__mobile__created"),
+    ("variant_created", "variant__created"),
+    ("created", "created"),
+)
+
+REBUILD_BATCH_SIZE = 10000
+
+
+def insert_catalog_rows(prices, update=False):
+    """Insert the catalog rows of ``prices``, or with ``update`` overwrite the existing ones."""
+    names = [name for name, _ in CATALOG_ROW_COLUMNS]
+    rows = prices.values_list(*(path for _, path in CATALOG_ROW_COLUMNS))
+    conflicts = {"update_conflicts": True, "unique_fields": ("id",), "update_fields": names[1:]} if update else {}
+    return len(CatalogRow.objects.bulk_create((CatalogRow(**dict(zip(names, row))) for row in rows), **conflicts))
+
+
+def build_catalog_rows(prices):
+    """Return the unsaved catalog rows of ``prices`` that are not in the table, e.g. archived prices."""
+    variant_columns = [(name, path.removeprefix("variant__")) for name, path in CATALOG_ROW_COLUMNS if "__" in path]
+    variants = {
+        pk: dict(zip((name for name, _ in variant_columns), values))
+        for pk, *values in Variant.objects.filter(pk__in={price.variant_id for price in prices}).values_list(
+            "pk", *(path for _, path in variant_columns)
+        )
+    }
+
+    rows = []
+    for price in prices:
+        if price.variant_id in variants:
+            columns = {name: getattr(price, path) for name, path in CATALOG_ROW_COLUMNS if "__" not in path}
+            rows.append(CatalogRow(**columns, **variants[price.variant_id]))
+    return rows
+
+
+def refresh_catalog_rows(column, value):
+    """Rewrite in place the catalog rows whose ``column`` (e.g. ``variant_id``) is ``value``."""
+    prices = PriceHistory.objects.filter(**{dict(CATALOG_ROW_COLUMNS)[column]: value})
+    insert_catalog_rows(prices, update=True)
+    CatalogRow.objects.filter(**{column: value}).exclude(id__in=prices.values("id")).delete()
+
+
+@transaction.atomic
+def rebuild_catalog_rows(batch_size=REBUILD_BATCH_SIZE):
+    """Rewrite every catalog row in one transaction, in batches of ``batch_size`` prices."""
+    CatalogRow.objects.all().delete()
+
+    prices = PriceHistory.objects.order_by("id")
+    count = last = 0
+    while batch := list(prices.filter(id__gt=last).values_list("id", flat=True)[:batch_size]):
+        count += insert_catalog_rows(PriceHistory.objects.filter(id__in=batch))
+        last = batch[-1]
+
+    return count
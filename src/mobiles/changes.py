@@ -0,0 +1,68 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Tombstone, Variant
+
+CHANGE_SOURCES = (Nationality, Brand, Mobile, Variant, PriceHistory, Tombstone)
+
+
+def visible_before():
+    """Return the time up to which the writes are taken as committed, ``COMMIT_VISIBILITY_LAG`` ago."""
+    return timezone.now() - timedelta(seconds=settings.COMMIT_VISIBILITY_LAG)
+
+
+def encode_position(position):
+    updated, source, pk = position
+    return urlsafe_b64encode(f"{updated.isoformat()}|{source}|{pk}".encode()).decode().rstrip("=")
+
+
+def decode_position(encoded):
+    """Return the position encoded by ``encode_position``. A ``ValueError`` is raised for invalid tokens."""
+    try:
+        padding = "=" * (-len(encoded) % 4)
+        updated, source, pk = urlsafe_b64decode(encoded + padding).decode().split("|")
+        return datetime.fromisoformat(updated), int(source), int(pk)
+    except (BinasciiError, UnicodeDecodeError) as exc:
+        raise ValueError(f"Invalid position: '{encoded}'") from exc
+
+
+def position_filter(source, position):
+    """Rows of ``source`` after ``position`` in the ``(updated, source, id)`` order."""
+    updated, position_source, pk = position
+    if source < position_source:
+        return Q(updated__gt=updated)
+    if source == position_source:
+        return Q(updated__gt=updated) | Q(updated=updated, id__gt=pk)
+    return Q(updated__gte=updated)
+
+
+def to_change(model, row):
+    if model is Tombstone:
+        return {"model": row["model"], "op": "delete", "id": row["object_id"], "updated": row["updated"]}
+
+    return {"model": model._meta.model_name, "op": "upsert", "id": row["id"], "updated": row["updated"], "data": row}
+
+
+def get_changes(position=None, limit=100):
+    """Return up to ``limit`` changes after ``position``, the position of the last one and whether more exist."""
+    rows = []
+    # Rows of transactions still in flight may get an older ``updated`` than the visible ones, wait for them.
+    cutoff = visible_before()
+    for source, model in enumerate(CHANGE_SOURCES):
+        queryset = model.objects.select_related(None).filter(updated__lte=cutoff).order_by("updated", "id")
+        if position is not None:
+            queryset = queryset.filter(position_filter(source, position))
+
+        rows.extend(((row["updated"], source, row["id"]), model, row) for row in queryset.values()[: limit + 1])
+
+    rows.sort(key=lambda item: item[0])
+    page = rows[:limit]
+    if page:
+        position = page[-1][0]
+
+    return [to_change(model, row) for _, model, row in page], position, len(rows) > limit
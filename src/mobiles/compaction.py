@@ -0,0 +1,132 @@
+import heapq
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from mobiles.models import PriceHistory, Variant
+from mobiles.signals import prices_bulk_extended
+
+# Variants per batch, whose merged prices are deleted with a single query.
+COMPACTION_BATCH_SIZE = 100
+
+
+def same_month(first_day, last_day):
+    return (first_day.year, first_day.month) == (last_day.year, last_day.month)
+
+
+def expand_prices(prices, price_from=None, price_to=None, count=None):
+    """Expand ``(variant_id, rank, first_day, last_day, item)`` prices into one ``(day, item)`` per day."""
+    days = []
+    for variant_id, rank, first_day, last_day, item in prices:
+        if price_from is not None:
+            first_day = max(first_day, price_from)
+        if price_to is not None:
+            last_day = min(last_day, price_to)
+        for offset in range((last_day - first_day).days + 1):
+            days.append((variant_id, first_day + timedelta(days=offset), -(rank or 0), item))
+
+    if count is not None:
+        keys = defaultdict(list)
+        for variant_id, day, rank, _ in days:
+            keys[variant_id].append((day, rank))
+        newest = {(variant_id, key) for variant_id, items in keys.items() for key in heapq.nlargest(count, items)}
+        days = [entry for entry in days if (entry[0], entry[1:3]) in newest]
+
+    return [(day, item) for _, day, _, item in days]
+
+
+def extend_open_prices(prices):
+    """Split the new ``prices`` into the prices to insert and the saved prices they extend."""
+    to_date = PriceHistory._meta.get_field("date").to_python
+    newest = {
+        price.variant_id: price
+        for price in PriceHistory.objects.filter(variant_id__in={price.variant_id for price in prices})
+        .select_related(None)
+        .newest(1)
+    }
+
+    inserted = []
+    extended = {}
+    for price in prices:
+        price.date = to_date(price.date)
+        open_price = newest.get(price.variant_id)
+        if (
+            open_price is not None
+            and (open_price.price, open_price.status) == (price.price, price.status)
+            and open_price.last_date() + timedelta(days=1) == price.date
+            and same_month(open_price.date, price.date)
+        ):
+            open_price.valid_to = price.date
+            if open_price.pk is not None:
+                extended[open_price.pk] = open_price
+            continue
+
+        inserted.append(price)
+        if open_price is None or price.date >= open_price.date:
+            newest[price.variant_id] = price
+
+    return inserted, list(extended.values())
+
+
+def save_extended_prices(prices, merged=()):
+    """Save the new ``valid_to`` of ``prices``, delete the ``merged`` prices folded into them and notify receivers."""
+    now = timezone.now()
+    for price in prices:
+        price.updated = now
+    PriceHistory.objects.bulk_update(prices, ("valid_to", "updated"))
+
+    # A raw delete: the days of the merged prices are still covered, so none of the ``post_delete`` receivers apply.
+    if merged:
+        table = connection.ops.quote_name(PriceHistory._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(merged))})", list(merged))
+
+    prices_bulk_extended.send(sender=PriceHistory, instances=prices, merged=list(merged))
+
+
+def find_runs(prices):
+    """Return the runs of ``prices`` to merge, as ``(price, merged)`` pairs."""
+    runs = []
+    head = merged = None
+    for price in prices:
+        if (
+            head is not None
+            and (head.variant_id, head.price, head.status) == (price.variant_id, price.price, price.status)
+            and head.last_date() + timedelta(days=1) == price.date
+            and same_month(head.date, price.last_date())
+        ):
+            head.valid_to = price.last_date()
+            merged.append(price.pk)
+            continue
+
+        if merged:
+            runs.append((head, merged))
+        head, merged = price, []
+
+    if merged:
+        runs.append((head, merged))
+    return runs
+
+
+def compact_prices(batch_size=COMPACTION_BATCH_SIZE):
+    """Merge the runs of unchanged consecutive daily prices into intervals, ``batch_size`` variants at a time."""
+    merged_count = interval_count = last = 0
+    variants = Variant.objects.select_related(None).order_by("pk").values_list("pk", flat=True)
+    while variant_ids := list(variants.filter(pk__gt=last)[:batch_size]):
+        with transaction.atomic():
+            prices = (
+                PriceHistory.objects.filter(variant_id__in=variant_ids)
+                .select_related(None)
+                .only("id", "variant_id", "price", "status", "date", "valid_to")
+                .order_by("variant_id", "date", "created", "id")
+            )
+            runs = find_runs(prices.iterator())
+            if runs:
+                save_extended_prices([price for price, _ in runs], [pk for _, merged in runs for pk in merged])
+                merged_count += sum(len(merged) for _, merged in runs)
+                interval_count += len(runs)
+        last = variant_ids[-1]
+
+    return merged_count, interval_count
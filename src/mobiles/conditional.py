@@ -0,0 +1,29 @@
+from hashlib import md5
+
+from django.views.decorators.http import condition
+
+from mobiles.cache import get_catalog_modified, get_catalog_version
+
+
+def get_catalog_validators(request):
+    """Return the ``(etag, last_modified)`` validators of ``request`` from the catalog version."""
+    etag = md5(f"{request.get_full_path()}|{get_catalog_version()}".encode()).hexdigest()
+
+    return etag, get_catalog_modified()
+
+
+def catalog_condition():
+    """Decorate a view to answer conditional GET requests from the catalog version, without any query."""
+
+    def get_validators(request):
+        if not hasattr(request, "_catalog_validators"):
+            request._catalog_validators = get_catalog_validators(request)
+        return request._catalog_validators
+
+    def etag_func(request, *args, **kwargs):
+        return get_validators(request)[0]
+
+    def last_modified_func(request, *args, **kwargs):
+        return get_validators(request)[1]
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
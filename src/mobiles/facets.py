@@ -0,0 +1,121 @@
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Case, Count, F, Value, When
+
+# The lower bounds of the screen size buckets, in inches. A bucket is named by its bounds, e.g. ``5.5-6.0``, and the
+# open-ended ones by their only bound, ``-5.0`` and ``7.0-``.
+SIZE_BUCKET_BOUNDS = (5.0, 5.5, 6.0, 6.5, 7.0)
+
+AVAILABLE = "available"
+NOT_AVAILABLE = "not_available"
+NO_PRICE = "no_price"
+AVAILABILITIES = (AVAILABLE, NOT_AVAILABLE, NO_PRICE)
+
+
+def get_size_buckets():
+    bounds = (None, *SIZE_BUCKET_BOUNDS, None)
+    return [f"{'' if low is None else low}-{'' if high is None else high}" for low, high in zip(bounds, bounds[1:])]
+
+
+def size_bucket_expression():
+    buckets = get_size_buckets()
+    return Case(
+        *(When(size__lt=bound, then=Value(bucket)) for bound, bucket in zip(SIZE_BUCKET_BOUNDS, buckets)),
+        default=Value(buckets[-1]),
+    )
+
+
+def availability_expression():
+    return Case(
+        When(current_status=True, then=Value(AVAILABLE)),
+        When(current_status=False, then=Value(NOT_AVAILABLE)),
+        default=Value(NO_PRICE),
+    )
+
+
+# The expression of each facet over a variant.
+FACETS = {
+    "brand": lambda: F("mobile__brand__name"),
+    "nationality": lambda: F("mobile__brand__nationality__name"),
+    "country": lambda: F("mobile__country__name"),
+    "color": lambda: F("color"),
+    "size": size_bucket_expression,
+    "availability": availability_expression,
+}
+
+
+def facet_alias(name):
+    return f"facet_{name}"
+
+
+def facet_expressions():
+    return {facet_alias(name): expression() for name, expression in FACETS.items()}
+
+
+def filter_facets(variants, selected):
+    """Keep the ``variants`` with one of the values of each facet of ``selected``, a dict of facet names to values."""
+    variants = variants.alias(**facet_expressions())
+    for name, values in selected.items():
+        variants = variants.filter(**{f"{facet_alias(name)}__in": values})
+    return variants
+
+
+def count_grouping_sets(variants):
+    """Yield the ``(name, value, count)`` of each facet value, ``name`` being ``None`` for the total."""
+    aliases = [facet_alias(name) for name in FACETS]
+    try:
+        sql, params = variants.order_by().values(**facet_expressions()).query.sql_with_params()
+    except EmptyResultSet:
+        yield None, None, 0
+        return
+    columns = ", ".join(connection.ops.quote_name(alias) for alias in aliases)
+    sets = ", ".join(f"({connection.ops.quote_name(alias)})" for alias in aliases)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {columns}, GROUPING({columns}), COUNT(*) FROM ({sql}) facets GROUP BY GROUPING SETS ({sets}, ())",
+            params,
+        )
+        rows = cursor.fetchall()
+
+    # ``GROUPING`` has the bit of each column that is not grouped by set, the first column being the highest bit.
+    names = {(1 << len(FACETS)) - 1 - (1 << (len(FACETS) - 1 - index)): name for index, name in enumerate(FACETS)}
+    for *values, grouping, count in rows:
+        name = names.get(grouping)
+        yield name, None if name is None else values[list(FACETS).index(name)], count
+
+
+def count_groups(variants):
+    """Yield the ``(name, value, count)`` of each facet value, ``name`` being ``None`` for the total."""
+    aliases = [facet_alias(name) for name in FACETS]
+    groups = (
+        variants.order_by().values(**facet_expressions()).annotate(count=Count("pk")).values_list(*aliases, "count")
+    )
+
+    total = 0
+    for *values, count in groups:
+        total += count
+        for name, value in zip(FACETS, values):
+            yield name, value, count
+    yield None, None, total
+
+
+def count_facets(variants):
+    """Count ``variants`` per value of each facet with a single query. Return the total and the counts."""
+    counts = {name: {} for name in FACETS}
+    total = 0
+    rows = count_grouping_sets(variants) if connection.vendor == "postgresql" else count_groups(variants)
+    for name, value, count in rows:
+        if name is None:
+            total = count
+        else:
+            counts[name][value] = counts[name].get(value, 0) + count
+
+    facets = {
+        name: [
+            {"value": value, "count": count}
+            for value, count in sorted(values.items(), key=lambda item: (-item[1], str(item[0])))
+        ]
+        for name, values in counts.items()
+    }
+    return total, facets
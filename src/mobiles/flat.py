@@ -0,0 +1,114 @@
+from mobiles.archive import rank_newest
+from mobiles.compaction import expand_prices
+from mobiles.models import CatalogRow, PriceHistory, Variant
+from mobiles.serializers import PriceHistorySerializer
+
+# The names of the flat representation, which are also the columns of ``CatalogRow``.
+MOBILE_FLAT_FIELDS = (
+    "brand",
+    "model",
+    "country",
+    "color",
+    "size",
+    "image",
+    "price",
+    "status",
+    "date",
+)
+
+BRAND_FLAT_FIELDS = (
+    "brand",
+    "nationality",
+    *MOBILE_FLAT_FIELDS[1:],
+)
+
+
+class FlatFormatter:
+    """Convert raw column values to the same representation as the nested serializers."""
+
+    def __init__(self):
+        self.price_field = PriceHistorySerializer().fields["price"]
+        self.image_storage = Variant._meta.get_field("image").storage
+        self.statuses = {status: str(PriceHistory(status=status).get_status_display()) for status in (True, False)}
+
+    def format(self, name, value):
+        if name == "size":
+            return float(value)
+        if name == "image":
+            return self.image_storage.url(value) if value else None
+        if name == "price":
+            return self.price_field.to_representation(value)
+        if name == "status":
+            return self.statuses[value]
+        if name == "date":
+            return value.strftime("%Y-%m-%d")
+        return value
+
+
+def flatten(instances, lookup, fields, prices=None, window=None):
+    """Return the flat representation of each of ``instances``, read from the catalog rows."""
+    instances = list(instances)
+    formatter = FlatFormatter()
+    prices = CatalogRow.objects.all() if prices is None else prices
+    window = window or {}
+    # Ranked by ``PriceHistoryQuerySet.newest`` when only the newest prices are requested.
+    ranks = ("newest_rank",) if "newest_rank" in prices.query.annotations else ()
+    # Each column is selected once: the window filter wraps the query and mixes up the duplicated columns.
+    ordering = CatalogRow._meta.ordering
+    columns = tuple(dict.fromkeys((lookup, *ordering, "date", "valid_to", *ranks, *fields)))
+
+    pks = {instance.pk for instance in instances}
+    rows = [
+        dict(zip(columns, row))
+        for row in prices.filter(**{f"{lookup}__in": pks}).order_by(*ordering).values_list(*columns)
+    ]
+
+    archived = window.get("archived")
+    if archived is not None and archived.prices:
+        ids = {row["id"] for row in rows}
+        rows += [
+            {name: getattr(row, name) for name in columns if name != "newest_rank"}
+            for row in archived.catalog_rows
+            if getattr(row, lookup) in pks and row.id not in ids
+        ]
+        rows.sort(key=lambda row: tuple(row[name] for name in ordering))
+        keys = [(row["variant_id"], row["date"], row["created"], row["id"]) for row in rows]
+        for row, rank in zip(rows, rank_newest(keys)):
+            row["newest_rank"] = rank
+
+    prices = [
+        (row["variant_id"], row.get("newest_rank"), row["date"], row["valid_to"] or row["date"], (row[lookup], row))
+        for row in rows
+    ]
+    days = expand_prices(
+        prices,
+        price_from=window.get("price_from"),
+        price_to=window.get("price_to"),
+        count=window.get("prices"),
+    )
+
+    result = {instance.pk: {} for instance in instances}
+    for day, (pk, row) in days:
+        items = result[pk]
+        items[len(items)] = {name: formatter.format(name, day if name == "date" else row[name]) for name in fields}
+
+    return [result[instance.pk] for instance in instances]
+
+
+def select_flat_fields(flat_fields, names):
+    """Return the names of ``flat_fields`` listed in ``names``, in their original order."""
+    unknown = set(names) - set(flat_fields)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return tuple(name for name in flat_fields if name in names)
+
+
+def flat_brands(brands, fields=None, prices=None, window=None):
+    flat_fields = select_flat_fields(BRAND_FLAT_FIELDS, fields) if fields else BRAND_FLAT_FIELDS
+    return flatten(brands, "brand_id", flat_fields, prices, window)
+
+
+def flat_mobiles(mobiles, fields=None, prices=None, window=None):
+    flat_fields = select_flat_fields(MOBILE_FLAT_FIELDS, fields) if fields else MOBILE_FLAT_FIELDS
+    return flatten(mobiles, "mobile_id", flat_fields, prices, window)
@@ -0,0 +1,103 @@
+import csv
+from io import StringIO
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from mobiles.compaction import extend_open_prices, save_extended_prices
+from mobiles.models import PriceHistory, Variant
+from mobiles.serializers import PriceHistoryIngestSerializer
+from mobiles.signals import prices_bulk_created
+
+INGEST_BATCH_SIZE = 1000
+
+
+def copy_prices(prices):
+    """Insert ``prices`` with ``COPY FROM STDIN`` through a temporary table and set their primary keys."""
+    now = timezone.now()
+    fields = [field for field in PriceHistory._meta.concrete_fields if not field.primary_key]
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    for position, price in enumerate(prices):
+        # ``COPY`` bypasses the ``pre_save`` of the ``auto_now`` fields.
+        price.created = price.updated = now
+        values = [field.get_db_prep_save(getattr(price, field.attname), connection) for field in fields]
+        writer.writerow([position, *values])
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    table = quote_name(PriceHistory._meta.db_table)
+    staging = quote_name(f"{PriceHistory._meta.db_table}_ingest")
+    columns = ", ".join(quote_name(field.column) for field in fields)
+    definitions = ", ".join(f"{quote_name(field.column)} {field.db_type(connection)}" for field in fields)
+
+    with connection.cursor() as cursor:
+        # On failure the table is dropped by the rollback of the transaction.
+        cursor.execute(f"CREATE TEMPORARY TABLE {staging} (position integer, {definitions})")
+        cursor.copy_expert(f"COPY {staging} (position, {columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} ORDER BY position RETURNING id"
+        )
+        for price, (pk,) in zip(prices, cursor.fetchall()):
+            price.pk = pk
+        cursor.execute(f"DROP TABLE {staging}")
+
+
+def insert_prices(prices, batch_size=INGEST_BATCH_SIZE):
+    if connection.vendor == "postgresql":
+        copy_prices(prices)
+    else:
+        PriceHistory.objects.bulk_create(prices, batch_size=batch_size)
+
+
+def validate_prices(rows):
+    """Return the valid rows of ``rows`` as unsaved prices, and the errors of the others by row index."""
+    serializers = [PriceHistoryIngestSerializer(data=row) for row in rows]
+    valid = {index: serializer.is_valid() for index, serializer in enumerate(serializers)}
+
+    variant_ids = {serializer.validated_data["variant"] for index, serializer in enumerate(serializers) if valid[index]}
+    existing_ids = set(Variant.objects.filter(pk__in=variant_ids).values_list("pk", flat=True))
+
+    prices = []
+    errors = {}
+    for index, serializer in enumerate(serializers):
+        if not valid[index]:
+            errors[index] = serializer.errors
+            continue
+
+        data = dict(serializer.validated_data)
+        variant_id = data.pop("variant")
+        if variant_id not in existing_ids:
+            errors[index] = {"variant": [f'Invalid pk "{variant_id}" - object does not exist.']}
+            continue
+
+        prices.append(PriceHistory(variant_id=variant_id, **data))
+
+    return prices, errors
+
+
+def ingest_prices(rows, batch_size=INGEST_BATCH_SIZE):
+    """Validate and insert ``rows`` of prices one batch at a time. Return the count and the row errors."""
+    created = 0
+    errors = []
+
+    for start in range(0, len(rows), batch_size):
+        prices, batch_errors = validate_prices(rows[start : start + batch_size])
+        errors.extend({"row": start + index, "errors": row_errors} for index, row_errors in batch_errors.items())
+        if not prices:
+            continue
+
+        created += len(prices)
+
+        with transaction.atomic():
+            if settings.COMPACT_INGESTED_PRICES:
+                prices, extended = extend_open_prices(prices)
+                if extended:
+                    save_extended_prices(extended)
+            if prices:
+                insert_prices(prices, batch_size)
+                prices_bulk_created.send(sender=PriceHistory, instances=prices)
+
+    return created, errors
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mobiles.archive import archive_prices
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the prices ending before a date to compressed monthly archive files, keeping the newest of each variant."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("before", help="Archive the prices whose last day is before this date.")
+
+    def handle(self, *args, before, **options):
+        try:
+            before = date.fromisoformat(before)
+        except ValueError:
+            raise CommandError(f"Invalid date: {before}")
+
+        count, months = archive_prices(before)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {count} prices of {len(months)} months: {', '.join(f'{month:%Y-%m}' for month in months) or '-'}"
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from mobiles.compaction import COMPACTION_BATCH_SIZE, compact_prices
+
+
+class Command(BaseCommand):
+    help = "Merge the runs of unchanged consecutive daily prices of each variant into intervals."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH_SIZE, help="Variants per batch.")
+
+    def handle(self, *args, batch_size, **options):
+        merged, intervals = compact_prices(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Merged {merged} prices into {intervals} intervals."))
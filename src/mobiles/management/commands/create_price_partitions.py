@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from mobiles.models import PriceRollup
+from mobiles.partitions import PARTITION_MONTHS_AHEAD, create_price_partitions, is_partitioned
+from mobiles.rollups import period_end
+
+
+class Command(BaseCommand):
+    help = "Create the monthly partitions of the price history for the current and the next months (PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=PARTITION_MONTHS_AHEAD,
+            help="Number of months after the current one to create partitions for.",
+        )
+
+    def handle(self, *args, months, **options):
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING("The price history is not partitioned on this database."))
+            return
+
+        start = end = date.today().replace(day=1)
+        for _ in range(months):
+            end = period_end(PriceRollup.MONTH, end)
+
+        created = create_price_partitions(start, end)
+        self.stdout.write(self.style.SUCCESS(f"Created {len(created)} price partitions: {', '.join(created) or '-'}"))
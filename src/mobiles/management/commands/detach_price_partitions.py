@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mobiles.partitions import detach_price_partitions, is_partitioned
+
+
+class Command(BaseCommand):
+    help = "Detach the monthly partitions of the price history before a date, keeping their tables (PostgreSQL)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("before", help="Detach the partitions of the months ending on or before this date.")
+
+    def handle(self, *args, before, **options):
+        try:
+            before = date.fromisoformat(before)
+        except ValueError:
+            raise CommandError(f"Invalid date: {before}")
+
+        if not is_partitioned():
+            self.stdout.write(self.style.WARNING("The price history is not partitioned on this database."))
+            return
+
+        detached = detach_price_partitions(before)
+        self.stdout.write(
+            self.style.SUCCESS(f"Detached {len(detached)} price partitions: {', '.join(detached) or '-'}")
+        )
+        if detached:
+            # The detached prices are removed without signals.
+            self.stdout.write(
+                "Run rebuild_current_prices, rebuild_catalog_rows and update_price_rollups --rebuild to drop the "
+                "detached prices from the derived tables."
+            )
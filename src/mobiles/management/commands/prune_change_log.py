@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from mobiles.models import ChangeLog
+
+
+class Command(BaseCommand):
+    help = "Delete the change log entries older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CHANGE_LOG_RETENTION_DAYS,
+            help="Retention period in days (default: CHANGE_LOG_RETENTION_DAYS).",
+        )
+        parser.add_argument("--batch-size", type=int, default=10000, help="Entries deleted per query.")
+
+    def handle(self, *args, days, batch_size, **options):
+        cutoff = timezone.now() - timedelta(days=days)
+        entries = ChangeLog.objects.filter(created__lt=cutoff).order_by("sequence")
+
+        # Deleted in batches, so a large backlog does not hold a long lock on the log.
+        deleted = 0
+        while sequences := list(entries.values_list("sequence", flat=True)[:batch_size]):
+            deleted += ChangeLog.objects.filter(sequence__in=sequences).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} change log entries older than {days} days."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from mobiles.catalog import REBUILD_BATCH_SIZE, rebuild_catalog_rows
+
+
+class Command(BaseCommand):
+    help = "Rewrite every row of the materialized flat catalog from the catalog tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=REBUILD_BATCH_SIZE, help="Prices read per query.")
+
+    def handle(self, *args, batch_size, **options):
+        count = rebuild_catalog_rows(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} catalog rows."))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mobiles.models import Variant
+
+
+class Command(BaseCommand):
+    help = "Rebuild the current price of every variant from its newest price, or only verify it."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report the variants whose current price is stale, and fail if there are any.",
+        )
+
+    def handle(self, *args, verify, **options):
+        if verify:
+            stale = list(Variant.objects.stale_current_prices().order_by("pk").values_list("pk", flat=True))
+            if stale:
+                raise CommandError(f"{len(stale)} variants have a stale current price: {', '.join(map(str, stale))}")
+            self.stdout.write(self.style.SUCCESS("All current prices are up to date."))
+            return
+
+        updated = Variant.objects.refresh_current_prices()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the current price of {updated} variants."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from mobiles.search import create_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the search indexes of the brand, model, color and nationality columns."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            create_search_index(connection)
+        self.stdout.write(self.style.SUCCESS("Rebuilt the search index."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from mobiles.rollups import REBUILD_BATCH_SIZE, ROLLUP_BATCH_SIZE, rebuild_price_rollups, update_price_rollups
+
+
+class Command(BaseCommand):
+    help = "Update the price rollups with the prices changed since the last update."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help=(
+                f"Changed prices read per batch (default: {ROLLUP_BATCH_SIZE}), or variants and mobiles per batch with "
+                f"--rebuild (default: {REBUILD_BATCH_SIZE})."
+            ),
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Delete every rollup and recompute them from the whole history.",
+        )
+
+    def handle(self, *args, batch_size, rebuild, **options):
+        if rebuild:
+            count = rebuild_price_rollups(batch_size=batch_size or REBUILD_BATCH_SIZE)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} price rollups."))
+            return
+
+        count = update_price_rollups(batch_size=batch_size or ROLLUP_BATCH_SIZE)
+        self.stdout.write(self.style.SUCCESS(f"Updated the price rollups with {count} changed prices."))
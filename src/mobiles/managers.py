@@ -1,4 +1,18 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import Coalesce, RowNumber
+from django.utils import timezone
+
+# The order of the variants in the catalog: by brand, then by mobile, then by creation.
+VARIANT_CATALOG_ORDERING = (
+    "mobile__brand__created",
+    "mobile__brand__id",
+    "mobile__created",
+    "mobile__id",
+    "created",
+    "id",
+)
 
 
 class BrandManager(models.Manager):
@@ -11,11 +25,68 @@ class MobileManager(models.Manager):
         return super().get_queryset().select_related("brand", "country")
 
 
-class VariantManager(models.Manager):
+class VariantQuerySet(models.QuerySet):
+    @staticmethod
+    def newest_price_subqueries():
+        """Map each denormalized field to the subquery of its value in the newest price of the variant."""
+        newest = (
+            apps.get_model("mobiles", "PriceHistory")
+            .objects.filter(variant=OuterRef("pk"))
+            .select_related(None)
+            .order_by("-date", "-created", "-id")
+            # The last day of a compacted price.
+            .annotate(last_date=Coalesce("valid_to", "date"))
+        )
+        return {
+            "current_price": Subquery(newest.values("price")[:1]),
+            "current_status": Subquery(newest.values("status")[:1]),
+            "price_date": Subquery(newest.values("last_date")[:1]),
+        }
+
+    def refresh_current_prices(self):
+        """Copy the newest price of each variant to its current price columns with a single ``UPDATE``."""
+        return self.update(**self.newest_price_subqueries(), updated=timezone.now())
+
+    def stale_current_prices(self):
+        """Return the variants whose denormalized fields differ from their newest price."""
+        expected = {f"expected_{name}": subquery for name, subquery in self.newest_price_subqueries().items()}
+        rows = (
+            self.select_related(None)
+            .annotate(**expected)
+            .values_list("pk", "current_price", "current_status", "price_date", *expected)
+        )
+        stale = [pk for pk, *values in rows.iterator() if values[:3] != values[3:]]
+        return self.filter(pk__in=stale)
+
+
+class VariantManager(models.Manager.from_queryset(VariantQuerySet)):
     def get_queryset(self):
         return super().get_queryset().select_related("mobile")
 
 
-class PriceHistoryManager(models.Manager):
+class PriceHistoryQuerySet(models.QuerySet):
+    def newest(self, count):
+        """Return the ``count`` newest prices of each variant, by date and then by creation."""
+        return self.annotate(
+            newest_rank=Window(
+                RowNumber(),
+                partition_by=F("variant_id"),
+                order_by=(F("date").desc(), F("created").desc(), F("id").desc()),
+            )
+        ).filter(newest_rank__lte=count)
+
+    def days_from(self, day):
+        """Keep the prices with days from ``day`` on, compacted prices included."""
+        return self.filter(Q(date__gte=day) | Q(valid_to__gte=day), date__gte=day.replace(day=1))
+
+
+class PriceHistoryManager(models.Manager.from_queryset(PriceHistoryQuerySet)):
     def get_queryset(self):
         return super().get_queryset().select_related("variant")
+
+
+class CatalogRowQuerySet(PriceHistoryQuerySet):
+    """Catalog rows carry the ``variant_id``, ``date``, ``created`` and ``id`` of their price, ranked the same way."""
+
+
+CatalogRowManager = models.Manager.from_queryset(CatalogRowQuerySet)
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-18 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pricehistory',
+            index=models.Index(fields=['variant', 'date'], name='mobiles_price_variant_date_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0002_price_variant_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated', models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Created')),
+                ('model', models.CharField(max_length=100, verbose_name='Model name')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+            ],
+            options={
+                'ordering': ('created',),
+                'abstract': False,
+            },
+        ),
+        migrations.AlterField(
+            model_name='brand',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='mobile',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='nationality',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='pricehistory',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated'),
+        ),
+        migrations.AlterField(
+            model_name='variant',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Updated'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0003_updated_index_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('sequence', models.BigAutoField(primary_key=True, serialize=False, verbose_name='Sequence')),
+                ('model', models.CharField(max_length=100, verbose_name='Model name')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+                ('op', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=6, verbose_name='Operation')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created')),
+            ],
+            options={
+                'ordering': ('sequence',),
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_current_prices(apps, schema_editor):
+    Variant = apps.get_model('mobiles', 'Variant')
+    PriceHistory = apps.get_model('mobiles', 'PriceHistory')
+    newest = PriceHistory.objects.filter(variant=OuterRef('pk')).order_by('-date', '-created', '-id')
+    Variant.objects.update(
+        current_price=Subquery(newest.values('price')[:1]),
+        current_status=Subquery(newest.values('status')[:1]),
+        price_date=Subquery(newest.values('date')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0004_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='variant',
+            name='current_price',
+            field=models.DecimalField(db_index=True, decimal_places=0, editable=False, max_digits=9, null=True, verbose_name='Current price'),
+        ),
+        migrations.AddField(
+            model_name='variant',
+            name='current_status',
+            field=models.BooleanField(editable=False, null=True, verbose_name='Current status'),
+        ),
+        migrations.AddField(
+            model_name='variant',
+            name='price_date',
+            field=models.DateField(editable=False, null=True, verbose_name='Current price date'),
+        ),
+        migrations.RunPython(fill_current_prices, migrations.RunPython.noop),
+    ]
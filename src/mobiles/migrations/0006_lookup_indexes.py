@@ -0,0 +1,53 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0005_variant_current_price'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='brand',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='brand',
+            name='name',
+            field=models.CharField(db_index=True, max_length=150, verbose_name='Brand name'),
+        ),
+        migrations.AlterField(
+            model_name='mobile',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='nationality',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='nationality',
+            name='name',
+            field=models.CharField(db_index=True, max_length=150, verbose_name='Nationality name'),
+        ),
+        migrations.AlterField(
+            model_name='pricehistory',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='tombstone',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created'),
+        ),
+        migrations.AlterField(
+            model_name='variant',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:19
+
+from itertools import islice
+
+from django.db import migrations, models
+
+CATALOG_ROW_COLUMNS = (
+    ('id', 'id'),
+    ('variant_id', 'variant_id'),
+    ('mobile_id', 'variant__mobile_id'),
+    ('brand_id', 'variant__mobile__brand_id'),
+    ('nationality_id', 'variant__mobile__brand__nationality_id'),
+    ('country_id', 'variant__mobile__country_id'),
+    ('brand', 'variant__mobile__brand__name'),
+    ('nationality', 'variant__mobile__brand__nationality__name'),
+    ('model', 'variant__mobile__model'),
+    ('country', 'variant__mobile__country__name'),
+    ('color', 'variant__color'),
+    ('size', 'variant__size'),
+    ('image', 'variant__image'),
+    ('price', 'price'),
+    ('status', 'status'),
+    ('date', 'date'),
+    ('mobile_created', 'variant__mobile__created'),
+    ('variant_created', 'variant__created'),
+    ('created', 'created'),
+)
+
+
+def fill_catalog_rows(apps, schema_editor):
+    CatalogRow = apps.get_model('mobiles', 'CatalogRow')
+    PriceHistory = apps.get_model('mobiles', 'PriceHistory')
+    names = [name for name, _ in CATALOG_ROW_COLUMNS]
+    rows = PriceHistory.objects.values_list(*(path for _, path in CATALOG_ROW_COLUMNS)).iterator()
+    while batch := list(islice(rows, 10000)):
+        CatalogRow.objects.bulk_create(CatalogRow(**dict(zip(names, row))) for row in batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0006_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogRow',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Price id')),
+                ('variant_id', models.BigIntegerField(verbose_name='Variant id')),
+                ('mobile_id', models.BigIntegerField(db_index=True, verbose_name='Mobile id')),
+                ('brand_id', models.BigIntegerField(db_index=True, verbose_name='Brand id')),
+                ('nationality_id', models.BigIntegerField(db_index=True, verbose_name='Nationality id')),
+                ('country_id', models.BigIntegerField(db_index=True, verbose_name='Country id')),
+                ('brand', models.CharField(max_length=150, verbose_name='Brand name')),
+                ('nationality', models.CharField(max_length=150, verbose_name='Nationality name')),
+                ('model', models.CharField(max_length=150, verbose_name='Mobile model')),
+                ('country', models.CharField(max_length=150, verbose_name='Country name')),
+                ('color', models.CharField(max_length=100, verbose_name='Mobile color')),
+                ('size', models.FloatField(verbose_name='Mobile screen size')),
+                ('image', models.CharField(max_length=100, verbose_name='Mobile image')),
+                ('price', models.DecimalField(decimal_places=0, max_digits=9, verbose_name='Variant price')),
+                ('status', models.BooleanField(verbose_name='Status')),
+                ('date', models.DateField(verbose_name='Price date')),
+                ('mobile_created', models.DateTimeField(verbose_name='Mobile created')),
+                ('variant_created', models.DateTimeField(verbose_name='Variant created')),
+                ('created', models.DateTimeField(verbose_name='Created')),
+            ],
+            options={
+                'ordering': ('mobile_created', 'mobile_id', 'variant_created', 'variant_id', 'created', 'id'),
+                'indexes': [models.Index(fields=['variant_id', 'date'], name='mobiles_row_variant_date_idx')],
+            },
+        ),
+        migrations.RunPython(fill_catalog_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0007_catalog_row'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Watermark',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Name')),
+                ('updated', models.DateTimeField(null=True, verbose_name='Updated')),
+                ('object_id', models.BigIntegerField(null=True, verbose_name='Object id')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PriceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('variant', 'Variant'), ('mobile', 'Mobile')], max_length=7, verbose_name='Scope')),
+                ('object_id', models.BigIntegerField(verbose_name='Object id')),
+                ('period', models.CharField(choices=[('day', 'Day'), ('week', 'Week'), ('month', 'Month')], max_length=5, verbose_name='Period')),
+                ('start', models.DateField(verbose_name='Period start')),
+                ('min_price', models.DecimalField(decimal_places=0, max_digits=9, verbose_name='Minimum price')),
+                ('max_price', models.DecimalField(decimal_places=0, max_digits=9, verbose_name='Maximum price')),
+                ('avg_price', models.DecimalField(decimal_places=2, max_digits=11, verbose_name='Average price')),
+                ('last_price', models.DecimalField(decimal_places=0, max_digits=9, verbose_name='Last price')),
+                ('count', models.PositiveIntegerField(verbose_name='Number of prices')),
+                ('stale', models.BooleanField(default=False, verbose_name='Stale')),
+            ],
+            options={
+                'ordering': ('scope', 'object_id', 'period', 'start'),
+                'indexes': [models.Index(condition=models.Q(('stale', True)), fields=['stale'], name='mobiles_rollup_stale_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pricerollup',
+            constraint=models.UniqueConstraint(fields=('scope', 'object_id', 'period', 'start'), name='mobiles_rollup_unique'),
+        ),
+    ]
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from django.db import migrations
+
+TABLE = 'mobiles_pricehistory'
+PARTITION_MONTHS_AHEAD = 3
+
+
+def next_month(start):
+    return (start + timedelta(days=31)).replace(day=1)
+
+
+def rebuild_table(schema_editor, partitioned):
+    """
+    Copy the price history to a new table, range partitioned by month of ``date`` or plain, and swap it in.
+
+    The constraints and indexes of the table are recreated with their names. The primary key of a partitioned table
+    must include the partition key, so it becomes ``(id, date)``; ``id`` is still drawn from a sequence. The default
+    of ``id`` is not copied, as its sequence belongs to the old table and is dropped with it: a new sequence is
+    created and continues from the old one.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            # NOT NULL constraints (PostgreSQL 18) are copied by LIKE.
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype <> 'n'",
+            [TABLE],
+        )
+        constraints = cursor.fetchall()
+        cursor.execute(
+            'SELECT indexdef FROM pg_indexes WHERE tablename = %s '
+            'AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass)',
+            [TABLE, TABLE],
+        )
+        indexes = [definition.replace(' ON ONLY ', ' ON ') for definition, in cursor.fetchall()]
+        cursor.execute(f'SELECT min(date) FROM {TABLE}')
+        first, = cursor.fetchone()
+        # An identity sequence before the partitioning, the one created below after it.
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        sequence, = cursor.fetchone()
+        cursor.execute(f'SELECT last_value, is_called FROM {sequence}')
+        last_value, is_called = cursor.fetchone()
+
+        new = f'{TABLE}_new'
+        cursor.execute(
+            f'CREATE TABLE {new} (LIKE {TABLE})' + (' PARTITION BY RANGE (date)' if partitioned else '')
+        )
+        if partitioned:
+            cursor.execute(f'CREATE TABLE {TABLE}_default PARTITION OF {new} DEFAULT')
+            month = (first or date.today()).replace(day=1)
+            end = date.today().replace(day=1)
+            for _ in range(PARTITION_MONTHS_AHEAD):
+                end = next_month(end)
+            while month <= end:
+                cursor.execute(
+                    f"CREATE TABLE {TABLE}_p{month:%Y_%m} PARTITION OF {new} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+                )
+                month = next_month(month)
+
+        cursor.execute(f'INSERT INTO {new} SELECT * FROM {TABLE}')
+        cursor.execute(f'DROP TABLE {TABLE}')
+        cursor.execute(f'ALTER TABLE {new} RENAME TO {TABLE}')
+
+        cursor.execute(f'CREATE SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id')
+        cursor.execute(f"ALTER TABLE {TABLE} ALTER COLUMN id SET DEFAULT nextval('{TABLE}_id_seq')")
+        cursor.execute('SELECT setval(%s, %s, %s)', [f'{TABLE}_id_seq', last_value, is_called])
+
+        for name, kind, definition in constraints:
+            if kind == 'p':
+                definition = 'PRIMARY KEY (id, date)' if partitioned else 'PRIMARY KEY (id)'
+            cursor.execute(f'ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}')
+        for definition in indexes:
+            cursor.execute(definition)
+
+
+def partition_price_history(apps, schema_editor):
+    rebuild_table(schema_editor, partitioned=True)
+
+
+def unpartition_price_history(apps, schema_editor):
+    rebuild_table(schema_editor, partitioned=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0008_price_rollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_price_history, unpartition_price_history),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0009_partition_price_history'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='catalogrow',
+            name='valid_to',
+            field=models.DateField(null=True, verbose_name='Valid to'),
+        ),
+        migrations.AddField(
+            model_name='pricehistory',
+            name='valid_to',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Valid to'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.3 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0010_price_intervals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True, verbose_name='Month')),
+                ('path', models.CharField(max_length=255, verbose_name='Path')),
+                ('count', models.PositiveIntegerField(verbose_name='Count')),
+                ('first_date', models.DateField(verbose_name='First date')),
+                ('last_date', models.DateField(verbose_name='Last date')),
+                ('updated', models.DateTimeField(auto_now=True, verbose_name='Updated')),
+            ],
+            options={
+                'ordering': ('month',),
+            },
+        ),
+    ]
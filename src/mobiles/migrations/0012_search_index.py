@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# The searched column of each table, and the text search configuration of the full-text indexes.
+SEARCH_COLUMNS = (
+    ('mobiles_nationality', 'name'),
+    ('mobiles_brand', 'name'),
+    ('mobiles_mobile', 'model'),
+    ('mobiles_variant', 'color'),
+)
+SEARCH_CONFIG = 'simple'
+SEARCH_TRIGGER_OPERATIONS = ('insert', 'delete', 'update')
+
+
+def create_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for table, column in SEARCH_COLUMNS:
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {table}_{column}_trgm_idx ON {table} USING gin ({column} gin_trgm_ops)'
+                )
+                cursor.execute(
+                    f'CREATE INDEX IF NOT EXISTS {table}_{column}_fts_idx ON {table} '
+                    f"USING gin (to_tsvector('{SEARCH_CONFIG}'::regconfig, COALESCE({column}, '')))"
+                )
+
+        elif connection.vendor == 'sqlite':
+            for table, column in SEARCH_COLUMNS:
+                search = f'{table}_search'
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {search} USING fts5({column}, content='{table}', content_rowid='id', "
+                    "tokenize='trigram')"
+                )
+                cursor.execute(f"INSERT INTO {search}({search}) VALUES ('rebuild')")
+                cursor.execute(
+                    f'CREATE TRIGGER {search}_insert AFTER INSERT ON {table} BEGIN '
+                    f'INSERT INTO {search}(rowid, {column}) VALUES (new.id, new.{column}); END'
+                )
+                cursor.execute(
+                    f'CREATE TRIGGER {search}_delete AFTER DELETE ON {table} BEGIN '
+                    f"INSERT INTO {search}({search}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END"
+                )
+                cursor.execute(
+                    f'CREATE TRIGGER {search}_update AFTER UPDATE OF {column} ON {table} BEGIN '
+                    f"INSERT INTO {search}({search}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+                    f'INSERT INTO {search}(rowid, {column}) VALUES (new.id, new.{column}); END'
+                )
+
+
+def drop_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        for table, column in SEARCH_COLUMNS:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'DROP INDEX IF EXISTS {table}_{column}_trgm_idx')
+                cursor.execute(f'DROP INDEX IF EXISTS {table}_{column}_fts_idx')
+            elif connection.vendor == 'sqlite':
+                for operation in SEARCH_TRIGGER_OPERATIONS:
+                    cursor.execute(f'DROP TRIGGER IF EXISTS {table}_search_{operation}')
+                cursor.execute(f'DROP TABLE IF EXISTS {table}_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mobiles', '0011_price_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -5,12 +5,12 @@ from django.db import models
 from django.utils.datetime_safe import datetime
 from django.utils.translation import gettext_lazy as _
 
-from mobiles.managers import BrandManager, MobileManager, PriceHistoryManager, VariantManager
+from mobiles.managers import BrandManager, CatalogRowManager, MobileManager, PriceHistoryManager, VariantManager
 
 
 class BaseModel(models.Model):
-    updated = models.DateTimeField(_("Updated"), auto_now=True)
-    created = models.DateTimeField(_("Created"), auto_now_add=True)
+    updated = models.DateTimeField(_("Updated"), auto_now=True, db_index=True)
+    created = models.DateTimeField(_("Created"), auto_now_add=True, db_index=True)
 
     class Meta:
         abstract = True
@@ -24,14 +24,14 @@ class BaseModel(models.Model):
 
 
 class Nationality(BaseModel):
-    name = models.CharField(_("Nationality name"), max_length=150)
+    name = models.CharField(_("Nationality name"), max_length=150, db_index=True)
 
     def __str__(self):
         return self.name
 
 
 class Brand(BaseModel):
-    name = models.CharField(_("Brand name"), max_length=150)
+    name = models.CharField(_("Brand name"), max_length=150, db_index=True)
     nationality = models.ForeignKey(Nationality, on_delete=models.PROTECT, related_name="brands")
 
     objects = BrandManager()
@@ -61,26 +61,226 @@ class Variant(BaseModel):
     color = models.CharField(_("Mobile color"), max_length=100)
     size = models.FloatField(_("Mobile screen size"), validators=[MinValueValidator(1)])
     image = models.ImageField(_("Mobile image"), upload_to=mobile_image_path)
+    # Copied from the newest price by the PriceHistory signals, see ``VariantQuerySet.refresh_current_prices``.
+    current_price = models.DecimalField(
+        _("Current price"), max_digits=9, decimal_places=0, null=True, editable=False, db_index=True
+    )
+    current_status = models.BooleanField(_("Current status"), null=True, editable=False)
+    price_date = models.DateField(_("Current price date"), null=True, editable=False)
 
     objects = VariantManager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The mobile the variant was loaded with, whose rollups must be refreshed too if it is moved.
+        instance.loaded_mobile_id = instance.__dict__.get("mobile_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.loaded_mobile_id = self.mobile_id
+
+    def get_current_status_display(self):
+        if self.current_status is None:
+            return None
+        return _("Available") if self.current_status else _("Not Available")
+
+    def formatted_price_date(self):
+        return self.price_date.strftime("%Y-%m-%d") if self.price_date else None
+
     def __str__(self):
         return f"{self.mobile.model} ({self.color}, {self.size})"
 
 
 class PriceHistory(BaseModel):
+    # Range partitioned by month of ``date`` on PostgreSQL, with ``(id, date)`` as primary key, see
+    # ``mobiles.partitions``.
     variant = models.ForeignKey(Variant, on_delete=models.CASCADE, related_name="prices")
     price = models.DecimalField(_("Variant price"), max_digits=9, decimal_places=0, validators=[MinValueValidator(1)])
     status = models.BooleanField(_("Status"), default=True)
     date = models.DateField(_("Price date"), default=datetime.now)
+    # Set on a compacted price, which stands for the same daily price from ``date`` to ``valid_to``, see
+    # ``mobiles.compaction``.
+    valid_to = models.DateField(_("Valid to"), null=True, blank=True, editable=False)
 
     objects = PriceHistoryManager()
 
+    class Meta(BaseModel.Meta):
+        indexes = (models.Index(fields=("variant", "date"), name="mobiles_price_variant_date_idx"),)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The variant the price was loaded with, whose current price must be refreshed too if it is moved.
+        instance.loaded_variant_id = instance.__dict__.get("variant_id")
+        # The days the price was loaded with, whose rollups must be refreshed too if it is moved.
+        instance.loaded_date = instance.__dict__.get("date")
+        instance.loaded_valid_to = instance.__dict__.get("valid_to")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Moving a compacted price moves its whole interval.
+        loaded_date = getattr(self, "loaded_date", None)
+        if self.valid_to and loaded_date:
+            self.valid_to += self._meta.get_field("date").to_python(self.date) - loaded_date
+
+        super().save(*args, **kwargs)
+        self.loaded_variant_id, self.loaded_date, self.loaded_valid_to = self.variant_id, self.date, self.valid_to
+
+    def last_date(self):
+        """Return the last day of the price, ``valid_to`` for a compacted price and ``date`` otherwise."""
+        return self.valid_to or self.date
+
     def get_status_display(self):
         return _("Available") if self.status else _("Not Available")
 
     def formatted_date(self):
         return self.date.strftime("%Y-%m-%d")
 
+    def formatted_valid_to(self):
+        return self.valid_to.strftime("%Y-%m-%d") if self.valid_to else None
+
+    def __str__(self):
+        days = f"{self.formatted_date()} - {self.formatted_valid_to()}" if self.valid_to else self.formatted_date()
+        return f"{self.price}$ at {days} ({self.get_status_display()})"
+
+
+class Tombstone(BaseModel):
+    """A deleted catalog object, kept for the delta sync. ``updated`` is the time of the deletion."""
+
+    model = models.CharField(_("Model name"), max_length=100)
+    object_id = models.BigIntegerField(_("Object id"))
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} (deleted at {self.formatted_updated()})"
+
+
+class ChangeLog(models.Model):
+    """Append-only log of the changes of the catalog, written in the transaction of each change."""
+
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    OPERATIONS = (
+        (CREATE, _("Create")),
+        (UPDATE, _("Update")),
+        (DELETE, _("Delete")),
+    )
+
+    sequence = models.BigAutoField(_("Sequence"), primary_key=True)
+    model = models.CharField(_("Model name"), max_length=100)
+    object_id = models.BigIntegerField(_("Object id"))
+    op = models.CharField(_("Operation"), max_length=6, choices=OPERATIONS)
+    created = models.DateTimeField(_("Created"), auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ("sequence",)
+
+    def __str__(self):
+        return f"#{self.sequence} {self.op} {self.model} {self.object_id}"
+
+
+class CatalogRow(models.Model):
+    """A price with the columns of its variant, mobile and brand: one row of the flat catalog."""
+
+    id = models.BigIntegerField(_("Price id"), primary_key=True)
+    variant_id = models.BigIntegerField(_("Variant id"))
+    mobile_id = models.BigIntegerField(_("Mobile id"), db_index=True)
+    brand_id = models.BigIntegerField(_("Brand id"), db_index=True)
+    nationality_id = models.BigIntegerField(_("Nationality id"), db_index=True)
+    country_id = models.BigIntegerField(_("Country id"), db_index=True)
+    brand = models.CharField(_("Brand name"), max_length=150)
+    nationality = models.CharField(_("Nationality name"), max_length=150)
+    model = models.CharField(_("Mobile model"), max_length=150)
+    country = models.CharField(_("Country name"), max_length=150)
+    color = models.CharField(_("Mobile color"), max_length=100)
+    size = models.FloatField(_("Mobile screen size"))
+    image = models.CharField(_("Mobile image"), max_length=100)
+    price = models.DecimalField(_("Variant price"), max_digits=9, decimal_places=0)
+    status = models.BooleanField(_("Status"))
+    date = models.DateField(_("Price date"))
+    valid_to = models.DateField(_("Valid to"), null=True)
+    mobile_created = models.DateTimeField(_("Mobile created"))
+    variant_created = models.DateTimeField(_("Variant created"))
+    created = models.DateTimeField(_("Created"))
+
+    objects = CatalogRowManager()
+
+    class Meta:
+        # The order of the flat representation.
+        ordering = ("mobile_created", "mobile_id", "variant_created", "variant_id", "created", "id")
+        indexes = (models.Index(fields=("variant_id", "date"), name="mobiles_row_variant_date_idx"),)
+
+    def __str__(self):
+        return f"{self.brand} {self.model} ({self.color}, {self.size}): {self.price}$ at {self.date}"
+
+
+class PriceRollup(models.Model):
+    """The aggregates of the prices of a variant or of a mobile over a day, a week or a month."""
+
+    VARIANT = "variant"
+    MOBILE = "mobile"
+    SCOPES = (
+        (VARIANT, _("Variant")),
+        (MOBILE, _("Mobile")),
+    )
+
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    PERIODS = (
+        (DAY, _("Day")),
+        (WEEK, _("Week")),
+        (MONTH, _("Month")),
+    )
+
+    scope = models.CharField(_("Scope"), max_length=7, choices=SCOPES)
+    object_id = models.BigIntegerField(_("Object id"))
+    period = models.CharField(_("Period"), max_length=5, choices=PERIODS)
+    start = models.DateField(_("Period start"))
+    min_price = models.DecimalField(_("Minimum price"), max_digits=9, decimal_places=0)
+    max_price = models.DecimalField(_("Maximum price"), max_digits=9, decimal_places=0)
+    avg_price = models.DecimalField(_("Average price"), max_digits=11, decimal_places=2)
+    last_price = models.DecimalField(_("Last price"), max_digits=9, decimal_places=0)
+    count = models.PositiveIntegerField(_("Number of prices"))
+    stale = models.BooleanField(_("Stale"), default=False)
+
+    class Meta:
+        ordering = ("scope", "object_id", "period", "start")
+        constraints = (
+            # Also serves the reads of the rollups of an object over a date range.
+            models.UniqueConstraint(fields=("scope", "object_id", "period", "start"), name="mobiles_rollup_unique"),
+        )
+        indexes = (models.Index(fields=("stale",), condition=models.Q(stale=True), name="mobiles_rollup_stale_idx"),)
+
+    def __str__(self):
+        return f"{self.scope} {self.object_id} {self.period} of {self.start}: {self.min_price}$ - {self.max_price}$"
+
+
+class Watermark(models.Model):
+    """The position up to which a background job has processed a table, in ``(updated, id)`` order."""
+
+    name = models.CharField(_("Name"), max_length=100, primary_key=True)
+    updated = models.DateTimeField(_("Updated"), null=True)
+    object_id = models.BigIntegerField(_("Object id"), null=True)
+
+    def __str__(self):
+        return f"{self.name} at {self.updated} ({self.object_id})"
+
+
+class PriceArchive(models.Model):
+    """A month of prices moved out of ``PriceHistory`` into a compressed file."""
+
+    month = models.DateField(_("Month"), unique=True)
+    path = models.CharField(_("Path"), max_length=255)
+    count = models.PositiveIntegerField(_("Count"))
+    first_date = models.DateField(_("First date"))
+    last_date = models.DateField(_("Last date"))
+    updated = models.DateTimeField(_("Updated"), auto_now=True)
+
+    class Meta:
+        ordering = ("month",)
+
     def __str__(self):
-        return f"{self.price}$ at {self.formatted_date()} ({self.get_status_display()})"
+        return f"{self.count} prices of {self.month:%Y-%m} in {self.path}"
@@ -0,0 +1,27 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime
+
+
+def get_pagination_query(request, *params):
+    """Return the query string of ``request`` kept by the pagination links, without ``page`` and ``params``."""
+    query = request.GET.copy()
+    for name in ("page", *params):
+        query.pop(name, None)
+
+    return query.urlencode()
+
+
+def encode_cursor(created, pk, index):
+    """Encode the position after the row ``(created, pk)``, the ``index``-th of the list."""
+    return urlsafe_b64encode(f"{created.isoformat()}|{pk}|{index}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(encoded):
+    """Return the position encoded by ``encode_cursor``, or ``None`` when it is missing or invalid."""
+    try:
+        padding = "=" * (-len(encoded) % 4)
+        created, pk, index = urlsafe_b64decode(encoded + padding).decode().split("|")
+        return datetime.fromisoformat(created), int(pk), int(index)
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        return None
@@ -0,0 +1,103 @@
+import re
+from datetime import date
+
+from django.db import connection, transaction
+
+from mobiles.models import PriceHistory, PriceRollup
+from mobiles.rollups import period_end, period_start
+
+PARTITION_MONTHS_AHEAD = 3
+
+
+def partition_name(start):
+    """Return the name of the partition of the month starting on ``start``, e.g. ``mobiles_pricehistory_p2024_01``."""
+    return f"{PriceHistory._meta.db_table}_p{start:%Y_%m}"
+
+
+def default_partition_name():
+    return f"{PriceHistory._meta.db_table}_default"
+
+
+def is_partitioned():
+    """Return whether the price history table is partitioned, which is only the case on PostgreSQL."""
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+            [PriceHistory._meta.db_table],
+        )
+        return cursor.fetchone()[0]
+
+
+def get_price_partitions():
+    """Return the ``(name, start)`` of the monthly partitions of the price history, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = %s::regclass",
+            [PriceHistory._meta.db_table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    pattern = re.compile(rf"{PriceHistory._meta.db_table}_p(\d{{4}})_(\d{{2}})")
+    partitions = []
+    for name in names:
+        if match := pattern.fullmatch(name):
+            year, month = map(int, match.groups())
+            partitions.append((name, date(year, month, 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+@transaction.atomic
+def create_price_partitions(start, end):
+    """Create the missing partitions of the months from ``start`` to ``end``. Return their names."""
+    existing = {month for _, month in get_price_partitions()}
+    quote_name = connection.ops.quote_name
+    table = quote_name(PriceHistory._meta.db_table)
+    default = quote_name(default_partition_name())
+
+    created = []
+    month = period_start(PriceRollup.MONTH, start)
+    with connection.cursor() as cursor:
+        while month <= end:
+            following = period_end(PriceRollup.MONTH, month)
+            if month not in existing:
+                name = partition_name(month)
+                cursor.execute(f"CREATE TABLE {quote_name(name)} (LIKE {table} INCLUDING DEFAULTS)")
+                cursor.execute(
+                    f"WITH moved AS (DELETE FROM {default} WHERE date >= %s AND date < %s RETURNING *) "
+                    f"INSERT INTO {quote_name(name)} SELECT * FROM moved",
+                    [month, following],
+                )
+                cursor.execute(
+                    f"ALTER TABLE {table} ATTACH PARTITION {quote_name(name)} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+                )
+                created.append(name)
+            month = following
+
+    return created
+
+
+@transaction.atomic
+def detach_price_partitions(before):
+    """Detach the partitions of the months ending on or before ``before``. Return their names."""
+    quote_name = connection.ops.quote_name
+    table = quote_name(PriceHistory._meta.db_table)
+
+    detached = []
+    with connection.cursor() as cursor:
+        for name, start in get_price_partitions():
+            if period_end(PriceRollup.MONTH, start) <= before:
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {quote_name(name)}")
+                cursor.execute(
+                    "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'", [name]
+                )
+                for (constraint,) in cursor.fetchall():
+                    cursor.execute(f"ALTER TABLE {quote_name(name)} DROP CONSTRAINT {quote_name(constraint)}")
+                cursor.execute(f"ALTER TABLE {quote_name(name)} ALTER COLUMN id DROP DEFAULT")
+                detached.append(name)
+
+    return detached
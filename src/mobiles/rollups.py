@@ -0,0 +1,295 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from functools import reduce
+from itertools import chain
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum, Window
+from django.db.models.functions import RowNumber, TruncDay, TruncMonth, TruncWeek
+
+from mobiles.changes import visible_before
+from mobiles.models import Mobile, PriceHistory, PriceRollup, Variant, Watermark
+
+PRICE_ROLLUPS_WATERMARK = "price_rollups"
+ROLLUP_BATCH_SIZE = 10000
+REBUILD_BATCH_SIZE = 500
+AVERAGE_PRECISION = Decimal("0.01")
+
+# The path from ``PriceHistory`` to the object of each scope.
+SCOPE_LOOKUPS = {
+    PriceRollup.VARIANT: "variant_id",
+    PriceRollup.MOBILE: "variant__mobile_id",
+}
+
+TRUNCATIONS = {
+    PriceRollup.DAY: TruncDay,
+    PriceRollup.WEEK: TruncWeek,
+    PriceRollup.MONTH: TruncMonth,
+}
+
+
+def period_start(period, day):
+    """Return the first day of the ``period`` containing ``day``. Weeks start on Monday."""
+    if period == PriceRollup.WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == PriceRollup.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def period_end(period, start):
+    """Return the day after the ``period`` starting on ``start``."""
+    if period == PriceRollup.WEEK:
+        return start + timedelta(days=7)
+    if period == PriceRollup.MONTH:
+        return (start + timedelta(days=31)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def get_buckets(variant_id, mobile_id, first_day, last_day=None):
+    """Return the ``(scope, object_id, period, start)`` of the rollups a price of ``variant_id`` is in."""
+    days = [first_day + timedelta(days=offset) for offset in range(((last_day or first_day) - first_day).days + 1)]
+    return {
+        (scope, object_id, period, period_start(period, day))
+        for scope, object_id in ((PriceRollup.VARIANT, variant_id), (PriceRollup.MOBILE, mobile_id))
+        for period in TRUNCATIONS
+        for day in days
+    }
+
+
+def mark_rollups_stale(variant_id, first_day, last_day=None):
+    """Mark the rollups of the variant ``variant_id`` and of its mobile over the days as stale."""
+    last_day = last_day or first_day
+    periods = reduce(
+        or_,
+        (
+            Q(period=period, start__gte=period_start(period, first_day), start__lte=period_start(period, last_day))
+            for period in TRUNCATIONS
+        ),
+    )
+    objects = Q(scope=PriceRollup.VARIANT, object_id=variant_id) | Q(
+        scope=PriceRollup.MOBILE, object_id__in=Variant.objects.filter(pk=variant_id).values("mobile_id")
+    )
+    PriceRollup.objects.filter(periods, objects).update(stale=True)
+
+
+def mark_moved_variant_rollups_stale(variant_id, old_mobile_id, new_mobile_id):
+    """Mark the rollups of both mobiles of a moved variant as stale, creating the missing ones."""
+    rollups = list(PriceRollup.objects.filter(scope=PriceRollup.VARIANT, object_id=variant_id))
+    if not rollups:
+        return
+
+    starts = defaultdict(list)
+    for rollup in rollups:
+        starts[rollup.period].append(rollup.start)
+    periods = reduce(or_, (Q(period=period, start__in=period_starts) for period, period_starts in starts.items()))
+    PriceRollup.objects.filter(periods, scope=PriceRollup.MOBILE, object_id=old_mobile_id).update(stale=True)
+
+    # The rollups of the variant stand in for the missing ones until they are recomputed.
+    for rollup in rollups:
+        rollup.pk, rollup.scope, rollup.object_id, rollup.stale = None, PriceRollup.MOBILE, new_mobile_id, True
+    PriceRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=("scope", "object_id", "period", "start"),
+        update_fields=("stale",),
+    )
+
+
+def get_archived_intervals(scope, object_ids, prices, archived):
+    """Return the intervals of the ``archived`` prices of ``object_ids`` that are not in ``prices``."""
+    if not archived:
+        return []
+
+    if scope == PriceRollup.MOBILE:
+        objects = dict(
+            Variant.objects.filter(
+                pk__in={price.variant_id for price in archived}, mobile_id__in=object_ids
+            ).values_list("pk", "mobile_id")
+        )
+    else:
+        objects = {object_id: object_id for object_id in object_ids}
+    kept = set(prices.filter(date__lte=max(price.last_date() for price in archived)).values_list("id", flat=True))
+
+    return [
+        (objects[price.variant_id], price.date, price.last_date(), price.created, price.pk, price.price)
+        for price in archived
+        if price.variant_id in objects and price.pk not in kept
+    ]
+
+
+def read_archived(start=None, end=None):
+    """Return the archived prices with days from ``start`` to before ``end``."""
+    # Imported here, as mobiles.archive imports this module.
+    from mobiles.archive import read_archived_prices
+
+    return read_archived_prices(start, end - timedelta(days=1) if end else None)
+
+
+def compute_rollups(scope, period, prices, start=None, end=None, archived=()):
+    """Return the rollups of ``prices`` and of the ``archived`` intervals for ``scope`` and ``period``."""
+    lookup = SCOPE_LOOKUPS[scope]
+    bucket = TRUNCATIONS[period]("date")
+    daily = prices.filter(valid_to__isnull=True).order_by().annotate(bucket_object=F(lookup), bucket_start=bucket)
+
+    # ``[min, max, total, count, last]`` of each bucket, ``last`` being the ``(date, created, id, price)`` of the
+    # newest price, ranked like ``PriceHistoryQuerySet.newest``.
+    buckets = {
+        (row["bucket_object"], row["bucket_start"]): [
+            row["bucket_min"],
+            row["bucket_max"],
+            row["bucket_sum"],
+            row["bucket_count"],
+            None,
+        ]
+        for row in daily.values("bucket_object", "bucket_start").annotate(
+            bucket_min=Min("price"),
+            bucket_max=Max("price"),
+            bucket_sum=Sum("price"),
+            bucket_count=Count("id"),
+        )
+    }
+    last_prices = (
+        daily.annotate(
+            bucket_rank=Window(
+                RowNumber(),
+                partition_by=(F(lookup), bucket),
+                order_by=(F("date").desc(), F("created").desc(), F("id").desc()),
+            )
+        )
+        .filter(bucket_rank=1)
+        .values_list("bucket_object", "bucket_start", "date", "created", "id", "price")
+    )
+    for object_id, bucket_start, *last in last_prices:
+        buckets[object_id, bucket_start][4] = tuple(last)
+
+    compacted = (
+        prices.filter(valid_to__isnull=False)
+        .order_by()
+        .values_list(lookup, "date", "valid_to", "created", "id", "price")
+    )
+    for object_id, first_day, last_day, created, pk, price in chain(compacted, archived):
+        first_day = max(first_day, start) if start else first_day
+        last_day = min(last_day, end - timedelta(days=1)) if end else last_day
+        for offset in range((last_day - first_day).days + 1):
+            day = first_day + timedelta(days=offset)
+            aggregates = buckets.setdefault((object_id, period_start(period, day)), [price, price, 0, 0, None])
+            aggregates[0] = min(aggregates[0], price)
+            aggregates[1] = max(aggregates[1], price)
+            aggregates[2] += price
+            aggregates[3] += 1
+            aggregates[4] = max(aggregates[4] or (day, created, pk, price), (day, created, pk, price))
+
+    return [
+        PriceRollup(
+            scope=scope,
+            object_id=object_id,
+            period=period,
+            start=bucket_start,
+            min_price=min_price,
+            max_price=max_price,
+            avg_price=(Decimal(total) / count).quantize(AVERAGE_PRECISION),
+            last_price=last[3],
+            count=count,
+        )
+        for (object_id, bucket_start), (min_price, max_price, total, count, last) in buckets.items()
+    ]
+
+
+def save_rollups(rollups):
+    PriceRollup.objects.bulk_create(
+        rollups,
+        update_conflicts=True,
+        unique_fields=("scope", "object_id", "period", "start"),
+        update_fields=("min_price", "max_price", "avg_price", "last_price", "count", "stale"),
+    )
+
+
+def refresh_rollups(buckets):
+    """Recompute the rollups of ``buckets``, given as ``(scope, object_id, period, start)``."""
+    groups = defaultdict(set)
+    for scope, object_id, period, start in buckets:
+        groups[scope, period].add((object_id, start))
+
+    for (scope, period), keys in groups.items():
+        start = min(bucket_start for _, bucket_start in keys)
+        end = period_end(period, max(bucket_start for _, bucket_start in keys))
+        object_ids = {object_id for object_id, _ in keys}
+        prices = PriceHistory.objects.days_from(start).filter(
+            **{f"{SCOPE_LOOKUPS[scope]}__in": object_ids}, date__lt=end
+        )
+        archived = get_archived_intervals(scope, object_ids, prices, read_archived(start, end))
+        rollups = compute_rollups(scope, period, prices, start, end, archived)
+        save_rollups(rollups)
+
+        empty = keys - {(rollup.object_id, rollup.start) for rollup in rollups}
+        if empty:
+            PriceRollup.objects.filter(
+                reduce(or_, (Q(object_id=object_id, start=start) for object_id, start in empty)),
+                scope=scope,
+                period=period,
+            ).delete()
+
+
+def update_price_rollups(batch_size=ROLLUP_BATCH_SIZE):
+    """Recompute the rollups of the prices changed since the watermark and the stale ones."""
+    count = 0
+    while True:
+        with transaction.atomic():
+            watermark, _ = Watermark.objects.select_for_update().get_or_create(name=PRICE_ROLLUPS_WATERMARK)
+
+            # Prices of transactions still in flight may get an older ``updated`` than the visible ones, wait for them.
+            prices = PriceHistory.objects.filter(updated__lte=visible_before()).order_by("updated", "id")
+            if watermark.updated is not None:
+                prices = prices.filter(
+                    Q(updated__gt=watermark.updated) | Q(updated=watermark.updated, id__gt=watermark.object_id)
+                )
+            batch = list(
+                prices.values_list("updated", "id", "variant_id", "variant__mobile_id", "date", "valid_to")[:batch_size]
+            )
+            stale = PriceRollup.objects.filter(stale=True).values_list("scope", "object_id", "period", "start")
+            buckets = set(stale[:batch_size])
+            if not batch and not buckets:
+                return count
+
+            for _, _, variant_id, mobile_id, first_day, last_day in batch:
+                buckets |= get_buckets(variant_id, mobile_id, first_day, last_day)
+            refresh_rollups(buckets)
+
+            if batch:
+                watermark.updated, watermark.object_id = batch[-1][:2]
+                watermark.save()
+            count += len(batch)
+
+
+@transaction.atomic
+def rebuild_price_rollups(batch_size=REBUILD_BATCH_SIZE):
+    """Delete every rollup and recompute them from the whole history. Return the number of rollups."""
+    PriceRollup.objects.all().delete()
+    last = (
+        PriceHistory.objects.filter(updated__lte=visible_before())
+        .order_by("updated", "id")
+        .values_list("updated", "id")
+        .last()
+    )
+    Watermark.objects.update_or_create(
+        name=PRICE_ROLLUPS_WATERMARK,
+        defaults={"updated": last[0] if last else None, "object_id": last[1] if last else None},
+    )
+
+    count = 0
+    archived = read_archived()
+    for scope, model in ((PriceRollup.VARIANT, Variant), (PriceRollup.MOBILE, Mobile)):
+        object_ids = list(model.objects.order_by("pk").values_list("pk", flat=True))
+        for index in range(0, len(object_ids), batch_size):
+            batch = object_ids[index : index + batch_size]
+            prices = PriceHistory.objects.filter(**{f"{SCOPE_LOOKUPS[scope]}__in": batch})
+            intervals = get_archived_intervals(scope, batch, prices, archived)
+            for period in TRUNCATIONS:
+                rollups = compute_rollups(scope, period, prices, archived=intervals)
+                PriceRollup.objects.bulk_create(rollups)
+                count += len(rollups)
+
+    return count
@@ -0,0 +1,182 @@
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+
+from mobiles.managers import VARIANT_CATALOG_ORDERING
+from mobiles.models import Brand, Mobile, Nationality, Variant
+
+# The searched column of each model.
+SEARCH_COLUMNS = {
+    Nationality: "name",
+    Brand: "name",
+    Mobile: "model",
+    Variant: "color",
+}
+
+# The paths from a variant to the searched models: the country of a mobile is a nationality as well.
+VARIANT_PATHS = {
+    Nationality: ("mobile__brand__nationality", "mobile__country"),
+    Brand: ("mobile__brand",),
+    Mobile: ("mobile",),
+    Variant: (None,),
+}
+
+# The text search configuration of the full-text indexes, without stemming or stop words, as names are not prose.
+SEARCH_CONFIG = "simple"
+
+MIN_INDEXED_LENGTH = 3
+
+SEARCH_TRIGGER_OPERATIONS = ("insert", "delete", "update")
+
+
+def search_table(model):
+    """Return the name of the FTS5 table over the searched column of ``model`` (SQLite)."""
+    return f"{model._meta.db_table}_search"
+
+
+def join(path, name):
+    return name if path is None else f"{path}__{name}"
+
+
+def create_search_triggers(cursor, model, column):
+    """Create the SQLite triggers keeping the FTS5 table of ``model`` up to date with its searched ``column``."""
+    table, search = model._meta.db_table, search_table(model)
+    cursor.execute(
+        f"CREATE TRIGGER {search}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {search}(rowid, {column}) VALUES (new.id, new.{column}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER {search}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {search}({search}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END"
+    )
+    cursor.execute(
+        f"CREATE TRIGGER {search}_update AFTER UPDATE OF {column} ON {table} BEGIN "
+        f"INSERT INTO {search}({search}, rowid, {column}) VALUES ('delete', old.id, old.{column}); "
+        f"INSERT INTO {search}(rowid, {column}) VALUES (new.id, new.{column}); END"
+    )
+
+
+def drop_search_triggers(cursor, model):
+    for operation in SEARCH_TRIGGER_OPERATIONS:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {search_table(model)}_{operation}")
+
+
+def create_search_index(connection):
+    """Create the indexes of the searched columns, or recreate them."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for model, column in SEARCH_COLUMNS.items():
+                table = model._meta.db_table
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_trgm_idx ON {table} USING gin ({column} gin_trgm_ops)"
+                )
+                cursor.execute(
+                    f"CREATE INDEX IF NOT EXISTS {table}_{column}_fts_idx ON {table} "
+                    f"USING gin (to_tsvector('{SEARCH_CONFIG}'::regconfig, COALESCE({column}, '')))"
+                )
+
+        elif connection.vendor == "sqlite":
+            drop_search_index(connection)
+            for model, column in SEARCH_COLUMNS.items():
+                table, search = model._meta.db_table, search_table(model)
+                # An external content table: only the index is stored, the text is read from the table.
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {search} USING fts5({column}, content='{table}', content_rowid='id', "
+                    "tokenize='trigram')"
+                )
+                cursor.execute(f"INSERT INTO {search}({search}) VALUES ('rebuild')")
+                create_search_triggers(cursor, model, column)
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        for model, column in SEARCH_COLUMNS.items():
+            table, search = model._meta.db_table, search_table(model)
+            if connection.vendor == "postgresql":
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_{column}_trgm_idx")
+                cursor.execute(f"DROP INDEX IF EXISTS {table}_{column}_fts_idx")
+            elif connection.vendor == "sqlite":
+                drop_search_triggers(cursor, model)
+                cursor.execute(f"DROP TABLE IF EXISTS {search}")
+
+
+def restore_search_index(connection):
+    """Recreate the SQLite search triggers dropped by a migration and rebuild the search tables."""
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        names = {name for (name,) in cursor.fetchall()}
+        for model, column in SEARCH_COLUMNS.items():
+            search = search_table(model)
+            triggers = {f"{search}_{operation}" for operation in SEARCH_TRIGGER_OPERATIONS}
+            if search not in names or triggers <= names:
+                continue
+
+            drop_search_triggers(cursor, model)
+            cursor.execute(f"INSERT INTO {search}({search}) VALUES ('rebuild')")
+            create_search_triggers(cursor, model, column)
+
+
+def match_ids(model, word):
+    """Return the ids of the ``model`` objects whose searched column matches ``word``, as a subquery."""
+    column = SEARCH_COLUMNS[model]
+    objects = model._base_manager.all()
+    if len(word) < MIN_INDEXED_LENGTH:
+        return objects.filter(**{f"{column}__icontains": word}).values("pk")
+
+    if connection.vendor == "postgresql":
+        # Imported here, as importing django.contrib.postgres requires psycopg.
+        from django.contrib.postgres.lookups import TrigramWordSimilar
+        from django.contrib.postgres.search import SearchQuery, SearchVector
+
+        return (
+            objects.annotate(search_vector=SearchVector(column, config=SEARCH_CONFIG))
+            .filter(
+                Q(TrigramWordSimilar(F(column), word))
+                | Q(search_vector=SearchQuery(word, config=SEARCH_CONFIG, search_type="plain"))
+            )
+            .values("pk")
+        )
+
+    if connection.vendor == "sqlite":
+        search = connection.ops.quote_name(search_table(model))
+        # A phrase, so the operators of the FTS5 query syntax are matched literally.
+        phrase = '"' + word.replace('"', '""') + '"'
+        return RawSQL(f"SELECT rowid FROM {search} WHERE {search} MATCH %s", [phrase])
+
+    return objects.filter(**{f"{column}__icontains": word}).values("pk")
+
+
+def search_objects(queryset, query):
+    """Filter ``queryset`` of one of the searched models on its own searched column, by every word of ``query``."""
+    for word in query.split():
+        queryset = queryset.filter(pk__in=match_ids(queryset.model, word))
+    return queryset
+
+
+def search_variants(query, variants=None):
+    """Return ``variants`` (by default all of them) matching each word of ``query``."""
+    variants = Variant.objects.all() if variants is None else variants
+    for word in query.split():
+        condition = Q()
+        for model, paths in VARIANT_PATHS.items():
+            ids = match_ids(model, word)
+            for path in paths:
+                condition |= Q(**{f"{join(path, 'id')}__in": ids})
+        variants = variants.filter(condition)
+
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramWordSimilarity
+        from django.db.models.functions import Greatest
+
+        similarities = [
+            TrigramWordSimilarity(query, join(path, SEARCH_COLUMNS[model]))
+            for model, paths in VARIANT_PATHS.items()
+            for path in paths
+        ]
+        return variants.annotate(similarity=Greatest(*similarities)).order_by("-similarity", *VARIANT_CATALOG_ORDERING)
+
+    return variants.order_by(*VARIANT_CATALOG_ORDERING)
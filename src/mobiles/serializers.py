@@ -1,9 +1,87 @@
+from django.db import models
 from rest_framework import serializers
 
-from mobiles.models import Brand, Mobile, PriceHistory, Variant
+from mobiles.compaction import expand_prices
+from mobiles.models import Brand, Mobile, PriceHistory, PriceRollup, Variant
 
 
-class PriceHistorySerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Keep only the nested relations selected by ``include`` and the fields selected by ``fields``."""
+
+    def __init__(self, *args, fields=None, include=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if include is not None:
+            self.include_relations(include)
+        if fields is not None:
+            self.select_fields(fields)
+
+    def include_relations(self, include):
+        relations = {name for name, field in self.fields.items() if isinstance(field, serializers.ListSerializer)}
+        unknown = set(include) - relations
+        if unknown:
+            raise ValueError(f"Unknown relations: {', '.join(sorted(unknown))}")
+
+        for name in relations:
+            child = self.fields[name].child
+            if name not in include:
+                self.fields.pop(name)
+            elif isinstance(child, SparseFieldsMixin):
+                child.include_relations(include[name] or {})
+
+    def select_fields(self, fields):
+        unknown = set(fields) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+
+        for name, nested_fields in fields.items():
+            if nested_fields is None:
+                continue
+
+            child = getattr(self.fields[name], "child", None)
+            if not isinstance(child, SparseFieldsMixin):
+                raise ValueError(f"Field '{name}' has no nested fields")
+            child.select_fields(nested_fields)
+
+
+class PriceHistoryListSerializer(serializers.ListSerializer):
+    """Expand the compacted prices into one price per day, like before the compaction."""
+
+    def to_representation(self, data):
+        prices = data.all() if isinstance(data, models.manager.BaseManager) else data
+        archived = self.context.get("archived")
+        # The related manager of the prices of a variant.
+        if archived is not None and hasattr(data, "instance"):
+            prices = archived.merge(data.instance, prices)
+        items = [
+            (price.variant_id, getattr(price, "newest_rank", None), price.date, price.last_date(), price)
+            for price in prices
+        ]
+        days = expand_prices(
+            items,
+            price_from=self.context.get("price_from"),
+            price_to=self.context.get("price_to"),
+            count=self.context.get("prices"),
+        )
+
+        result = []
+        representations = {}
+        for day, price in days:
+            if id(price) not in representations:
+                representations[id(price)] = self.child.to_representation(price)
+            item = dict(representations[id(price)])
+            if "date" in item:
+                item["date"] = day.strftime("%Y-%m-%d")
+            # The other days of an interval are not stored prices, and have no id of their own.
+            if "id" in item and day != price.date:
+                item["id"] = None
+            result.append(item)
+        return result
+
+
+class PriceHistorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     variant = serializers.CharField(source="variant.color")
     status = serializers.CharField(source="get_status_display")
     date = serializers.CharField(source="formatted_date")
@@ -18,10 +96,47 @@ class PriceHistorySerializer(serializers.ModelSerializer):
             "date",
         )
         read_only_fields = ("date",)
+        list_serializer_class = PriceHistoryListSerializer
+        # Columns of the fields whose source is a method.
+        columns = {
+            "status": "status",
+            "date": "date",
+        }
+        # Columns read whatever the selected fields, to expand the compacted prices and to merge the archived ones.
+        required_columns = ("date", "valid_to", "created")
+
+
+class PriceHistoryIngestSerializer(serializers.ModelSerializer):
+    # A plain id, the variants of a whole batch are checked with one query instead of one per row.
+    variant = serializers.IntegerField()
+
+    class Meta:
+        model = PriceHistory
+        fields = (
+            "variant",
+            "price",
+            "status",
+            "date",
+        )
+
+
+class PriceRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PriceRollup
+        fields = (
+            "start",
+            "min_price",
+            "max_price",
+            "avg_price",
+            "last_price",
+            "count",
+        )
 
 
-class VariantSerializer(serializers.ModelSerializer):
+class VariantSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     mobile = serializers.CharField(source="mobile.model")
+    current_status = serializers.CharField(source="get_current_status_display", read_only=True)
+    price_date = serializers.CharField(source="formatted_price_date", read_only=True)
     prices = PriceHistorySerializer(many=True, read_only=True)
 
     class Meta:
@@ -31,6 +146,9 @@ class VariantSerializer(serializers.ModelSerializer):
             "mobile",
             "color",
             "size",
+            "current_price",
+            "current_status",
+            "price_date",
             "prices",
             "image",
         )
@@ -38,9 +156,39 @@ class VariantSerializer(serializers.ModelSerializer):
             "updated",
             "created",
         )
+        # Columns of the fields whose source is a method.
+        columns = {
+            "current_status": "current_status",
+            "price_date": "price_date",
+        }
+
+
+class VariantSearchSerializer(serializers.ModelSerializer):
+    brand = serializers.CharField(source="mobile.brand.name")
+    nationality = serializers.CharField(source="mobile.brand.nationality.name")
+    model = serializers.CharField(source="mobile.model")
+    country = serializers.CharField(source="mobile.country.name")
+    current_status = serializers.CharField(source="get_current_status_display", read_only=True)
+    price_date = serializers.CharField(source="formatted_price_date", read_only=True)
+
+    class Meta:
+        model = Variant
+        fields = (
+            "id",
+            "brand",
+            "nationality",
+            "model",
+            "country",
+            "color",
+            "size",
+            "current_price",
+            "current_status",
+            "price_date",
+            "image",
+        )
 
 
-class MobileSerializer(serializers.ModelSerializer):
+class MobileSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     brand = serializers.CharField(source="brand.name")
     country = serializers.CharField(source="country.name")
     variants = VariantSerializer(many=True, read_only=True)
@@ -91,7 +239,7 @@ class MobileSerializer(serializers.ModelSerializer):
         return result
 
 
-class BrandSerializer(serializers.ModelSerializer):
+class BrandSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     name = serializers.CharField()
     mobiles = MobileSerializer(many=True, read_only=True)
     nationality = serializers.CharField(source="nationality.name")
@@ -1,7 +1,20 @@
-from django.db.models.signals import post_delete, pre_save
-from django.dispatch import receiver
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import Signal, receiver
 
-from mobiles.models import Variant
+from mobiles.cache import bump_catalog_version, bump_price_feed_version
+from mobiles.catalog import insert_catalog_rows, refresh_catalog_rows
+from mobiles.models import Brand, CatalogRow, ChangeLog, Mobile, Nationality, PriceHistory, Tombstone, Variant
+from mobiles.rollups import mark_moved_variant_rollups_stale, mark_rollups_stale
+from mobiles.search import restore_search_index
+
+# Sent with ``instances`` after prices are inserted in bulk, which bypasses ``post_save``. Receivers run inside the
+# transaction of the insert.
+prices_bulk_created = Signal()
+# Sent with ``instances`` after the ``valid_to`` of prices is extended in bulk, and the ids of the ``merged`` prices
+# deleted because their days are now covered by ``instances``, see ``mobiles.compaction``. Receivers run inside the
+# transaction of the update.
+prices_bulk_extended = Signal()
 
 
 @receiver(post_delete, sender=Variant)
@@ -22,6 +35,165 @@ def auto_delete_image_on_change(sender, instance: Variant, **kwargs):
     new_file = instance.image
     if not old_file == new_file:
         try:
-            old_file.delete()
+            old_file.delete(save=False)
         except Exception:
             pass
+
+
+@receiver([post_save, post_delete], sender=Nationality)
+@receiver([post_save, post_delete], sender=Brand)
+@receiver([post_save, post_delete], sender=Mobile)
+@receiver([post_save, post_delete], sender=Variant)
+@receiver([post_save, post_delete, prices_bulk_created, prices_bulk_extended], sender=PriceHistory)
+def invalidate_catalog_cache(sender, **kwargs):
+    # Bump now so reads inside this transaction miss the cache, and again after commit so responses cached by
+    # concurrent requests from the not yet committed state are not served either.
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_delete, sender=Nationality)
+@receiver(post_delete, sender=Brand)
+@receiver(post_delete, sender=Mobile)
+@receiver(post_delete, sender=Variant)
+@receiver(post_delete, sender=PriceHistory)
+def create_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+@receiver(prices_bulk_extended, sender=PriceHistory)
+def create_merged_tombstones(sender, merged, **kwargs):
+    Tombstone.objects.bulk_create(Tombstone(model=sender._meta.model_name, object_id=pk) for pk in merged)
+
+
+@receiver(post_save, sender=Nationality)
+@receiver(post_save, sender=Brand)
+@receiver(post_save, sender=Mobile)
+@receiver(post_save, sender=Variant)
+@receiver(post_save, sender=PriceHistory)
+def log_save(sender, instance, created, **kwargs):
+    op = ChangeLog.CREATE if created else ChangeLog.UPDATE
+    ChangeLog.objects.create(model=sender._meta.model_name, object_id=instance.pk, op=op)
+
+
+@receiver(post_delete, sender=Nationality)
+@receiver(post_delete, sender=Brand)
+@receiver(post_delete, sender=Mobile)
+@receiver(post_delete, sender=Variant)
+@receiver(post_delete, sender=PriceHistory)
+def log_delete(sender, instance, **kwargs):
+    ChangeLog.objects.create(model=sender._meta.model_name, object_id=instance.pk, op=ChangeLog.DELETE)
+
+
+@receiver(prices_bulk_created, sender=PriceHistory)
+def log_bulk_create(sender, instances, **kwargs):
+    ChangeLog.objects.bulk_create(
+        ChangeLog(model=sender._meta.model_name, object_id=instance.pk, op=ChangeLog.CREATE) for instance in instances
+    )
+
+
+@receiver(prices_bulk_extended, sender=PriceHistory)
+def log_bulk_extend(sender, instances, merged, **kwargs):
+    model = sender._meta.model_name
+    ChangeLog.objects.bulk_create([
+        *(ChangeLog(model=model, object_id=instance.pk, op=ChangeLog.UPDATE) for instance in instances),
+        *(ChangeLog(model=model, object_id=pk, op=ChangeLog.DELETE) for pk in merged),
+    ])
+
+
+@receiver(post_save, sender=PriceHistory)
+@receiver(prices_bulk_created, sender=PriceHistory)
+def notify_price_feed(sender, created=True, **kwargs):
+    # After commit only, so the woken up feeds find the new prices.
+    if created:
+        transaction.on_commit(bump_price_feed_version)
+
+
+@receiver([post_save, post_delete], sender=PriceHistory)
+def refresh_current_price(sender, instance, **kwargs):
+    variant_ids = {instance.variant_id, getattr(instance, "loaded_variant_id", None)} - {None}
+    Variant.objects.filter(pk__in=variant_ids).refresh_current_prices()
+
+
+@receiver(prices_bulk_created, sender=PriceHistory)
+@receiver(prices_bulk_extended, sender=PriceHistory)
+def refresh_bulk_current_prices(sender, instances, **kwargs):
+    Variant.objects.filter(pk__in={instance.variant_id for instance in instances}).refresh_current_prices()
+
+
+@receiver(post_save, sender=PriceHistory)
+def save_catalog_row(sender, instance, created, **kwargs):
+    if created:
+        insert_catalog_rows(PriceHistory.objects.filter(pk=instance.pk))
+    else:
+        refresh_catalog_rows("id", instance.pk)
+
+
+@receiver(post_delete, sender=PriceHistory)
+def delete_catalog_row(sender, instance, **kwargs):
+    CatalogRow.objects.filter(pk=instance.pk).delete()
+
+
+@receiver(prices_bulk_created, sender=PriceHistory)
+def insert_bulk_catalog_rows(sender, instances, **kwargs):
+    insert_catalog_rows(PriceHistory.objects.filter(pk__in=[instance.pk for instance in instances]))
+
+
+@receiver(prices_bulk_extended, sender=PriceHistory)
+def extend_bulk_catalog_rows(sender, instances, merged, **kwargs):
+    pks = [instance.pk for instance in instances]
+    CatalogRow.objects.filter(pk__in=[*pks, *merged]).delete()
+    insert_catalog_rows(PriceHistory.objects.filter(pk__in=pks))
+
+
+# The catalog row columns that refer to the instances of each model.
+CATALOG_ROW_REFERENCES = {
+    Nationality: ("nationality_id", "country_id"),
+    Brand: ("brand_id",),
+    Mobile: ("mobile_id",),
+    Variant: ("variant_id",),
+}
+
+
+@receiver(post_save, sender=Nationality)
+@receiver(post_save, sender=Brand)
+@receiver(post_save, sender=Mobile)
+@receiver(post_save, sender=Variant)
+def refresh_catalog_rows_on_save(sender, instance, created, **kwargs):
+    # New objects have no prices yet.
+    if created:
+        return
+
+    for column in CATALOG_ROW_REFERENCES[sender]:
+        refresh_catalog_rows(column, instance.pk)
+
+
+@receiver(post_save, sender=PriceHistory)
+def mark_moved_price_rollups_stale(sender, instance, created, **kwargs):
+    # The new buckets are found by the watermark of the rollups, the ones the price left are not.
+    variant_id, first_day = getattr(instance, "loaded_variant_id", None), getattr(instance, "loaded_date", None)
+    last_day = getattr(instance, "loaded_valid_to", None) or first_day
+    if created or None in (variant_id, first_day):
+        return
+    if (variant_id, first_day, last_day) != (instance.variant_id, instance.date, instance.last_date()):
+        mark_rollups_stale(variant_id, first_day, last_day)
+
+
+@receiver(post_save, sender=Variant)
+def mark_moved_variant_rollups_stale_on_save(sender, instance, created, **kwargs):
+    # The prices of the variant keep their ``updated``, so the watermark of the rollups finds neither mobile.
+    mobile_id = getattr(instance, "loaded_mobile_id", None)
+    if not created and mobile_id is not None and mobile_id != instance.mobile_id:
+        mark_moved_variant_rollups_stale(instance.pk, mobile_id, instance.mobile_id)
+
+
+@receiver(post_delete, sender=PriceHistory)
+def mark_deleted_price_rollups_stale(sender, instance, **kwargs):
+    mark_rollups_stale(instance.variant_id, instance.date, instance.last_date())
+
+
+@receiver(post_migrate)
+def restore_search_index_on_migrate(sender, using, **kwargs):
+    # Sent once per app, the mobiles one is enough.
+    if sender.name == "mobiles":
+        restore_search_index(connections[using])
@@ -69,3 +69,36 @@ class AllMobilesViewTestCase(TestCase):
         self.assertContains(response, self.variants[10].image.name)
         self.assertNotContains(response, self.brands[9].name)
         self.assertNotContains(response, self.mobiles[9].model)
+
+    def test_all_mobiles_view_fetches_only_current_page(self):
+        # count and current page of variants, with their current price
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("mobiles:all-mobiles"), {"page": 2})
+
+        self.assertEqual(len(response.context["page_obj"].object_list), 5)
+
+    def get_colors(self, response):
+        return [variant.color for variant in response.context["page_obj"].object_list]
+
+    def test_all_mobiles_view_sort_by_price(self):
+        response = self.client.get(reverse("mobiles:all-mobiles"), {"sort": "-price"})
+
+        self.assertEqual(self.get_colors(response), [f"Color {i}" for i in range(14, 4, -1)])
+
+    def test_all_mobiles_view_filter_by_price(self):
+        response = self.client.get(
+            reverse("mobiles:all-mobiles"), {"min_price": 203, "max_price": 205, "sort": "price"}
+        )
+
+        self.assertEqual(self.get_colors(response), ["Color 3", "Color 4", "Color 5"])
+
+    def test_all_mobiles_view_pagination_keeps_filters(self):
+        response = self.client.get(reverse("mobiles:all-mobiles"), {"sort": "price"})
+
+        self.assertContains(response, "?sort=price&page=2")
+
+    def test_all_mobiles_view_ignores_invalid_filters(self):
+        response = self.client.get(reverse("mobiles:all-mobiles"), {"min_price": "cheap", "sort": "color"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["page_obj"].object_list), 10)
@@ -0,0 +1,201 @@
+from datetime import date
+from decimal import Decimal
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from mobiles.archive import archive_path, archive_prices, decode_archive_file, read_archived_prices
+from mobiles.models import (
+    Brand,
+    CatalogRow,
+    Mobile,
+    Nationality,
+    PriceArchive,
+    PriceHistory,
+    PriceRollup,
+    Variant,
+)
+from mobiles.rollups import rebuild_price_rollups, update_price_rollups
+
+
+class ArchiveTestMixin:
+    def setUp(self):
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        archive_root = override_settings(PRICE_ARCHIVE_ROOT=directory.name)
+        archive_root.enable()
+        self.addCleanup(archive_root.disable)
+
+        nationality = Nationality.objects.create(name="Korea")
+        self.brand = Brand.objects.create(name="Brand", nationality=nationality)
+        self.mobile = Mobile.objects.create(brand=self.brand, model="Model", country=nationality)
+        self.red = Variant.objects.create(mobile=self.mobile, color="Red", size=5.5)
+        self.blue = Variant.objects.create(mobile=self.mobile, color="Blue", size=6.0)
+
+        self.red_prices = [
+            PriceHistory.objects.create(variant=self.red, price=1000, date=date(2024, 1, 5)),
+            PriceHistory.objects.create(variant=self.red, price=1100, date=date(2024, 1, 20)),
+            PriceHistory.objects.create(variant=self.red, price=1200, date=date(2024, 2, 10)),
+            PriceHistory.objects.create(variant=self.red, price=1300, date=date(2024, 3, 15)),
+        ]
+        self.blue_prices = [
+            PriceHistory.objects.create(variant=self.blue, price=900, date=date(2024, 1, 10)),
+            PriceHistory.objects.create(variant=self.blue, price=950, date=date(2024, 2, 1)),
+        ]
+
+
+class ArchivePricesTestCase(ArchiveTestMixin, TestCase):
+    def test_archive(self):
+        self.assertEqual(archive_prices(date(2024, 3, 1)), (4, [date(2024, 1, 1), date(2024, 2, 1)]))
+
+        # The newest price of each variant stays, even when it is older than the cutoff.
+        remaining = [self.red_prices[3].pk, self.blue_prices[1].pk]
+        self.assertListEqual(list(PriceHistory.objects.order_by("id").values_list("id", flat=True)), remaining)
+        self.assertListEqual(list(CatalogRow.objects.order_by("id").values_list("id", flat=True)), remaining)
+        self.assertListEqual(
+            list(PriceArchive.objects.values_list("month", "count", "first_date", "last_date")),
+            [
+                (date(2024, 1, 1), 3, date(2024, 1, 5), date(2024, 1, 20)),
+                (date(2024, 2, 1), 1, date(2024, 2, 10), date(2024, 2, 10)),
+            ],
+        )
+        for archive in PriceArchive.objects.all():
+            self.assertTrue(archive_path(archive).exists())
+
+        self.red.refresh_from_db()
+        self.assertEqual((self.red.current_price, self.red.price_date), (1300, date(2024, 3, 15)))
+
+    def test_rollups_of_archived_months(self):
+        update_price_rollups()
+        archive_prices(date(2024, 3, 1))
+        # A backfilled price recomputes the rollups of its month, whose other prices are archived.
+        PriceHistory.objects.create(variant=self.red, price=1050, date=date(2024, 1, 25))
+
+        def get_rollups():
+            return list(
+                PriceRollup.objects.filter(period=PriceRollup.MONTH, start=date(2024, 1, 1))
+                .exclude(scope=PriceRollup.VARIANT, object_id=self.blue.pk)
+                .order_by("scope")
+                .values_list("scope", "min_price", "max_price", "avg_price", "last_price", "count")
+            )
+
+        update_price_rollups()
+        rollups = [
+            (PriceRollup.MOBILE, 900, 1100, Decimal("1012.50"), 1050, 4),
+            (PriceRollup.VARIANT, 1000, 1100, Decimal("1050.00"), 1050, 3),
+        ]
+        self.assertListEqual(get_rollups(), rollups)
+
+        rebuild_price_rollups()
+        self.assertListEqual(get_rollups(), rollups)
+
+    def test_read(self):
+        archive_prices(date(2024, 3, 1))
+
+        archived = read_archived_prices(date(2024, 1, 15), date(2024, 2, 28))
+
+        fields = ("id", "variant_id", "price", "status", "date", "valid_to", "created", "updated")
+        self.assertListEqual(
+            [tuple(getattr(price, name) for name in fields) for price in archived],
+            [tuple(getattr(price, name) for name in fields) for price in (self.red_prices[1], self.red_prices[2])],
+        )
+        self.assertTrue(all(price.archived for price in archived))
+
+    def test_read_cached(self):
+        archive_prices(date(2024, 3, 1))
+        decode_archive_file.cache_clear()
+
+        read_archived_prices()
+        archived = read_archived_prices()
+
+        self.assertEqual(decode_archive_file.cache_info().misses, 2)
+        self.assertEqual(decode_archive_file.cache_info().hits, 2)
+        # Each read gets its own instances.
+        self.assertIsNot(read_archived_prices()[0], archived[0])
+
+    def test_archive_again(self):
+        archive_prices(date(2024, 1, 15))
+        PriceHistory.objects.create(variant=self.red, price=1400, date=date(2024, 4, 1))
+
+        self.assertEqual(archive_prices(date(2024, 3, 1)), (2, [date(2024, 1, 1), date(2024, 2, 1)]))
+
+        # The prices are added to the file of their month.
+        self.assertListEqual(
+            [price.pk for price in read_archived_prices()],
+            sorted([self.red_prices[0].pk, self.blue_prices[0].pk, self.red_prices[1].pk]) + [self.red_prices[2].pk],
+        )
+        self.assertEqual(PriceArchive.objects.get(month=date(2024, 1, 1)).count, 3)
+
+    def test_nothing_to_archive(self):
+        self.assertEqual(archive_prices(date(2024, 1, 1)), (0, []))
+        self.assertFalse(PriceArchive.objects.exists())
+
+
+class ArchivedPricesViewTestCase(ArchiveTestMixin, APITestCase):
+    def test_api_date_range(self):
+        url = reverse("api:mobile-brands")
+        queries = [
+            {"brands": "Brand", "price_from": "2024-01-15"},
+            {"brands": "Brand", "price_to": "2024-02-15", "prices": "last:2"},
+            {"brands": "Brand", "price_from": "2024-01-01", "flat": 1},
+            {"brands": "Brand", "price_to": "2024-02-15", "prices": "latest", "flat": 1},
+        ]
+        expected = [self.client.get(url, query).data for query in queries]
+
+        archive_prices(date(2024, 3, 1))
+
+        for query, data in zip(queries, expected):
+            self.assertEqual(self.client.get(url, query).data, data, query)
+
+    def test_api_without_date_range(self):
+        archive_prices(date(2024, 3, 1))
+
+        response = self.client.get(reverse("api:mobile-brands"), {"brands": "Brand"})
+
+        prices = [price["id"] for variant in response.data[0]["variants"] for price in variant["prices"]]
+        self.assertListEqual(prices, [self.red_prices[3].pk, self.blue_prices[1].pk])
+
+    def test_price_list_view(self):
+        archive_prices(date(2024, 3, 1))
+
+        response = self.client.get(reverse("mobiles:price-history-list"), {"date_from": "2024-01-15"})
+
+        self.assertListEqual(
+            [price.pk for price in response.context["page_obj"]],
+            [price.pk for price in (self.red_prices[1], self.red_prices[2], self.red_prices[3], self.blue_prices[1])],
+        )
+        self.assertContains(response, "Archived", count=2)
+
+        response = self.client.get(reverse("mobiles:price-history-list"))
+        self.assertEqual(len(response.context["page_obj"]), 2)
+
+    def test_price_list_view_pages(self):
+        archive_prices(date(2024, 3, 1))
+        url = reverse("mobiles:price-history-list")
+        expected = [price.pk for price in sorted(self.red_prices + self.blue_prices, key=lambda price: price.created)]
+
+        pks = []
+        params = {"date_from": "2024-01-01"}
+        with patch("mobiles.views.price_view.PRICES_PER_PAGE", 4):
+            while True:
+                response = self.client.get(url, params)
+                pks += [price.pk for price in response.context["page_obj"]]
+                if not response.context["next_cursor"]:
+                    break
+                params["cursor"] = response.context["next_cursor"]
+
+        self.assertListEqual(pks, expected)
+        self.assertEqual(response.context["start_index"], 5)
+        self.assertContains(response, "first")
+
+    def test_api_if_none_match(self):
+        url = reverse("api:mobile-brands")
+        response = self.client.get(url, {"brands": "Brand"})
+
+        archive_prices(date(2024, 3, 1))
+
+        response = self.client.get(url, {"brands": "Brand"}, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,106 @@
+from django.test import TestCase
+
+from mobiles.catalog import CATALOG_ROW_COLUMNS, rebuild_catalog_rows, refresh_catalog_rows
+from mobiles.ingest import ingest_prices
+from mobiles.models import Brand, CatalogRow, Mobile, Nationality, PriceHistory, Variant
+
+
+class CatalogRowTestCase(TestCase):
+    def setUp(self):
+        self.korea = Nationality.objects.create(name="Korea")
+        self.china = Nationality.objects.create(name="China")
+        self.brand = Brand.objects.create(name="Samsung", nationality=self.korea)
+        self.mobile = Mobile.objects.create(brand=self.brand, model="Galaxy", country=self.china)
+        self.variant = Variant.objects.create(mobile=self.mobile, color="Red", size=6.1)
+        self.price = PriceHistory.objects.create(variant=self.variant, price=1000)
+
+    def assertCatalogRowsCurrent(self):
+        """Assert that the catalog rows are the ones a rebuild from the catalog tables would write."""
+        names = [name for name, _ in CATALOG_ROW_COLUMNS]
+        expected = PriceHistory.objects.order_by("id").values_list(*(path for _, path in CATALOG_ROW_COLUMNS))
+
+        self.assertListEqual(list(CatalogRow.objects.order_by("id").values_list(*names)), list(expected))
+
+    def test_create(self):
+        PriceHistory.objects.create(variant=self.variant, price=1200, status=False)
+
+        self.assertEqual(CatalogRow.objects.count(), 2)
+        self.assertCatalogRowsCurrent()
+
+    def test_update_price(self):
+        self.price.price = 900
+        self.price.save()
+
+        self.assertEqual(CatalogRow.objects.get(pk=self.price.pk).price, 900)
+        self.assertCatalogRowsCurrent()
+
+    def test_update_variant(self):
+        self.variant.color = "Blue"
+        self.variant.save()
+
+        self.assertEqual(CatalogRow.objects.get().color, "Blue")
+        self.assertCatalogRowsCurrent()
+
+    def test_update_mobile(self):
+        other_brand = Brand.objects.create(name="LG", nationality=self.china)
+        self.mobile.brand = other_brand
+        self.mobile.model = "G8"
+        self.mobile.save()
+
+        row = CatalogRow.objects.get()
+        self.assertEqual((row.brand, row.nationality, row.model), ("LG", "China", "G8"))
+        self.assertCatalogRowsCurrent()
+
+    def test_update_brand(self):
+        self.brand.name = "Samsung Electronics"
+        self.brand.save()
+
+        self.assertEqual(CatalogRow.objects.get().brand, "Samsung Electronics")
+        self.assertCatalogRowsCurrent()
+
+    def test_update_nationality(self):
+        # Both as the nationality of the brand and as the country of the mobile.
+        self.korea.name = "South Korea"
+        self.korea.save()
+        self.china.name = "PRC"
+        self.china.save()
+
+        row = CatalogRow.objects.get()
+        self.assertEqual((row.nationality, row.country), ("South Korea", "PRC"))
+        self.assertCatalogRowsCurrent()
+
+    def test_refresh(self):
+        # A row left behind by a price deleted without signals.
+        CatalogRow.objects.create(**{
+            **CatalogRow.objects.values().get(pk=self.price.pk),
+            "id": self.price.pk + 1,
+        })
+        CatalogRow.objects.update(color="Old")
+
+        refresh_catalog_rows("variant_id", self.variant.pk)
+
+        self.assertEqual(CatalogRow.objects.get().color, "Red")
+        self.assertCatalogRowsCurrent()
+
+    def test_delete(self):
+        self.price.delete()
+        self.assertFalse(CatalogRow.objects.exists())
+
+        PriceHistory.objects.create(variant=self.variant, price=1200)
+        self.mobile.delete()
+        self.assertFalse(CatalogRow.objects.exists())
+
+    def test_bulk_create(self):
+        ingest_prices([{"variant": self.variant.pk, "price": 1100}, {"variant": self.variant.pk, "price": 1200}])
+
+        self.assertEqual(CatalogRow.objects.count(), 3)
+        self.assertCatalogRowsCurrent()
+
+    def test_rebuild(self):
+        CatalogRow.objects.all().delete()
+        PriceHistory.objects.create(variant=self.variant, price=1200)
+        # Queryset updates bypass the signals.
+        Variant.objects.update(color="Green")
+
+        self.assertEqual(rebuild_catalog_rows(batch_size=1), 2)
+        self.assertCatalogRowsCurrent()
@@ -0,0 +1,161 @@
+from datetime import timedelta
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import skipIf
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from mobiles.models import Brand, CatalogRow, ChangeLog, Mobile, Nationality, PriceHistory, PriceRollup, Variant
+
+
+class PruneChangeLogCommandTestCase(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.old_entries = ChangeLog.objects.bulk_create(
+            ChangeLog(model="brand", object_id=index, op=ChangeLog.CREATE) for index in range(3)
+        )
+        ChangeLog.objects.filter(sequence__in=[entry.sequence for entry in self.old_entries]).update(
+            created=now - timedelta(days=40)
+        )
+        self.new_entry = ChangeLog.objects.create(model="brand", object_id=3, op=ChangeLog.UPDATE)
+
+    def test_prune(self):
+        out = StringIO()
+        call_command("prune_change_log", batch_size=2, stdout=out)
+
+        self.assertQuerySetEqual(ChangeLog.objects.all(), [self.new_entry])
+        self.assertIn("Deleted 3 change log entries older than 30 days.", out.getvalue())
+
+    def test_days(self):
+        call_command("prune_change_log", days=50, stdout=StringIO())
+
+        self.assertEqual(ChangeLog.objects.count(), 4)
+
+
+class RebuildCurrentPricesCommandTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        PriceHistory.objects.create(variant=self.variant, price=1000)
+        # Queryset updates bypass the signals that maintain the current price.
+        PriceHistory.objects.update(price=1200)
+
+    def test_verify(self):
+        with self.assertRaisesMessage(CommandError, f"1 variants have a stale current price: {self.variant.pk}"):
+            call_command("rebuild_current_prices", verify=True, stdout=StringIO())
+
+    def test_rebuild(self):
+        out = StringIO()
+        call_command("rebuild_current_prices", stdout=out)
+
+        self.variant.refresh_from_db()
+        self.assertEqual(self.variant.current_price, 1200)
+        self.assertIn("Rebuilt the current price of 1 variants.", out.getvalue())
+
+        out = StringIO()
+        call_command("rebuild_current_prices", verify=True, stdout=out)
+        self.assertIn("All current prices are up to date.", out.getvalue())
+
+
+class RebuildCatalogRowsCommandTestCase(TestCase):
+    def test_rebuild(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        PriceHistory.objects.create(variant=variant, price=1000)
+        PriceHistory.objects.create(variant=variant, price=1200)
+        Brand.objects.update(name="Renamed")
+
+        out = StringIO()
+        call_command("rebuild_catalog_rows", batch_size=1, stdout=out)
+
+        self.assertListEqual(
+            list(CatalogRow.objects.values_list("brand", "price")), [("Renamed", 1000), ("Renamed", 1200)]
+        )
+        self.assertIn("Rebuilt 2 catalog rows.", out.getvalue())
+
+
+class UpdatePriceRollupsCommandTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        PriceHistory.objects.create(variant=variant, price=1000)
+
+    def test_update(self):
+        out = StringIO()
+        call_command("update_price_rollups", stdout=out)
+        call_command("update_price_rollups", stdout=out)
+
+        # Per variant and per mobile, by day, week and month.
+        self.assertEqual(PriceRollup.objects.count(), 6)
+        self.assertIn("Updated the price rollups with 1 changed prices.", out.getvalue())
+        self.assertIn("Updated the price rollups with 0 changed prices.", out.getvalue())
+
+    def test_rebuild(self):
+        call_command("update_price_rollups", stdout=StringIO())
+
+        out = StringIO()
+        call_command("update_price_rollups", rebuild=True, stdout=out)
+
+        self.assertEqual(PriceRollup.objects.count(), 6)
+        self.assertIn("Rebuilt 6 price rollups.", out.getvalue())
+
+
+class PricePartitionsCommandTestCase(TestCase):
+    @skipIf(connection.vendor == "postgresql", "The price history is partitioned on PostgreSQL.")
+    def test_not_partitioned(self):
+        out = StringIO()
+        call_command("create_price_partitions", stdout=out)
+        call_command("detach_price_partitions", "2024-01-01", stdout=out)
+
+        self.assertEqual(out.getvalue().count("The price history is not partitioned on this database."), 2)
+
+    def test_invalid_date(self):
+        with self.assertRaisesMessage(CommandError, "Invalid date: 2024-13-01"):
+            call_command("detach_price_partitions", "2024-13-01", stdout=StringIO())
+
+
+class CompactPricesCommandTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        for day in range(1, 4):
+            PriceHistory.objects.create(variant=variant, price=1000, date=timezone.now().date() - timedelta(days=day))
+
+    def test_compact(self):
+        out = StringIO()
+        call_command("compact_prices", stdout=out)
+
+        self.assertEqual(PriceHistory.objects.count(), 1)
+        self.assertIn("Merged 2 prices into 1 intervals.", out.getvalue())
+
+
+class ArchivePricesCommandTestCase(TestCase):
+    def test_archive(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        PriceHistory.objects.create(variant=variant, price=1000, date="2024-01-10")
+        PriceHistory.objects.create(variant=variant, price=1100, date="2024-02-10")
+
+        out = StringIO()
+        with TemporaryDirectory() as directory, override_settings(PRICE_ARCHIVE_ROOT=directory):
+            call_command("archive_prices", "2024-03-01", stdout=out)
+
+        self.assertEqual(PriceHistory.objects.count(), 1)
+        self.assertIn("Archived 1 prices of 1 months: 2024-01", out.getvalue())
+
+    def test_invalid_date(self):
+        with self.assertRaisesMessage(CommandError, "Invalid date: 2024-02-30"):
+            call_command("archive_prices", "2024-02-30", stdout=StringIO())
@@ -0,0 +1,222 @@
+from datetime import date
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from mobiles.compaction import compact_prices, expand_prices
+from mobiles.ingest import ingest_prices
+from mobiles.models import Brand, CatalogRow, Mobile, Nationality, PriceHistory, PriceRollup, Variant
+from mobiles.rollups import rebuild_price_rollups
+from mobiles.signals import prices_bulk_created
+
+
+class ExpandPricesTestCase(TestCase):
+    def test_expand(self):
+        prices = [
+            (1, None, date(2024, 1, 1), date(2024, 1, 3), "a"),
+            (2, None, date(2024, 1, 2), date(2024, 1, 2), "b"),
+        ]
+
+        self.assertListEqual(
+            expand_prices(prices),
+            [(date(2024, 1, 1), "a"), (date(2024, 1, 2), "a"), (date(2024, 1, 3), "a"), (date(2024, 1, 2), "b")],
+        )
+
+    def test_window(self):
+        prices = [(1, None, date(2024, 1, 1), date(2024, 1, 5), "a")]
+
+        self.assertListEqual(
+            expand_prices(prices, price_from=date(2024, 1, 2), price_to=date(2024, 1, 3)),
+            [(date(2024, 1, 2), "a"), (date(2024, 1, 3), "a")],
+        )
+        self.assertListEqual(expand_prices(prices, price_from=date(2024, 2, 1)), [])
+
+    def test_count(self):
+        prices = [
+            (1, 1, date(2024, 1, 3), date(2024, 1, 3), "new"),
+            # Same first day, but created before: ranked after the newest price.
+            (1, 2, date(2024, 1, 1), date(2024, 1, 3), "old"),
+            (2, 1, date(2024, 1, 1), date(2024, 1, 2), "b"),
+        ]
+
+        self.assertListEqual(
+            expand_prices(prices, count=2),
+            [(date(2024, 1, 3), "new"), (date(2024, 1, 3), "old"), (date(2024, 1, 1), "b"), (date(2024, 1, 2), "b")],
+        )
+
+
+class CompactionTestCase(APITestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        self.brand = Brand.objects.create(name="Brand", nationality=nationality)
+        self.mobile = Mobile.objects.create(brand=self.brand, model="Model", country=nationality)
+        self.red = Variant.objects.create(mobile=self.mobile, color="Red", size=5.5)
+        self.blue = Variant.objects.create(mobile=self.mobile, color="Blue", size=6.0)
+
+        for day in (1, 2, 3, 5, 6):
+            PriceHistory.objects.create(variant=self.red, price=1000, date=date(2024, 1, day))
+        PriceHistory.objects.create(variant=self.red, price=1100, date=date(2024, 1, 7))
+        PriceHistory.objects.create(variant=self.red, price=1100, date=date(2024, 1, 8), status=False)
+        for day in (1, 2):
+            PriceHistory.objects.create(variant=self.blue, price=900, date=date(2024, 1, day))
+
+    def get_intervals(self):
+        return list(
+            PriceHistory.objects.select_related(None)
+            .order_by("variant_id", "date")
+            .values_list("variant_id", "price", "date", "valid_to")
+        )
+
+    def test_compact(self):
+        self.assertEqual(compact_prices(batch_size=1), (4, 3))
+
+        self.assertListEqual(
+            self.get_intervals(),
+            [
+                (self.red.pk, 1000, date(2024, 1, 1), date(2024, 1, 3)),
+                # A missing day breaks the run.
+                (self.red.pk, 1000, date(2024, 1, 5), date(2024, 1, 6)),
+                (self.red.pk, 1100, date(2024, 1, 7), None),
+                # So does a change of status.
+                (self.red.pk, 1100, date(2024, 1, 8), None),
+                (self.blue.pk, 900, date(2024, 1, 1), date(2024, 1, 2)),
+            ],
+        )
+        self.assertEqual(CatalogRow.objects.count(), 5)
+        self.assertEqual(compact_prices(), (0, 0))
+
+    def test_split_at_month(self):
+        for day in (date(2024, 1, 30), date(2024, 1, 31), date(2024, 2, 1), date(2024, 2, 2)):
+            PriceHistory.objects.create(variant=self.blue, price=900, date=day)
+
+        compact_prices()
+
+        self.assertListEqual(
+            list(PriceHistory.objects.filter(variant=self.blue).order_by("date").values_list("date", "valid_to")),
+            [
+                (date(2024, 1, 1), date(2024, 1, 2)),
+                (date(2024, 1, 30), date(2024, 1, 31)),
+                (date(2024, 2, 1), date(2024, 2, 2)),
+            ],
+        )
+
+    def test_same_output(self):
+        url = reverse("api:mobile-brands")
+        queries = [
+            {"brands": "Brand"},
+            {"brands": "Brand", "flat": 1},
+            {"brands": "Brand", "prices": "last:3"},
+            {"brands": "Brand", "prices": "latest", "flat": 1},
+            {"brands": "Brand", "price_from": "2024-01-02", "price_to": "2024-01-05"},
+            {"brands": "Brand", "price_from": "2024-01-02", "prices": "last:2", "flat": 1},
+        ]
+        expected = [self.client.get(url, query).data for query in queries]
+
+        compact_prices()
+
+        for query, data in zip(queries, expected):
+            response = self.client.get(url, query)
+            # The merged days have no id, the first day of an interval keeps the one of its price.
+            if "flat" not in query:
+                for variant, expected_variant in zip(response.data[0]["variants"], data[0]["variants"]):
+                    for price, expected_price in zip(variant["prices"], expected_variant["prices"]):
+                        self.assertIn(price.pop("id"), (expected_price.pop("id"), None))
+            self.assertEqual(response.data, data, query)
+
+    def test_merged_day_ids(self):
+        first_days = list(
+            PriceHistory.objects.filter(variant=self.blue, date=date(2024, 1, 1)).values_list("id", flat=True)
+        )
+        compact_prices()
+
+        response = self.client.get(reverse("api:mobile-brands"), {"brands": "Brand"})
+
+        prices = response.data[0]["variants"][1]["prices"]
+        self.assertListEqual([price["id"] for price in prices], [*first_days, None])
+
+    def test_same_rollups(self):
+        rebuild_price_rollups()
+        columns = (
+            "scope",
+            "object_id",
+            "period",
+            "start",
+            "min_price",
+            "max_price",
+            "avg_price",
+            "last_price",
+            "count",
+        )
+        expected = list(PriceRollup.objects.order_by(*columns[:4]).values_list(*columns))
+
+        compact_prices()
+        rebuild_price_rollups()
+
+        self.assertListEqual(list(PriceRollup.objects.order_by(*columns[:4]).values_list(*columns)), expected)
+
+    def test_move_interval(self):
+        compact_prices()
+        price = PriceHistory.objects.get(variant=self.blue)
+
+        price.date = date(2024, 1, 10)
+        price.save()
+
+        price.refresh_from_db()
+        self.assertEqual(price.valid_to, date(2024, 1, 11))
+        self.blue.refresh_from_db()
+        self.assertEqual(self.blue.price_date, date(2024, 1, 11))
+
+
+class IngestCompactionTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2024, 1, 1))
+
+    @override_settings(COMPACT_INGESTED_PRICES=True)
+    def test_extends_open_interval(self):
+        rows = [
+            {"variant": self.variant.pk, "price": 1000, "date": "2024-01-02"},
+            {"variant": self.variant.pk, "price": 1000, "date": "2024-01-03"},
+            {"variant": self.variant.pk, "price": 1200, "date": "2024-01-04"},
+            {"variant": self.variant.pk, "price": 1200, "date": "2024-01-05"},
+        ]
+        created = []
+
+        def receiver(sender, instances, **kwargs):
+            created.extend(price.price for price in instances)
+
+        prices_bulk_created.connect(receiver, sender=PriceHistory)
+        try:
+            self.assertEqual(ingest_prices(rows), (4, []))
+        finally:
+            prices_bulk_created.disconnect(receiver, sender=PriceHistory)
+
+        self.assertListEqual(created, [1200])
+        self.assertListEqual(
+            list(PriceHistory.objects.order_by("date").values_list("price", "date", "valid_to")),
+            [(1000, date(2024, 1, 1), date(2024, 1, 3)), (1200, date(2024, 1, 4), date(2024, 1, 5))],
+        )
+        self.variant.refresh_from_db()
+        self.assertEqual((self.variant.current_price, self.variant.price_date), (1200, date(2024, 1, 5)))
+
+    @override_settings(COMPACT_INGESTED_PRICES=True)
+    def test_new_month(self):
+        rows = [{"variant": self.variant.pk, "price": 1000, "date": f"2024-01-{day:02}"} for day in range(2, 32)] + [
+            {"variant": self.variant.pk, "price": 1000, "date": "2024-02-01"}
+        ]
+
+        self.assertEqual(ingest_prices(rows), (31, []))
+
+        self.assertListEqual(
+            list(PriceHistory.objects.order_by("date").values_list("date", "valid_to")),
+            [(date(2024, 1, 1), date(2024, 1, 31)), (date(2024, 2, 1), None)],
+        )
+
+    def test_disabled(self):
+        ingest_prices([{"variant": self.variant.pk, "price": 1000, "date": "2024-01-02"}])
+
+        self.assertEqual(PriceHistory.objects.count(), 2)
@@ -0,0 +1,69 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from mobiles.cache import get_catalog_modified
+from mobiles.models import Brand, Nationality
+
+
+class ConditionalListViewTestCase(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.nationality = Nationality.objects.create(name="Test Nationality")
+        self.brand = Brand.objects.create(name="Test Brand", nationality=self.nationality)
+
+    def test_validators(self):
+        response = self.client.get(reverse("mobiles:brand-list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+        self.assertEqual(response["Last-Modified"], http_date(get_catalog_modified().timestamp()))
+
+    def test_etag_per_page(self):
+        response = self.client.get(reverse("mobiles:brand-list"))
+        second_page_response = self.client.get(reverse("mobiles:brand-list"), {"page": 2})
+
+        self.assertNotEqual(response["ETag"], second_page_response["ETag"])
+
+    def test_if_none_match(self):
+        response = self.client.get(reverse("mobiles:brand-list"))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("mobiles:brand-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_modified_since(self):
+        response = self.client.get(reverse("mobiles:nationality-list"))
+        response = self.client.get(
+            reverse("mobiles:nationality-list"), HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_none_match_after_change(self):
+        response = self.client.get(reverse("mobiles:brand-list"))
+        self.nationality.name = "Updated Nationality"
+        self.nationality.save()
+
+        response = self.client.get(reverse("mobiles:brand-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Updated Nationality")
+
+    def test_if_none_match_after_delete(self):
+        brand = Brand.objects.create(name="Other Brand", nationality=self.nationality)
+        response = self.client.get(reverse("mobiles:brand-list"))
+        brand.delete()
+
+        response = self.client.get(reverse("mobiles:brand-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "Other Brand")
+
+    def test_if_none_match_unrelated_view(self):
+        response = self.client.get(reverse("mobiles:brand-list"))
+
+        response = self.client.get(reverse("mobiles:mobile-list"), HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,63 @@
+from django.test import TestCase
+
+from mobiles.facets import count_facets, filter_facets, get_size_buckets
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
+
+class FacetsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        korea = Nationality.objects.create(name="Korea")
+        usa = Nationality.objects.create(name="USA")
+        china = Nationality.objects.create(name="China")
+        samsung = Brand.objects.create(name="Samsung", nationality=korea)
+        apple = Brand.objects.create(name="Apple", nationality=usa)
+        galaxy = Mobile.objects.create(brand=samsung, model="Galaxy S24", country=korea)
+        iphone = Mobile.objects.create(brand=apple, model="iPhone 15", country=china)
+        cls.black = Variant.objects.create(mobile=galaxy, color="Black", size=6.2)
+        cls.blue = Variant.objects.create(mobile=galaxy, color="Blue", size=6.8)
+        cls.iphone_blue = Variant.objects.create(mobile=iphone, color="Blue", size=4.7)
+        PriceHistory.objects.create(variant=cls.black, price=1000)
+        PriceHistory.objects.create(variant=cls.blue, price=1100, status=False)
+
+    def test_size_buckets(self):
+        self.assertListEqual(get_size_buckets(), ["-5.0", "5.0-5.5", "5.5-6.0", "6.0-6.5", "6.5-7.0", "7.0-"])
+
+    def test_count(self):
+        with self.assertNumQueries(1):
+            count, facets = count_facets(Variant.objects.all())
+
+        self.assertEqual(count, 3)
+        self.assertDictEqual(
+            facets,
+            {
+                "brand": [{"value": "Samsung", "count": 2}, {"value": "Apple", "count": 1}],
+                "nationality": [{"value": "Korea", "count": 2}, {"value": "USA", "count": 1}],
+                "country": [{"value": "Korea", "count": 2}, {"value": "China", "count": 1}],
+                "color": [{"value": "Blue", "count": 2}, {"value": "Black", "count": 1}],
+                "size": [
+                    {"value": "-5.0", "count": 1},
+                    {"value": "6.0-6.5", "count": 1},
+                    {"value": "6.5-7.0", "count": 1},
+                ],
+                "availability": [
+                    {"value": "available", "count": 1},
+                    {"value": "no_price", "count": 1},
+                    {"value": "not_available", "count": 1},
+                ],
+            },
+        )
+
+    def test_filter(self):
+        variants = filter_facets(Variant.objects.all(), {"color": ["Blue"], "availability": ["no_price", "available"]})
+
+        self.assertListEqual(list(variants), [self.iphone_blue])
+        count, facets = count_facets(variants)
+        self.assertEqual(count, 1)
+        self.assertListEqual(facets["brand"], [{"value": "Apple", "count": 1}])
+
+    def test_empty(self):
+        count, facets = count_facets(Variant.objects.none())
+
+        self.assertEqual(count, 0)
+        self.assertTrue(all(values == [] for values in facets.values()))
@@ -0,0 +1,71 @@
+from datetime import date
+
+from django.test import TestCase
+
+from mobiles.flat import flat_brands, flat_mobiles
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.serializers import BrandSerializer, MobileSerializer
+from mobiles.tests.util import generate_image_file
+
+
+class FlatEngineTestCase(TestCase):
+    brands: list
+    mobiles: list
+
+    @classmethod
+    def setUpTestData(cls):
+        korea = Nationality.objects.create(name="Korea")
+        china = Nationality.objects.create(name="China")
+
+        cls.brands = [
+            Brand.objects.create(name="Brand1", nationality=korea),
+            Brand.objects.create(name="Brand2", nationality=china),
+            Brand.objects.create(name="Brand3", nationality=china),
+        ]
+        cls.mobiles = [
+            Mobile.objects.create(brand=cls.brands[0], model="Model1", country=china),
+            Mobile.objects.create(brand=cls.brands[0], model="Model2", country=korea),
+            Mobile.objects.create(brand=cls.brands[1], model="Model3", country=china),
+            Mobile.objects.create(brand=cls.brands[2], model="Model4", country=china),
+        ]
+
+        red = Variant.objects.create(mobile=cls.mobiles[0], color="Red", size=6.1, image=generate_image_file())
+        blue = Variant.objects.create(mobile=cls.mobiles[0], color="Blue", size=6.7)
+        green = Variant.objects.create(mobile=cls.mobiles[1], color="Green", size=5)
+        Variant.objects.create(mobile=cls.mobiles[2], color="Black", size=5.5)
+
+        PriceHistory.objects.create(variant=red, price=1000, status=True, date=date(2023, 1, 1))
+        PriceHistory.objects.create(variant=blue, price=1100, status=False, date=date(2023, 1, 2))
+        PriceHistory.objects.create(variant=red, price=990, status=True, date=date(2023, 1, 3))
+        PriceHistory.objects.create(variant=green, price=700, status=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        Variant.objects.all().delete()
+        super().tearDownClass()
+
+    def test_flat_brands_matches_serializer(self):
+        brands = Brand.objects.all()
+
+        self.assertListEqual(flat_brands(brands), BrandSerializer(brands, many=True, flat=True).data)
+
+    def test_flat_mobiles_matches_serializer(self):
+        mobiles = Mobile.objects.all()
+
+        self.assertListEqual(flat_mobiles(mobiles), MobileSerializer(mobiles, many=True, flat=True).data)
+
+    def test_flat_keeps_instances_order(self):
+        mobiles = list(reversed(self.mobiles))
+
+        self.assertListEqual(flat_mobiles(mobiles), MobileSerializer(mobiles, many=True, flat=True).data)
+
+    def test_flat_without_prices(self):
+        self.assertListEqual(flat_brands(self.brands[1:]), [{}, {}])
+
+    def test_flat_single_query(self):
+        with self.assertNumQueries(1):
+            flat_brands(self.brands)
+
+    def test_flat_empty(self):
+        with self.assertNumQueries(0):
+            self.assertListEqual(flat_mobiles([]), [])
@@ -0,0 +1,131 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+
+from api.pagination import keyset_filter
+from mobiles.catalog import rebuild_catalog_rows
+from mobiles.models import (
+    Brand,
+    CatalogRow,
+    ChangeLog,
+    Mobile,
+    Nationality,
+    PriceHistory,
+    PriceRollup,
+    Tombstone,
+    Variant,
+)
+from mobiles.tests.util import QueryPlanTestMixin
+
+
+class IndexPlanTestCase(QueryPlanTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # The benchmark dataset: 20 nationalities, 10 brands each, 5 mobiles per brand, 2 variants per mobile and 10
+        # prices per variant.
+        nationalities = Nationality.objects.bulk_create(
+            Nationality(name="Korea" if index == 0 else f"Nationality{index}") for index in range(20)
+        )
+        brands = Brand.objects.bulk_create(
+            Brand(name=f"Brand{index}", nationality=nationalities[index % 20]) for index in range(200)
+        )
+        mobiles = Mobile.objects.bulk_create(
+            Mobile(brand=brands[index % 200], model=f"Model{index}", country=nationalities[index % 20])
+            for index in range(1000)
+        )
+        variants = Variant.objects.bulk_create(
+            Variant(mobile=mobiles[index % 1000], color=f"Color{index}", size=6.0, current_price=1000 + index)
+            for index in range(2000)
+        )
+        PriceHistory.objects.bulk_create(
+            PriceHistory(variant=variants[index % 2000], price=1000 + index, date=date(2024, 1, 1) + timedelta(index))
+            for index in range(20000)
+        )
+        rebuild_catalog_rows()
+        # A weekly rollup of every variant and mobile over the first 5 weeks.
+        PriceRollup.objects.bulk_create(
+            PriceRollup(
+                scope=scope,
+                object_id=object_id,
+                period=PriceRollup.WEEK,
+                start=date(2024, 1, 1) + timedelta(weeks=week),
+                min_price=1000,
+                max_price=1000,
+                avg_price=1000,
+                last_price=1000,
+                count=1,
+            )
+            for scope, count in ((PriceRollup.VARIANT, 2000), (PriceRollup.MOBILE, 1000))
+            for object_id in range(1, count + 1)
+            for week in range(5)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        cls.created = Brand.objects.order_by("created").values_list("created", flat=True)[100]
+
+    def test_korea_brands(self):
+        # KoreaBrandsView, first page and a keyset page.
+        brands = Brand.objects.filter(nationality__name="Korea").order_by("created", "id")
+        self.assertNoSequentialScan(brands[:10])
+        self.assertNoSequentialScan(brands.filter(keyset_filter(self.created, 100))[:10])
+
+    def test_mobile_brands(self):
+        # MobileBrandsView
+        self.assertNoSequentialScan(
+            Mobile.objects.filter(brand__name__in=["Brand1", "Brand2"]).order_by("created", "id")[:10]
+        )
+
+    def test_same_nationality(self):
+        # SameNationalityView compares two columns, the index on ``created`` walks the page instead.
+        self.assertNoSequentialScan(
+            Mobile.objects.filter(brand__nationality=F("country")).order_by("created", "id")[:10]
+        )
+
+    def test_nested_prefetches(self):
+        self.assertNoSequentialScan(Mobile.objects.filter(brand_id__in=[1, 2]))
+        self.assertNoSequentialScan(Variant.objects.filter(mobile_id__in=[1, 2]))
+        self.assertNoSequentialScan(PriceHistory.objects.filter(variant_id__in=[1, 2]))
+
+    def test_flat_rows(self):
+        # The flat representation reads a single table.
+        for lookup in ("mobile_id__in", "brand_id__in"):
+            with self.subTest(lookup=lookup):
+                self.assertNoSequentialScan(CatalogRow.objects.filter(**{lookup: [1, 2]}))
+        self.assertNoSequentialScan(CatalogRow.objects.filter(mobile_id__in=[1, 2], date__gte=date(2024, 6, 1)))
+
+    def test_price_rollups(self):
+        # The rollups API, and the stale rollups and changed prices read by the incremental update.
+        rollups = PriceRollup.objects.filter(scope=PriceRollup.MOBILE, object_id=1, period=PriceRollup.WEEK)
+        self.assertNoSequentialScan(rollups.filter(start__gte=date(2024, 1, 15)).order_by("start")[:100])
+        self.assertNoSequentialScan(PriceRollup.objects.filter(stale=True)[:100])
+        self.assertNoSequentialScan(
+            PriceHistory.objects.filter(updated__gt=self.created).order_by("updated", "id").values_list("id")[:100]
+        )
+
+    def test_price_date_range(self):
+        prices = PriceHistory.objects.filter(
+            variant_id__in=[1, 2], date__gte=date(2024, 6, 1), date__lte=date(2024, 6, 30)
+        )
+        self.assertNoSequentialScan(prices)
+
+    def test_current_price(self):
+        # AllMobilesView sorted and filtered by the current price.
+        self.assertNoSequentialScan(Variant.objects.order_by(F("current_price").asc(nulls_last=True), "id")[:10])
+        self.assertNoSequentialScan(Variant.objects.filter(current_price__gte=1500, current_price__lte=1600))
+
+    def test_list_views(self):
+        # The HTML list views and the streaming APIs, ordered by creation.
+        for model in (Nationality, Brand, Mobile, Variant, PriceHistory):
+            with self.subTest(model=model.__name__):
+                self.assertNoSequentialScan(model.objects.order_by("created")[:10])
+
+    def test_changes(self):
+        # The delta sync and the change log read the rows changed after a position.
+        for model in (Nationality, Brand, Mobile, Variant, PriceHistory, Tombstone):
+            with self.subTest(model=model.__name__):
+                self.assertNoSequentialScan(model.objects.filter(updated__gt=self.created).order_by("updated", "id"))
+        self.assertNoSequentialScan(ChangeLog.objects.filter(sequence__gt=100)[:10])
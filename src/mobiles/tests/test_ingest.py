@@ -0,0 +1,46 @@
+from django.test import TestCase
+
+from mobiles.ingest import ingest_prices
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.signals import prices_bulk_created
+
+
+class IngestPricesTestCase(TestCase):
+    def setUp(self):
+        self.nationality = Nationality.objects.create(name="Korea")
+        self.brand = Brand.objects.create(name="Brand", nationality=self.nationality)
+        self.mobile = Mobile.objects.create(brand=self.brand, model="Model", country=self.nationality)
+        self.variant = Variant.objects.create(mobile=self.mobile, color="Red", size=5.5)
+
+    def test_batches(self):
+        rows = [{"variant": self.variant.pk, "price": 1000 + index} for index in range(5)]
+        rows[3]["price"] = -1
+        batches = []
+
+        def receiver(sender, instances, **kwargs):
+            batches.append([price.price for price in instances])
+
+        prices_bulk_created.connect(receiver, sender=PriceHistory)
+        try:
+            created, errors = ingest_prices(rows, batch_size=2)
+        finally:
+            prices_bulk_created.disconnect(receiver, sender=PriceHistory)
+
+        self.assertEqual(created, 4)
+        self.assertListEqual([error["row"] for error in errors], [3])
+        self.assertListEqual(batches, [[1000, 1001], [1002], [1004]])
+        self.assertEqual(PriceHistory.objects.count(), 4)
+
+    def test_sets_primary_keys(self):
+        batches = []
+
+        def receiver(sender, instances, **kwargs):
+            batches.append(instances)
+
+        prices_bulk_created.connect(receiver, sender=PriceHistory)
+        try:
+            ingest_prices([{"variant": self.variant.pk, "price": 1000}])
+        finally:
+            prices_bulk_created.disconnect(receiver, sender=PriceHistory)
+
+        self.assertEqual(batches[0][0].pk, PriceHistory.objects.get().pk)
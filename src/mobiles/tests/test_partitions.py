@@ -0,0 +1,110 @@
+from datetime import date
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.partitions import (
+    create_price_partitions,
+    default_partition_name,
+    detach_price_partitions,
+    get_price_partitions,
+    is_partitioned,
+    partition_name,
+)
+from mobiles.tests.util import QueryPlanTestMixin
+
+
+class PartitionNameTestCase(TestCase):
+    def test_partition_name(self):
+        self.assertEqual(partition_name(date(2024, 1, 1)), "mobiles_pricehistory_p2024_01")
+        self.assertEqual(default_partition_name(), "mobiles_pricehistory_default")
+
+    def test_is_partitioned(self):
+        self.assertEqual(is_partitioned(), connection.vendor == "postgresql")
+
+
+@skipUnless(connection.vendor == "postgresql", "The price history is only partitioned on PostgreSQL.")
+class PricePartitionTestCase(QueryPlanTestMixin, TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+
+    def count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT count(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+
+    def test_create(self):
+        # No partition covers 2040 yet, the price is stored in the default partition.
+        price = PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2040, 5, 10))
+        self.assertEqual(self.count_rows(default_partition_name()), 1)
+
+        self.assertEqual(
+            create_price_partitions(date(2040, 4, 1), date(2040, 5, 1)),
+            ["mobiles_pricehistory_p2040_04", "mobiles_pricehistory_p2040_05"],
+        )
+        self.assertEqual(create_price_partitions(date(2040, 4, 1), date(2040, 5, 1)), [])
+
+        # Moved to the partition of its month.
+        self.assertEqual(self.count_rows(default_partition_name()), 0)
+        self.assertEqual(self.count_rows("mobiles_pricehistory_p2040_05"), 1)
+        self.assertEqual(PriceHistory.objects.get(pk=price.pk).price, 1000)
+        self.assertIn(("mobiles_pricehistory_p2040_05", date(2040, 5, 1)), get_price_partitions())
+
+    def test_move_between_partitions(self):
+        create_price_partitions(date(2040, 4, 1), date(2040, 5, 1))
+        price = PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2040, 4, 10))
+
+        price.date = date(2040, 5, 10)
+        price.save()
+
+        self.assertEqual(self.count_rows("mobiles_pricehistory_p2040_04"), 0)
+        self.assertEqual(self.count_rows("mobiles_pricehistory_p2040_05"), 1)
+
+    def test_pruning(self):
+        create_price_partitions(date(2040, 4, 1), date(2040, 5, 1))
+
+        plan = "\n".join(
+            self.get_query_plan(PriceHistory.objects.filter(date__range=(date(2040, 5, 1), date(2040, 5, 31))))
+        )
+
+        self.assertIn("mobiles_pricehistory_p2040_05", plan)
+        self.assertNotIn("mobiles_pricehistory_p2040_04", plan)
+        self.assertNotIn(default_partition_name(), plan)
+
+        # A compacted price overlapping a day starts in its month.
+        plan = "\n".join(self.get_query_plan(PriceHistory.objects.days_from(date(2040, 5, 10))))
+        self.assertIn("mobiles_pricehistory_p2040_05", plan)
+        self.assertNotIn("mobiles_pricehistory_p2040_04", plan)
+
+    def test_detach(self):
+        create_price_partitions(date(1990, 1, 1), date(1990, 2, 1))
+        PriceHistory.objects.create(variant=self.variant, price=1000, date=date(1990, 1, 10))
+        PriceHistory.objects.create(variant=self.variant, price=1100, date=date(1990, 2, 10))
+
+        self.assertEqual(detach_price_partitions(date(1990, 2, 1)), ["mobiles_pricehistory_p1990_01"])
+
+        # The detached table keeps its prices.
+        self.assertEqual(list(PriceHistory.objects.values_list("price", flat=True)), [1100])
+        self.assertEqual(self.count_rows("mobiles_pricehistory_p1990_01"), 1)
+        # Without a default drawing from the sequence of the table.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT column_default FROM information_schema.columns WHERE table_name = %s AND column_name = 'id'",
+                ["mobiles_pricehistory_p1990_01"],
+            )
+            self.assertIsNone(cursor.fetchone()[0])
+
+    def test_commands(self):
+        out = StringIO()
+        call_command("create_price_partitions", months=1, stdout=out)
+        call_command("detach_price_partitions", "1900-01-01", stdout=out)
+
+        self.assertIn("Created 0 price partitions: -", out.getvalue())
+        self.assertIn("Detached 0 price partitions: -", out.getvalue())
@@ -0,0 +1,174 @@
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.tests.util import QueryCountTestMixin, create_catalog, generate_image_file
+
+
+class ViewQueryBudgetsTestCase(QueryCountTestMixin, TestCase):
+    def setUp(self):
+        self.index = 0
+        self.nationality = Nationality.objects.create(name="Korea")
+        self.brand = create_catalog(0, self.nationality)
+        self.mobile = self.brand.mobiles.get()
+        self.variant = self.mobile.variants.first()
+        self.price = self.variant.prices.first()
+
+    def tearDown(self):
+        # Removes the images of the variants.
+        Variant.objects.all().delete()
+
+    def grow(self):
+        # New objects at every level of the catalog.
+        for _ in range(3):
+            self.index += 1
+            create_catalog(self.index, self.nationality)
+
+    def get(self, name, *args, params=None):
+        return lambda: self.assertEqual(self.client.get(reverse(name, args=args), params).status_code, 200)
+
+    def post(self, name, data, *args, files=None):
+        def request():
+            self.index += 1
+            payload = data(self.index) if callable(data) else data
+            if files:
+                payload = {**payload, **files()}
+
+            self.assertEqual(self.client.post(reverse(name, args=args), payload).status_code, 302)
+
+        return request
+
+    def test_all_mobiles(self):
+        self.assertConstantQueries(self.get("mobiles:all-mobiles"), self.grow)
+
+    def test_list_views(self):
+        for name in (
+            "mobiles:nationality-list",
+            "mobiles:brand-list",
+            "mobiles:mobile-list",
+            "mobiles:variant-list",
+            "mobiles:price-history-list",
+        ):
+            with self.subTest(name):
+                self.assertConstantQueries(self.get(name), self.grow)
+
+    def test_search_views(self):
+        for name in (
+            "mobiles:all-mobiles",
+            "mobiles:nationality-list",
+            "mobiles:brand-list",
+            "mobiles:mobile-list",
+            "mobiles:variant-list",
+        ):
+            with self.subTest(name):
+                self.assertConstantQueries(self.get(name, params={"q": "model red"}), self.grow)
+
+    def test_form_views(self):
+        for name, args in (
+            ("mobiles:nationality-create", ()),
+            ("mobiles:nationality-edit", (self.nationality.pk,)),
+            ("mobiles:brand-create", ()),
+            ("mobiles:brand-edit", (self.brand.pk,)),
+            ("mobiles:mobile-create", ()),
+            ("mobiles:mobile-edit", (self.mobile.pk,)),
+            ("mobiles:variant-create", ()),
+            ("mobiles:variant-edit", (self.variant.pk,)),
+            ("mobiles:price-history-create", ()),
+            ("mobiles:price-history-edit", (self.price.pk,)),
+        ):
+            with self.subTest(name):
+                self.assertConstantQueries(self.get(name, *args), self.grow)
+
+    def test_create_views(self):
+        for name, data, files in (
+            ("mobiles:nationality-create", lambda index: {"name": f"New{index}"}, None),
+            (
+                "mobiles:brand-create",
+                lambda index: {"name": f"New{index}", "nationality": self.nationality.pk},
+                None,
+            ),
+            (
+                "mobiles:mobile-create",
+                lambda index: {"model": f"New{index}", "brand": self.brand.pk, "country": self.nationality.pk},
+                None,
+            ),
+            (
+                "mobiles:variant-create",
+                lambda index: {"mobile": self.mobile.pk, "color": f"New{index}", "size": 6.0},
+                lambda: {"image": generate_image_file()},
+            ),
+            (
+                "mobiles:price-history-create",
+                {"variant": self.variant.pk, "price": 1000, "status": True, "date": date(2024, 1, 1)},
+                None,
+            ),
+        ):
+            with self.subTest(name):
+                self.assertConstantQueries(self.post(name, data, files=files), self.grow)
+
+    def test_update_views(self):
+        for name, data, args, files in (
+            ("mobiles:nationality-edit", lambda index: {"name": f"Korea{index}"}, (self.nationality.pk,), None),
+            (
+                "mobiles:brand-edit",
+                lambda index: {"name": f"Brand{index}", "nationality": self.nationality.pk},
+                (self.brand.pk,),
+                None,
+            ),
+            (
+                "mobiles:mobile-edit",
+                lambda index: {"model": f"Mobile{index}", "brand": self.brand.pk, "country": self.nationality.pk},
+                (self.mobile.pk,),
+                None,
+            ),
+            (
+                "mobiles:variant-edit",
+                lambda index: {"mobile": self.mobile.pk, "color": f"Color{index}", "size": 6.0},
+                (self.variant.pk,),
+                lambda: {"image": generate_image_file()},
+            ),
+            (
+                "mobiles:price-history-edit",
+                # A new date every time, so every request moves the price out of its rollups.
+                lambda index: {
+                    "variant": self.variant.pk,
+                    "price": 900,
+                    "status": False,
+                    "date": date(2024, 1, 1) + timedelta(days=index),
+                },
+                (self.price.pk,),
+                None,
+            ),
+        ):
+            with self.subTest(name):
+                self.assertConstantQueries(self.post(name, data, *args, files=files), self.grow)
+
+    def test_delete_views(self):
+        # Deletes cascade to the related objects, so each request deletes the newest object, which has as many related
+        # objects as the others.
+        def delete(name, model):
+            def request():
+                obj = model.objects.order_by("created", "id").last()
+                self.assertEqual(self.client.post(reverse(name, args=(obj.pk,))).status_code, 302)
+
+            return request
+
+        for name, model in (
+            ("mobiles:price-history-delete", PriceHistory),
+            ("mobiles:variant-delete", Variant),
+            ("mobiles:mobile-delete", Mobile),
+            ("mobiles:brand-delete", Brand),
+        ):
+            with self.subTest(name):
+                self.assertConstantQueries(delete(name, model), self.grow)
+
+    def test_delete_nationality(self):
+        def request():
+            nationality = Nationality.objects.create(name="Unused")
+            self.assertEqual(
+                self.client.post(reverse("mobiles:nationality-delete", args=(nationality.pk,))).status_code, 302
+            )
+
+        self.assertConstantQueries(request, self.grow)
@@ -0,0 +1,179 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from mobiles.ingest import ingest_prices
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, PriceRollup, Variant, Watermark
+from mobiles.rollups import (
+    PRICE_ROLLUPS_WATERMARK,
+    period_end,
+    period_start,
+    rebuild_price_rollups,
+    update_price_rollups,
+)
+
+
+class PeriodTestCase(TestCase):
+    def test_period_start(self):
+        day = date(2024, 2, 29)
+
+        self.assertEqual(period_start(PriceRollup.DAY, day), day)
+        self.assertEqual(period_start(PriceRollup.WEEK, day), date(2024, 2, 26))
+        self.assertEqual(period_start(PriceRollup.MONTH, day), date(2024, 2, 1))
+
+    def test_period_end(self):
+        self.assertEqual(period_end(PriceRollup.DAY, date(2024, 12, 31)), date(2025, 1, 1))
+        self.assertEqual(period_end(PriceRollup.WEEK, date(2024, 2, 26)), date(2024, 3, 4))
+        self.assertEqual(period_end(PriceRollup.MONTH, date(2024, 1, 1)), date(2024, 2, 1))
+        self.assertEqual(period_end(PriceRollup.MONTH, date(2024, 12, 1)), date(2025, 1, 1))
+
+
+class PriceRollupTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        self.mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.red = Variant.objects.create(mobile=self.mobile, color="Red", size=5.5)
+        self.blue = Variant.objects.create(mobile=self.mobile, color="Blue", size=5.5)
+
+        PriceHistory.objects.create(variant=self.red, price=1000, date=date(2024, 1, 1))
+        PriceHistory.objects.create(variant=self.red, price=1200, date=date(2024, 1, 3))
+        PriceHistory.objects.create(variant=self.red, price=1100, date=date(2024, 1, 3))
+        PriceHistory.objects.create(variant=self.blue, price=900, date=date(2024, 1, 2))
+        PriceHistory.objects.create(variant=self.red, price=1300, date=date(2024, 2, 5))
+
+    def get_rollups(self, scope, object_id, period):
+        return list(
+            PriceRollup.objects.filter(scope=scope, object_id=object_id, period=period)
+            .order_by("start")
+            .values_list("start", "min_price", "max_price", "avg_price", "last_price", "count")
+        )
+
+    def test_update(self):
+        self.assertEqual(update_price_rollups(), 5)
+
+        self.assertListEqual(
+            self.get_rollups(PriceRollup.VARIANT, self.red.pk, PriceRollup.DAY),
+            [
+                (date(2024, 1, 1), 1000, 1000, Decimal("1000.00"), 1000, 1),
+                # The last price is the last created one on the same date.
+                (date(2024, 1, 3), 1100, 1200, Decimal("1150.00"), 1100, 2),
+                (date(2024, 2, 5), 1300, 1300, Decimal("1300.00"), 1300, 1),
+            ],
+        )
+        self.assertListEqual(
+            self.get_rollups(PriceRollup.MOBILE, self.mobile.pk, PriceRollup.WEEK),
+            [
+                (date(2024, 1, 1), 900, 1200, Decimal("1050.00"), 1100, 4),
+                (date(2024, 2, 5), 1300, 1300, Decimal("1300.00"), 1300, 1),
+            ],
+        )
+        self.assertListEqual(
+            self.get_rollups(PriceRollup.MOBILE, self.mobile.pk, PriceRollup.MONTH),
+            [
+                (date(2024, 1, 1), 900, 1200, Decimal("1050.00"), 1100, 4),
+                (date(2024, 2, 1), 1300, 1300, Decimal("1300.00"), 1300, 1),
+            ],
+        )
+
+    def test_incremental_update(self):
+        update_price_rollups()
+        watermark = Watermark.objects.get(name=PRICE_ROLLUPS_WATERMARK)
+        self.assertEqual(watermark.object_id, PriceHistory.objects.order_by("updated", "id").last().pk)
+
+        self.assertEqual(update_price_rollups(), 0)
+
+        ingest_prices([{"variant": self.blue.pk, "price": 800, "date": "2024-01-05"}])
+        self.assertEqual(update_price_rollups(), 1)
+
+        self.assertEqual(
+            self.get_rollups(PriceRollup.MOBILE, self.mobile.pk, PriceRollup.WEEK)[0],
+            (date(2024, 1, 1), 800, 1200, Decimal("1000.00"), 800, 5),
+        )
+
+    @override_settings(COMMIT_VISIBILITY_LAG=60)
+    def test_visibility_lag(self):
+        visible = PriceHistory.objects.order_by("id")[:3]
+        PriceHistory.objects.filter(id__in=visible.values("id")).update(updated=timezone.now() - timedelta(minutes=2))
+
+        self.assertEqual(update_price_rollups(), 3)
+        watermark = Watermark.objects.get(name=PRICE_ROLLUPS_WATERMARK)
+        self.assertEqual(watermark.object_id, visible[2].pk)
+
+        rebuild_price_rollups()
+        watermark.refresh_from_db()
+        self.assertEqual(watermark.object_id, visible[2].pk)
+
+    def test_batches(self):
+        self.assertEqual(update_price_rollups(batch_size=2), 5)
+
+        # Three days of the red variant, one of the blue one and four of the mobile.
+        self.assertEqual(PriceRollup.objects.filter(period=PriceRollup.DAY).count(), 8)
+
+    def test_update_price(self):
+        update_price_rollups()
+        price = PriceHistory.objects.get(price=1000)
+        price.price = 1050
+        price.save()
+
+        self.assertEqual(update_price_rollups(), 1)
+        self.assertEqual(self.get_rollups(PriceRollup.VARIANT, self.red.pk, PriceRollup.DAY)[0][1], 1050)
+
+    def test_delete_price(self):
+        update_price_rollups()
+        PriceHistory.objects.get(price=1300).delete()
+
+        self.assertTrue(PriceRollup.objects.filter(stale=True).exists())
+        update_price_rollups()
+
+        self.assertFalse(PriceRollup.objects.filter(start__gte=date(2024, 2, 1)).exists())
+        self.assertFalse(PriceRollup.objects.filter(stale=True).exists())
+
+    def test_move_price(self):
+        update_price_rollups()
+        price = PriceHistory.objects.get(price=1300)
+        price.date = date(2024, 1, 1)
+        price.save()
+
+        update_price_rollups()
+
+        self.assertListEqual(
+            self.get_rollups(PriceRollup.VARIANT, self.red.pk, PriceRollup.MONTH),
+            # The price of January 3rd is still the newest of the month.
+            [(date(2024, 1, 1), 1000, 1300, Decimal("1150.00"), 1100, 4)],
+        )
+
+    def test_move_variant(self):
+        other_mobile = Mobile.objects.create(brand=self.mobile.brand, model="Other", country=self.mobile.country)
+        update_price_rollups()
+
+        blue = Variant.objects.get(pk=self.blue.pk)
+        blue.mobile = other_mobile
+        blue.save()
+        self.assertEqual(update_price_rollups(), 0)
+
+        self.assertListEqual(
+            self.get_rollups(PriceRollup.MOBILE, self.mobile.pk, PriceRollup.MONTH),
+            [
+                (date(2024, 1, 1), 1000, 1200, Decimal("1100.00"), 1100, 3),
+                (date(2024, 2, 1), 1300, 1300, Decimal("1300.00"), 1300, 1),
+            ],
+        )
+        self.assertListEqual(
+            self.get_rollups(PriceRollup.MOBILE, other_mobile.pk, PriceRollup.DAY),
+            [(date(2024, 1, 2), 900, 900, Decimal("900.00"), 900, 1)],
+        )
+        self.assertFalse(PriceRollup.objects.filter(stale=True).exists())
+
+    def test_rebuild(self):
+        update_price_rollups()
+        # Queryset updates bypass the signals, and the changed prices are not recomputed without a newer ``updated``.
+        PriceHistory.objects.filter(variant=self.blue).delete()
+        PriceRollup.objects.update(stale=False)
+
+        # Red: 3 days, 2 weeks and 2 months, the same for the mobile.
+        self.assertEqual(rebuild_price_rollups(batch_size=1), 14)
+        self.assertFalse(PriceRollup.objects.filter(scope=PriceRollup.VARIANT, object_id=self.blue.pk).exists())
+        self.assertEqual(update_price_rollups(), 0)
@@ -0,0 +1,145 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+from mobiles.search import drop_search_triggers, search_objects, search_variants
+from mobiles.tests.util import QueryPlanTestMixin, generate_image_file
+
+
+class SearchTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        korea = Nationality.objects.create(name="Korea")
+        usa = Nationality.objects.create(name="USA")
+        vietnam = Nationality.objects.create(name="Vietnam")
+        cls.samsung = Brand.objects.create(name="Samsung", nationality=korea)
+        cls.apple = Brand.objects.create(name="Apple", nationality=usa)
+        cls.galaxy = Mobile.objects.create(brand=cls.samsung, model="Galaxy S24", country=vietnam)
+        cls.iphone = Mobile.objects.create(brand=cls.apple, model="iPhone 15", country=korea)
+        cls.black = Variant.objects.create(
+            mobile=cls.galaxy, color="Phantom Black", size=6.2, image=generate_image_file()
+        )
+        cls.sky_blue = Variant.objects.create(
+            mobile=cls.galaxy, color="Sky Blue", size=6.2, image=generate_image_file()
+        )
+        cls.blue = Variant.objects.create(mobile=cls.iphone, color="Blue", size=6.1, image=generate_image_file())
+
+    def tearDown(self):
+        # Removes the images of the variants.
+        Variant.objects.all().delete()
+
+
+class SearchTestCase(SearchTestMixin, TestCase):
+    def search(self, query):
+        return list(search_variants(query))
+
+    def test_columns(self):
+        self.assertListEqual(self.search("samsung"), [self.black, self.sky_blue])
+        self.assertListEqual(self.search("Galaxy"), [self.black, self.sky_blue])
+        self.assertListEqual(self.search("BLUE"), [self.sky_blue, self.blue])
+        # The nationality of the brand or the manufacturing country.
+        self.assertListEqual(self.search("korea"), [self.black, self.sky_blue, self.blue])
+        self.assertListEqual(self.search("vietnam"), [self.black, self.sky_blue])
+
+    def test_every_word(self):
+        self.assertListEqual(self.search("samsung blue"), [self.sky_blue])
+        self.assertListEqual(self.search("apple black"), [])
+
+    def test_part_of_word(self):
+        self.assertListEqual(self.search("galax"), [self.black, self.sky_blue])
+
+    def test_short_word(self):
+        self.assertListEqual(self.search("15"), [self.blue])
+
+    def test_syntax_characters(self):
+        self.assertListEqual(self.search('"sky" OR *'), [])
+
+    def test_search_objects(self):
+        self.assertListEqual(list(search_objects(Brand.objects.all(), "sung")), [self.samsung])
+        self.assertListEqual(list(search_objects(Mobile.objects.all(), "iphone 15")), [self.iphone])
+
+    def test_index_follows_changes(self):
+        self.samsung.name = "Galaxy Corp"
+        self.samsung.save()
+        self.assertListEqual(self.search("samsung"), [])
+        self.assertListEqual(self.search("corp"), [self.black, self.sky_blue])
+
+        self.sky_blue.delete()
+        self.assertListEqual(self.search("corp"), [self.black])
+
+        variant = Variant.objects.create(mobile=self.iphone, color="Starlight", size=6.1)
+        self.assertListEqual(self.search("starlight"), [variant])
+
+    def test_rebuild_command(self):
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertListEqual(self.search("samsung blue"), [self.sky_blue])
+
+    @skipUnless(connection.vendor == "sqlite", "Only SQLite keeps the index up to date with triggers")
+    def test_restore_triggers_on_migrate(self):
+        # What remaking the table in a migration does to its triggers.
+        with connection.cursor() as cursor:
+            drop_search_triggers(cursor, Variant)
+        Variant.objects.create(mobile=self.iphone, color="Starlight", size=6.1)
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db=connection.alias)
+
+        self.assertEqual(len(self.search("starlight")), 1)
+        variant = Variant.objects.create(mobile=self.iphone, color="Midnight", size=6.1)
+        self.assertListEqual(self.search("midnight"), [variant])
+
+    @skipUnless(connection.vendor == "postgresql", "Typo tolerance needs pg_trgm")
+    def test_typo(self):
+        self.assertListEqual(self.search("samsng"), [self.black, self.sky_blue])
+
+
+class SearchPlanTestCase(QueryPlanTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        nationalities = Nationality.objects.bulk_create(Nationality(name=f"Nationality{index}") for index in range(20))
+        Brand.objects.bulk_create(
+            Brand(name=f"Brand{index}", nationality=nationalities[index % 20]) for index in range(200)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_search_objects(self):
+        self.assertNoSequentialScan(search_objects(Brand.objects.all(), "brand12"))
+
+
+class SearchViewsTestCase(SearchTestMixin, TestCase):
+    def test_list_views(self):
+        for name, query, expected in (
+            ("mobiles:nationality-list", "korea", ["Korea"]),
+            ("mobiles:brand-list", "apple", [self.apple]),
+            ("mobiles:mobile-list", "galaxy", [self.galaxy]),
+            ("mobiles:variant-list", "samsung blue", [self.sky_blue]),
+        ):
+            with self.subTest(name):
+                response = self.client.get(reverse(name), {"q": query})
+
+                objects = list(response.context["page_obj"])
+                self.assertListEqual([str(item) for item in objects], [str(item) for item in expected])
+                self.assertContains(response, f'value="{query}"')
+
+    def test_all_mobiles(self):
+        PriceHistory.objects.create(variant=self.sky_blue, price=900)
+        PriceHistory.objects.create(variant=self.blue, price=1000)
+
+        response = self.client.get(reverse("mobiles:all-mobiles"), {"q": "blue", "sort": "-price"})
+
+        self.assertListEqual(list(response.context["page_obj"]), [self.blue, self.sky_blue])
+
+    def test_admin(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "password"))
+
+        response = self.client.get(reverse("admin:mobiles_variant_changelist"), {"q": "samsung blue"})
+
+        self.assertListEqual(list(response.context["cl"].result_list), [self.sky_blue])
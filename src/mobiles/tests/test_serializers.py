@@ -3,7 +3,7 @@ from random import randint
 from django.test import TestCase
 
 from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
-from mobiles.serializers import BrandSerializer, MobileSerializer
+from mobiles.serializers import BrandSerializer, MobileSerializer, VariantSerializer
 from mobiles.tests.util import generate_image_file
 
 
@@ -131,3 +131,21 @@ class SerializerTestCase(TestCase):
         ]
 
         self.assertListEqual(output, expected_output)
+
+    def test_variant_serializer_current_price(self):
+        variant = Variant.objects.get(pk=self.variants[0].pk)
+        output = VariantSerializer(instance=variant, include={}).data
+
+        self.assertEqual(output["current_price"], str(self.price_histories[0].price))
+        self.assertEqual(output["current_status"], self.price_histories[0].get_status_display())
+        self.assertEqual(output["price_date"], self.price_histories[0].formatted_date())
+        self.assertNotIn("prices", output)
+
+    def test_variant_serializer_without_prices(self):
+        variant = Variant.objects.create(mobile=self.mobiles[0], color="Blue", size=5, image=generate_image_file())
+        output = VariantSerializer(instance=variant).data
+        variant.delete()
+
+        self.assertIsNone(output["current_price"])
+        self.assertIsNone(output["current_status"])
+        self.assertIsNone(output["price_date"])
@@ -1,6 +1,13 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
 from django.test import TestCase
 
-from mobiles.models import Brand, Mobile, Nationality, Variant
+from mobiles.cache import CATALOG_VERSION_KEY, PRICE_FEED_VERSION_KEY, bump_catalog_version, get_catalog_version
+from mobiles.ingest import ingest_prices
+from mobiles.models import Brand, ChangeLog, Mobile, Nationality, PriceHistory, Tombstone, Variant
 from mobiles.tests.util import generate_image_file
 
 
@@ -39,3 +46,198 @@ class VariantSignalsTestCase(TestCase):
     def test_auto_delete_image_on_change_signal_no_old_file(self):
         image_path = self.variant.image.path
         self.assertTrue(self.variant.image.storage.exists(image_path))
+
+
+class CatalogVersionSignalsTestCase(TestCase):
+    def setUp(self):
+        self.nationality = Nationality.objects.create(name="Test Nationality")
+        self.brand = Brand.objects.create(name="Test Brand", nationality=self.nationality)
+        self.mobile = Mobile.objects.create(brand=self.brand, model="Test Model", country=self.nationality)
+        self.variant = Variant.objects.create(mobile=self.mobile, color="Red", size=5.5)
+        self.price_history = PriceHistory.objects.create(variant=self.variant, price=1000)
+
+    def test_bump_catalog_version_on_save(self):
+        for instance in (self.nationality, self.brand, self.mobile, self.variant, self.price_history):
+            version = get_catalog_version()
+            instance.save()
+
+            self.assertGreater(get_catalog_version(), version)
+
+    def test_bump_catalog_version_on_delete(self):
+        for instance in (self.price_history, self.variant, self.mobile, self.brand, self.nationality):
+            version = get_catalog_version()
+            instance.delete()
+
+            self.assertGreater(get_catalog_version(), version)
+
+    def test_bump_catalog_version_on_commit(self):
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            Nationality.objects.create(name="Other Nationality")
+
+        self.assertEqual(get_catalog_version(), version + 2)
+
+    def test_catalog_version_lost(self):
+        cache.delete(CATALOG_VERSION_KEY)
+        version = get_catalog_version()
+
+        bump_catalog_version()
+
+        self.assertEqual(get_catalog_version(), version + 1)
+
+
+class TombstoneSignalsTestCase(TestCase):
+    def test_create_tombstone_on_delete(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        brand_pk = brand.pk
+        brand.delete()
+
+        tombstone = Tombstone.objects.get()
+        self.assertEqual(tombstone.model, "brand")
+        self.assertEqual(tombstone.object_id, brand_pk)
+
+
+class ChangeLogSignalsTestCase(TestCase):
+    def test_log_changes(self):
+        nationality = Nationality.objects.create(name="Korea")
+        nationality.name = "South Korea"
+        nationality.save()
+        nationality_pk = nationality.pk
+        nationality.delete()
+
+        self.assertQuerySetEqual(
+            ChangeLog.objects.values_list("model", "object_id", "op"),
+            [
+                ("nationality", nationality_pk, ChangeLog.CREATE),
+                ("nationality", nationality_pk, ChangeLog.UPDATE),
+                ("nationality", nationality_pk, ChangeLog.DELETE),
+            ],
+        )
+
+    def test_sequence_increases(self):
+        nationality = Nationality.objects.create(name="Korea")
+        Brand.objects.create(name="Brand", nationality=nationality)
+
+        first, second = ChangeLog.objects.all()
+        self.assertGreater(second.sequence, first.sequence)
+        self.assertEqual(second.model, "brand")
+
+    def test_log_bulk_create(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+
+        ingest_prices([{"variant": variant.pk, "price": 1000}, {"variant": variant.pk, "price": 1200}])
+
+        self.assertQuerySetEqual(
+            ChangeLog.objects.filter(model="pricehistory").values_list("object_id", "op"),
+            [(price.pk, ChangeLog.CREATE) for price in PriceHistory.objects.order_by("id")],
+        )
+
+    def test_rolled_back_with_the_change(self):
+        try:
+            with transaction.atomic():
+                Nationality.objects.create(name="Korea")
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertFalse(ChangeLog.objects.exists())
+
+
+class PriceFeedSignalsTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+
+    def test_bump_on_commit_of_new_price(self):
+        version = cache.get(PRICE_FEED_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            price = PriceHistory.objects.create(variant=self.variant, price=1000)
+        self.assertNotEqual(cache.get(PRICE_FEED_VERSION_KEY), version)
+
+        version = cache.get(PRICE_FEED_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            price.price = 1200
+            price.save()
+        self.assertEqual(cache.get(PRICE_FEED_VERSION_KEY), version)
+
+    def test_bump_on_commit_of_bulk_prices(self):
+        version = cache.get(PRICE_FEED_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_prices([{"variant": self.variant.pk, "price": 1000}])
+
+        self.assertNotEqual(cache.get(PRICE_FEED_VERSION_KEY), version)
+
+
+class CurrentPriceSignalsTestCase(TestCase):
+    def setUp(self):
+        nationality = Nationality.objects.create(name="Korea")
+        brand = Brand.objects.create(name="Brand", nationality=nationality)
+        mobile = Mobile.objects.create(brand=brand, model="Model", country=nationality)
+        self.variant = Variant.objects.create(mobile=mobile, color="Red", size=5.5)
+        self.other_variant = Variant.objects.create(mobile=mobile, color="Blue", size=5.5)
+
+    def assertCurrentPrice(self, variant, price, status, price_date):
+        variant.refresh_from_db()
+        self.assertEqual(
+            (variant.current_price, variant.current_status, variant.price_date), (price, status, price_date)
+        )
+
+    def test_without_prices(self):
+        self.assertCurrentPrice(self.variant, None, None, None)
+
+    def test_create(self):
+        PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2024, 1, 2))
+        self.assertCurrentPrice(self.variant, Decimal(1000), True, date(2024, 1, 2))
+
+        # An older price does not replace the current one.
+        PriceHistory.objects.create(variant=self.variant, price=900, status=False, date=date(2024, 1, 1))
+        self.assertCurrentPrice(self.variant, Decimal(1000), True, date(2024, 1, 2))
+
+        # On the same date, the last created price wins.
+        PriceHistory.objects.create(variant=self.variant, price=1100, status=False, date=date(2024, 1, 2))
+        self.assertCurrentPrice(self.variant, Decimal(1100), False, date(2024, 1, 2))
+
+    def test_update(self):
+        price = PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2024, 1, 2))
+        PriceHistory.objects.create(variant=self.variant, price=900, date=date(2024, 1, 1))
+
+        price.date = date(2023, 12, 31)
+        price.save()
+
+        self.assertCurrentPrice(self.variant, Decimal(900), True, date(2024, 1, 1))
+
+    def test_move_to_other_variant(self):
+        price = PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2024, 1, 1))
+
+        price = PriceHistory.objects.get(pk=price.pk)
+        price.variant = self.other_variant
+        price.save()
+
+        self.assertCurrentPrice(self.variant, None, None, None)
+        self.assertCurrentPrice(self.other_variant, Decimal(1000), True, date(2024, 1, 1))
+
+    def test_delete(self):
+        PriceHistory.objects.create(variant=self.variant, price=900, date=date(2024, 1, 1))
+        price = PriceHistory.objects.create(variant=self.variant, price=1000, date=date(2024, 1, 2))
+
+        price.delete()
+        self.assertCurrentPrice(self.variant, Decimal(900), True, date(2024, 1, 1))
+
+        PriceHistory.objects.all().delete()
+        self.assertCurrentPrice(self.variant, None, None, None)
+
+    def test_bulk_create(self):
+        ingest_prices([
+            {"variant": self.variant.pk, "price": 1000, "date": "2024-01-01"},
+            {"variant": self.variant.pk, "price": 1200, "status": False, "date": "2024-01-03"},
+            {"variant": self.other_variant.pk, "price": 800, "date": "2024-01-02"},
+        ])
+
+        self.assertCurrentPrice(self.variant, Decimal(1200), False, date(2024, 1, 3))
+        self.assertCurrentPrice(self.other_variant, Decimal(800), True, date(2024, 1, 2))
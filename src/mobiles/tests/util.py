@@ -1,8 +1,13 @@
+import re
 from io import BytesIO
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from PIL import Image
 
+from mobiles.models import Brand, Mobile, Nationality, PriceHistory, Variant
+
 
 def generate_image_file(name="image.png"):
     file = BytesIO()
@@ -11,3 +16,60 @@ def generate_image_file(name="image.png"):
     image = SimpleUploadedFile(name, file.getvalue(), content_type="image/png")
 
     return image
+
+
+def create_catalog(index, nationality=None):
+    """Create a brand with a mobile, two variants and their prices, e.g. to grow the data of a query count test."""
+    nationality = nationality or Nationality.objects.create(name=f"Nationality{index}")
+    brand = Brand.objects.create(name=f"Brand{index}", nationality=nationality)
+    mobile = Mobile.objects.create(brand=brand, model=f"Model{index}", country=nationality)
+
+    for color in ("Red", "Blue"):
+        variant = Variant.objects.create(mobile=mobile, color=color, size=6.0, image=generate_image_file())
+        for price in (1000, 1200):
+            PriceHistory.objects.create(variant=variant, price=price + index)
+
+    return brand
+
+
+class QueryCountTestMixin:
+    def assertConstantQueries(self, request, grow, times=2):
+        """Assert that ``request()`` runs the same number of queries while ``grow()`` adds data."""
+        counts = []
+        for _ in range(times + 1):
+            with CaptureQueriesContext(connection) as context:
+                request()
+            counts.append(len(context))
+            grow()
+
+        self.assertEqual(len(set(counts)), 1, f"The number of queries grows with the data: {counts}")
+
+
+class QueryPlanTestMixin:
+    def get_query_plan(self, queryset):
+        """Return the lines of the plan of ``queryset``, from ``EXPLAIN`` on PostgreSQL and SQLite."""
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                # Sequential scans are only chosen then if no index can serve the query, whatever the table size.
+                cursor.execute("SET enable_seqscan = off")
+                try:
+                    cursor.execute(f"EXPLAIN {sql}", params)
+                    return [row[0] for row in cursor.fetchall()]
+                finally:
+                    cursor.execute("RESET enable_seqscan")
+
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertNoSequentialScan(self, queryset):
+        """Assert that no table is read in full by ``queryset``, every table is searched or walked by an index."""
+        tables = set(connection.introspection.table_names())
+        plan = self.get_query_plan(queryset)
+        scans = [
+            line
+            for line in plan
+            if (match := re.search(r"Seq Scan on (\w+)|^SCAN (\w+)$", line.strip())) and set(match.groups()) & tables
+        ]
+
+        self.assertFalse(scans, "Sequential scans in the plan:\n" + "\n".join(plan))
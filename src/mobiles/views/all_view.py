@@ -1,31 +1,66 @@
 from django.core.paginator import Paginator
+from django.db.models import F
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
 from django.views import View
 
-from mobiles.models import Brand
+from mobiles.conditional import catalog_condition
+from mobiles.managers import VARIANT_CATALOG_ORDERING
+from mobiles.models import Variant
+from mobiles.pagination import get_pagination_query
+from mobiles.search import search_variants
+
+# Orderings by the denormalized current price, variants without prices last.
+PRICE_ORDERINGS = {
+    "price": (F("current_price").asc(nulls_last=True), "id"),
+    "-price": (F("current_price").desc(nulls_last=True), "id"),
+}
+
+
+def get_price_filter(request, name):
+    """Return the price filter ``name`` of the query string, or ``None`` when it is missing or invalid."""
+    try:
+        return int(request.GET[name])
+    except (KeyError, ValueError):
+        return None
 
 
 class AllMobilesView(View):
+    query_budget = 2
+
+    @method_decorator(catalog_condition())
     def get(self, request):
-        brands = Brand.objects.prefetch_related("mobiles__variants__prices")
-
-        all_mobiles = []
-        for brand in brands:
-            for mobile in brand.mobiles.all():
-                for variant in mobile.variants.all():
-                    all_mobiles.append([
-                        brand.name,
-                        brand.nationality.name,
-                        mobile.model,
-                        variant.color,
-                        variant.size,
-                        mobile.country.name,
-                        [price for price in variant.prices.all()],
-                        variant.image.url,
-                    ])
-
-        paginator = Paginator(all_mobiles, 10)
+        sort = request.GET.get("sort")
+        variants = Variant.objects.select_related("mobile__brand__nationality", "mobile__country")
+        # The matches are in their own order (the best first on PostgreSQL), unless sorted by price.
+        q = request.GET.get("q", "").strip()
+        if q:
+            variants = search_variants(q, variants)
+        if sort in PRICE_ORDERINGS or not q:
+            variants = variants.order_by(*PRICE_ORDERINGS.get(sort, VARIANT_CATALOG_ORDERING))
+
+        # The current price is a column of the variant, so filtering and sorting by it does not read the prices.
+        min_price = get_price_filter(request, "min_price")
+        if min_price is not None:
+            variants = variants.filter(current_price__gte=min_price)
+        max_price = get_price_filter(request, "max_price")
+        if max_price is not None:
+            variants = variants.filter(current_price__lte=max_price)
+
+        # Paginate the queryset itself so only the current page of variants is fetched.
+        paginator = Paginator(variants, 10)
         page_number = request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
 
-        return render(request, "mobiles/all.html", {"page_obj": page_obj})
+        return render(
+            request,
+            "mobiles/all.html",
+            {
+                "page_obj": page_obj,
+                "q": q,
+                "sort": sort if sort in PRICE_ORDERINGS else "",
+                "min_price": "" if min_price is None else min_price,
+                "max_price": "" if max_price is None else max_price,
+                "query": get_pagination_query(request),
+            },
+        )
@@ -1,24 +1,38 @@
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
 from django.views import View
 
+from mobiles.conditional import catalog_condition
 from mobiles.forms import BrandForm
 from mobiles.models import Brand
+from mobiles.pagination import get_pagination_query
+from mobiles.search import search_objects
 
 
 class BrandListView(View):
+    query_budget = 2
+
+    @method_decorator(catalog_condition())
     def get(self, request):
         brands = Brand.objects.all()
+        q = request.GET.get("q", "").strip()
+        if q:
+            brands = search_objects(brands, q)
 
         paginator = Paginator(brands, 10)
         page_number = request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
 
-        return render(request, "mobiles/brand/list.html", {"page_obj": page_obj})
+        return render(
+            request, "mobiles/brand/list.html", {"page_obj": page_obj, "q": q, "query": get_pagination_query(request)}
+        )
 
 
 class BrandCreateView(View):
+    query_budget = 4
+
     def get(self, request):
         form = BrandForm()
         return render(request, "mobiles/brand/form.html", {"form": form})
@@ -33,6 +47,8 @@ class BrandCreateView(View):
 
 
 class BrandUpdateView(View):
+    query_budget = 8
+
     def get(self, request, pk):
         brand = get_object_or_404(Brand, pk=pk)
         form = BrandForm(instance=brand)
@@ -49,6 +65,8 @@ class BrandUpdateView(View):
 
 
 class BrandDeleteView(View):
+    # No query budget: the delete cascades to the related objects, with queries for each of them.
+
     def post(self, request, pk):
         brand = get_object_or_404(Brand, pk=pk)
         brand.delete()
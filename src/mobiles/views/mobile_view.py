@@ -1,24 +1,38 @@
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
 from django.views import View
 
+from mobiles.conditional import catalog_condition
 from mobiles.forms import MobileForm
 from mobiles.models import Mobile
+from mobiles.pagination import get_pagination_query
+from mobiles.search import search_objects
 
 
 class MobileListView(View):
+    query_budget = 2
+
+    @method_decorator(catalog_condition())
     def get(self, request):
         mobiles = Mobile.objects.all()
+        q = request.GET.get("q", "").strip()
+        if q:
+            mobiles = search_objects(mobiles, q)
 
         paginator = Paginator(mobiles, 10)
         page_number = request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
 
-        return render(request, "mobiles/mobile/list.html", {"page_obj": page_obj})
+        return render(
+            request, "mobiles/mobile/list.html", {"page_obj": page_obj, "q": q, "query": get_pagination_query(request)}
+        )
 
 
 class MobileCreateView(View):
+    query_budget = 7
+
     def get(self, request):
         form = MobileForm()
         return render(request, "mobiles/mobile/form.html", {"form": form})
@@ -33,6 +47,8 @@ class MobileCreateView(View):
 
 
 class MobileUpdateView(View):
+    query_budget = 11
+
     def get(self, request, pk):
         mobile = get_object_or_404(Mobile, pk=pk)
         form = MobileForm(instance=mobile)
@@ -49,6 +65,8 @@ class MobileUpdateView(View):
 
 
 class MobileDeleteView(View):
+    # No query budget: the delete cascades to the related objects, with queries for each of them.
+
     def post(self, request, pk):
         mobile = get_object_or_404(Mobile, pk=pk)
         mobile.delete()
@@ -1,24 +1,40 @@
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
 from django.views import View
 
+from mobiles.conditional import catalog_condition
 from mobiles.forms import NationalityForm
 from mobiles.models import Nationality
+from mobiles.pagination import get_pagination_query
+from mobiles.search import search_objects
 
 
 class NationalityListView(View):
+    query_budget = 2
+
+    @method_decorator(catalog_condition())
     def get(self, request):
         nationalities = Nationality.objects.all()
+        q = request.GET.get("q", "").strip()
+        if q:
+            nationalities = search_objects(nationalities, q)
 
         paginator = Paginator(nationalities, 10)
         page_number = request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
 
-        return render(request, "mobiles/nationality/list.html", {"page_obj": page_obj})
+        return render(
+            request,
+            "mobiles/nationality/list.html",
+            {"page_obj": page_obj, "q": q, "query": get_pagination_query(request)},
+        )
 
 
 class NationalityCreateView(View):
+    query_budget = 2
+
     def get(self, request):
         form = NationalityForm()
         return render(request, "mobiles/nationality/form.html", {"form": form})
@@ -33,6 +49,8 @@ class NationalityCreateView(View):
 
 
 class NationalityUpdateView(View):
+    query_budget = 9
+
     def get(self, request, pk):
         nationality = get_object_or_404(Nationality, pk=pk)
         form = NationalityForm(instance=nationality)
@@ -49,6 +67,8 @@ class NationalityUpdateView(View):
 
 
 class NationalityDeleteView(View):
+    query_budget = 6
+
     def post(self, request, pk):
         nationality = get_object_or_404(Nationality, pk=pk)
         nationality.delete()
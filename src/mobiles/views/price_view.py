@@ -1,24 +1,101 @@
+from datetime import date
+from heapq import nsmallest
+
 from django.contrib import messages
 from django.core.paginator import Paginator
+from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
 from django.views import View
 
+from mobiles.archive import read_archived_prices
+from mobiles.conditional import catalog_condition
 from mobiles.forms import PriceHistoryForm
-from mobiles.models import PriceHistory
+from mobiles.models import PriceHistory, Variant
+from mobiles.pagination import decode_cursor, encode_cursor, get_pagination_query
+
+PRICES_PER_PAGE = 10
+
+
+def get_merged_page(prices, archived, cursor, per_page):
+    """Return the page after ``cursor`` of the table and archived prices, and whether more follow."""
+    if cursor is not None:
+        created, pk, _ = cursor
+        prices = prices.filter(Q(created__gt=created) | Q(created=created, id__gt=pk))
+        archived = [price for price in archived if (price.created, price.pk) > (created, pk)]
+
+    def key(price):
+        return price.created, price.pk
+
+    # A price left in both by a failed archival has the same key in both: the one of the table is kept.
+    page = {price.pk: price for price in nsmallest(per_page + 1, archived, key=key)}
+    page.update((price.pk, price) for price in prices.order_by("created", "id")[: per_page + 1])
+    page = sorted(page.values(), key=key)
+
+    return page[:per_page], len(page) > per_page
+
+
+def get_date_filter(request, name):
+    """Return the date filter ``name`` of the query string, or ``None`` when it is missing or invalid."""
+    try:
+        return date.fromisoformat(request.GET[name])
+    except (KeyError, ValueError):
+        return None
 
 
 class PriceHistoryListView(View):
+    # Up to two more queries for the archive index and the variants of the archived prices.
+    query_budget = 4
+
+    @method_decorator(catalog_condition())
     def get(self, request):
         price_histories = PriceHistory.objects.select_related("variant__mobile").all()
 
-        paginator = Paginator(price_histories, 10)
-        page_number = request.GET.get("page", 1)
-        page_obj = paginator.get_page(page_number)
+        date_from = get_date_filter(request, "date_from")
+        if date_from is not None:
+            price_histories = price_histories.days_from(date_from)
+        date_to = get_date_filter(request, "date_to")
+        if date_to is not None:
+            price_histories = price_histories.filter(date__lte=date_to)
+        context = {
+            "date_from": "" if date_from is None else date_from.isoformat(),
+            "date_to": "" if date_to is None else date_to.isoformat(),
+            "query": get_pagination_query(request, "cursor"),
+        }
+
+        # A date range also lists the archived prices of its months, merged in the order of the table.
+        archived = read_archived_prices(date_from, date_to) if date_from is not None or date_to is not None else []
+        if archived:
+            variants = Variant.objects.select_related("mobile").in_bulk({price.variant_id for price in archived})
+            for price in archived:
+                price.variant = variants.get(price.variant_id)
+            archived = [price for price in archived if price.variant is not None]
+
+            cursor = decode_cursor(request.GET.get("cursor", ""))
+            page, has_next = get_merged_page(price_histories, archived, cursor, PRICES_PER_PAGE)
+            start_index = cursor[2] + 1 if cursor else 1
+            # The pages of the merged prices are keyed by the last price shown, so only a page is read from the table.
+            context.update(
+                merged=True,
+                page_obj=page,
+                start_index=start_index,
+                has_previous=cursor is not None,
+                next_cursor=encode_cursor(page[-1].created, page[-1].pk, start_index + len(page) - 1)
+                if has_next
+                else None,
+            )
+        else:
+            paginator = Paginator(price_histories, PRICES_PER_PAGE)
+            page_number = request.GET.get("page", 1)
+            page_obj = paginator.get_page(page_number)
+            context.update(page_obj=page_obj, start_index=page_obj.start_index())
 
-        return render(request, "mobiles/price_history/list.html", {"page_obj": page_obj})
+        return render(request, "mobiles/price_history/list.html", context)
 
 
 class PriceHistoryCreateView(View):
+    query_budget = 7
+
     def get(self, request):
         form = PriceHistoryForm()
         return render(request, "mobiles/price_history/form.html", {"form": form})
@@ -33,6 +110,8 @@ class PriceHistoryCreateView(View):
 
 
 class PriceHistoryUpdateView(View):
+    query_budget = 10
+
     def get(self, request, pk):
         price_history = get_object_or_404(PriceHistory, pk=pk)
         form = PriceHistoryForm(instance=price_history)
@@ -49,6 +128,8 @@ class PriceHistoryUpdateView(View):
 
 
 class PriceHistoryDeleteView(View):
+    query_budget = 7
+
     def post(self, request, pk):
         price_history = get_object_or_404(PriceHistory, pk=pk)
         price_history.delete()
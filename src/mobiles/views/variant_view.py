@@ -1,24 +1,38 @@
 from django.contrib import messages
 from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.decorators import method_decorator
 from django.views import View
 
+from mobiles.conditional import catalog_condition
 from mobiles.forms import VariantForm
 from mobiles.models import Variant
+from mobiles.pagination import get_pagination_query
+from mobiles.search import search_variants
 
 
 class VariantListView(View):
+    query_budget = 2
+
+    @method_decorator(catalog_condition())
     def get(self, request):
         variants = Variant.objects.select_related("mobile__country", "mobile__brand").all()
+        q = request.GET.get("q", "").strip()
+        if q:
+            variants = search_variants(q, variants)
 
         paginator = Paginator(variants, 10)
         page_number = request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
 
-        return render(request, "mobiles/variant/list.html", {"page_obj": page_obj})
+        return render(
+            request, "mobiles/variant/list.html", {"page_obj": page_obj, "q": q, "query": get_pagination_query(request)}
+        )
 
 
 class VariantCreateView(View):
+    query_budget = 4
+
     def get(self, request):
         form = VariantForm()
         return render(request, "mobiles/variant/form.html", {"form": form})
@@ -33,6 +47,8 @@ class VariantCreateView(View):
 
 
 class VariantUpdateView(View):
+    query_budget = 9
+
     def get(self, request, pk):
         variant = get_object_or_404(Variant, pk=pk)
         form = VariantForm(instance=variant)
@@ -49,6 +65,8 @@ class VariantUpdateView(View):
 
 
 class VariantDeleteView(View):
+    # No query budget: the delete cascades to the related objects, with queries for each of them.
+
     def post(self, request, pk):
         variant = get_object_or_404(Variant, pk=pk)
         variant.delete()